@@ -0,0 +1,158 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Benchmark the construction of ``SupersetResultSet`` from DB-API rows.
+
+Compares the current columnar construction path with the previous one, which
+built a NumPy structured object array and converted it column by column,
+reporting rows/sec and peak memory for each.
+"""
+import gc
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+import click
+import numpy as np
+import pyarrow as pa
+
+from superset.db_engine_specs import BaseEngineSpec
+from superset.result_set import dedup, stringify, SupersetResultSet
+
+CURSOR_DESCRIPTION = (
+    ("id", "bigint"),
+    ("name", "varchar"),
+    ("value", "double"),
+    ("ds", "timestamp"),
+    ("is_active", "boolean"),
+    ("mixed", None),
+    ("tags", None),
+)
+
+
+def generate_rows(num_rows: int) -> List[Tuple[Any, ...]]:
+    """
+    Generate rows resembling a typical DB-API result, including nulls, a column
+    with mixed types and a nested column.
+    """
+    random.seed(42)
+    start = datetime(2021, 1, 1)
+    return [
+        (
+            i,
+            f"name_{i % 1000}",
+            random.random() if i % 10 else None,
+            start + timedelta(minutes=i),
+            bool(i % 2),
+            i if i % 100 else "n/a",
+            [f"tag_{i % 7}", f"tag_{i % 11}"],
+        )
+        for i in range(num_rows)
+    ]
+
+
+def stringify_values(array: np.ndarray) -> np.ndarray:
+    vstringify = np.vectorize(stringify)
+    return vstringify(array)
+
+
+def legacy_result_set_table(
+    data: List[Tuple[Any, ...]], cursor_description: Tuple[Tuple[Any, ...], ...]
+) -> pa.Table:
+    """
+    The construction path used before the columnar ingestion, kept here as the
+    baseline for the benchmark.
+    """
+    column_names = dedup([col[0] for col in cursor_description])
+    numpy_dtype = [(column_name, "object") for column_name in column_names]
+    array = np.array(data, dtype=numpy_dtype)
+    pa_data: List[pa.Array] = []
+    for column in column_names:
+        try:
+            pa_data.append(pa.array(array[column].tolist()))
+        except (pa.lib.ArrowInvalid, pa.lib.ArrowTypeError, TypeError):
+            pa_data.append(pa.array(stringify_values(array[column]).tolist()))
+    for i, column in enumerate(column_names):
+        if pa.types.is_nested(pa_data[i].type):
+            pa_data[i] = pa.array(stringify_values(array[column]).tolist())
+    return pa.Table.from_arrays(pa_data, names=column_names)
+
+
+def current_result_set_table(
+    data: List[Tuple[Any, ...]], cursor_description: Tuple[Tuple[Any, ...], ...]
+) -> pa.Table:
+    return SupersetResultSet(data, cursor_description, BaseEngineSpec).pa_table
+
+
+def measure(
+    func: Callable[..., pa.Table], data: List[Tuple[Any, ...]]
+) -> Dict[str, float]:
+    gc.collect()
+    pool = pa.default_memory_pool()
+    arrow_baseline = pool.bytes_allocated()
+    tracemalloc.start()
+    start = time.time()
+    table = func(data, CURSOR_DESCRIPTION)
+    duration = time.time() - start
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    arrow_bytes = pool.bytes_allocated() - arrow_baseline
+    del table
+    return {
+        "rows_per_sec": len(data) / duration if duration else float("inf"),
+        "duration": duration,
+        "peak_mb": (python_peak + arrow_bytes) / 1024 ** 2,
+    }
+
+
+@click.command()
+@click.option("--rows", default=500000, help="Number of rows to generate.")
+@click.option("--repeat", default=3, help="Number of runs for each path.")
+def main(rows: int = 500000, repeat: int = 3) -> None:
+    print(f"Generating {rows} rows")
+    data = generate_rows(rows)
+
+    results: Dict[str, Dict[str, float]] = {}
+    for label, func in (
+        ("Legacy", legacy_result_set_table),
+        ("Columnar", current_result_set_table),
+    ):
+        print(f"Benchmarking {label.lower()} path")
+        runs = [measure(func, data) for _ in range(repeat)]
+        results[label] = {
+            "rows_per_sec": max(run["rows_per_sec"] for run in runs),
+            "duration": min(run["duration"] for run in runs),
+            "peak_mb": max(run["peak_mb"] for run in runs),
+        }
+
+    print("\nResults:\n")
+    for label, result in results.items():
+        print(
+            f"{label}: {result['rows_per_sec']:,.0f} rows/sec, "
+            f"{result['duration']:.2f} s, peak memory {result['peak_mb']:.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    from superset.app import create_app
+
+    app = create_app()
+    with app.app_context():
+        # pylint: disable=no-value-for-parameter
+        main()
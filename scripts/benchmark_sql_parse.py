@@ -0,0 +1,138 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Benchmark the parsing of SQL queries with ``ParsedQuery``.
+
+Handling a SQL Lab query parses the same SQL several times, to split it into
+statements, extract its limit and check its type and tables. This compares the
+previous path, which grouped the tokens of the whole query for every
+``ParsedQuery``, with splitting and extracting the limit without grouping, and
+with the parse cache once warm, over a corpus of queries read from a file
+(statements separated by blank lines) or generated to resemble the SQL of charts
+and SQL Lab.
+"""
+import time
+from typing import Callable, Dict, List, Optional
+
+import click
+import sqlparse
+
+from superset.sql_parse import _extract_limit_from_query, _parse_sql, ParsedQuery
+
+SQL_LAB_QUERY = """
+WITH recent AS (
+    SELECT user_id, MAX(ds) AS last_seen
+    FROM analytics.events
+    WHERE ds >= '2021-01-01' AND event_type IN ('login', 'purchase')
+    GROUP BY user_id
+)
+SELECT u.id, u.name, r.last_seen, COUNT(o.id) AS orders
+FROM core.users u
+JOIN recent r ON r.user_id = u.id
+LEFT JOIN sales.orders o ON o.user_id = u.id -- orders of the user
+WHERE u.country = 'FR'
+GROUP BY u.id, u.name, r.last_seen
+ORDER BY orders DESC
+LIMIT 1000
+"""
+
+
+def generate_chart_query(num_columns: int) -> str:
+    """
+    Generate a query resembling the SQL of a chart with many metrics.
+    """
+    metrics = ",\n  ".join(
+        f"SUM(CASE WHEN category = 'c{i}' THEN value ELSE 0 END) AS metric_{i}"
+        for i in range(num_columns)
+    )
+    return (
+        f"SELECT DATE_TRUNC('day', ds) AS __timestamp,\n  {metrics}\n"
+        "FROM warehouse.fact_sales\n"
+        "JOIN (SELECT region FROM warehouse.fact_sales GROUP BY region "
+        "ORDER BY SUM(value) DESC LIMIT 10) AS series_limit "
+        "ON fact_sales.region = series_limit.region\n"
+        "WHERE ds >= '2021-01-01 00:00:00' AND ds < '2021-04-01 00:00:00'\n"
+        "GROUP BY DATE_TRUNC('day', ds)\nLIMIT 50000"
+    )
+
+
+def load_corpus(path: Optional[str]) -> List[str]:
+    if path:
+        with open(path) as corpus:
+            return [sql.strip() for sql in corpus.read().split("\n\n") if sql.strip()]
+    return [SQL_LAB_QUERY, "SET x = 1; " + SQL_LAB_QUERY] + [
+        generate_chart_query(num_columns) for num_columns in (5, 50, 200)
+    ]
+
+
+def legacy_parse(sql: str) -> None:
+    """
+    The work done by ``ParsedQuery`` before the parse cache, kept here as the
+    baseline for the benchmark.
+    """
+    parsed = sqlparse.parse(sql.strip(" \t\n;"))
+    for statement in parsed:
+        _extract_limit_from_query(statement)
+    [str(statement).strip(" \n;\t") for statement in parsed]
+    parsed[-1].get_type()
+
+
+def fast_path_parse(sql: str) -> None:
+    """
+    Split the query and extract its limit on a cold cache, without grouping.
+    """
+    _parse_sql.cache_clear()
+    parsed_query = ParsedQuery(sql)
+    parsed_query.get_statements()
+    parsed_query.limit  # pylint: disable=pointless-statement
+
+
+def cached_parse(sql: str) -> None:
+    parsed_query = ParsedQuery(sql)
+    parsed_query.get_statements()
+    parsed_query.is_valid_ctas()
+
+
+def measure(func: Callable[[str], None], corpus: List[str], repeat: int) -> float:
+    start = time.time()
+    for _ in range(repeat):
+        for sql in corpus:
+            func(sql)
+    return (time.time() - start) / (repeat * len(corpus))
+
+
+@click.command()
+@click.option("--corpus", help="File with the queries, separated by blank lines.")
+@click.option("--repeat", default=5, help="Number of times each query is parsed.")
+def main(corpus: Optional[str] = None, repeat: int = 5) -> None:
+    queries = load_corpus(corpus)
+    print(f"Parsing {len(queries)} queries, {repeat} times each")
+
+    results: Dict[str, float] = {}
+    results["Legacy"] = measure(legacy_parse, queries, repeat)
+    results["Split and limit, cold cache"] = measure(fast_path_parse, queries, repeat)
+    measure(cached_parse, queries, 1)
+    results["Warm cache"] = measure(cached_parse, queries, repeat)
+
+    print("\nResults:\n")
+    for label, duration in results.items():
+        print(f"{label}: {duration * 1000:.2f} ms per query")
+
+
+if __name__ == "__main__":
+    # pylint: disable=no-value-for-parameter
+    main()
@@ -126,6 +126,15 @@ describe('sqlLabReducer', () => {
       newState = sqlLabReducer(newState, action);
       expect(newState.queryEditors[1].queryLimit).toEqual(queryLimit);
     });
+    it('should set samplePercent', () => {
+      const action = {
+        type: actions.QUERY_EDITOR_SET_SAMPLE_PERCENT,
+        queryEditor: qe,
+        samplePercent: 10,
+      };
+      newState = sqlLabReducer(newState, action);
+      expect(newState.queryEditors[1].samplePercent).toEqual(10);
+    });
     it('should set selectedText', () => {
       const selectedText = 'TEST';
       const action = {
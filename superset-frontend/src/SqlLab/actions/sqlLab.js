@@ -54,6 +54,8 @@ export const QUERY_EDITOR_SET_TITLE = 'QUERY_EDITOR_SET_TITLE';
 export const QUERY_EDITOR_SET_AUTORUN = 'QUERY_EDITOR_SET_AUTORUN';
 export const QUERY_EDITOR_SET_SQL = 'QUERY_EDITOR_SET_SQL';
 export const QUERY_EDITOR_SET_QUERY_LIMIT = 'QUERY_EDITOR_SET_QUERY_LIMIT';
+export const QUERY_EDITOR_SET_SAMPLE_PERCENT =
+  'QUERY_EDITOR_SET_SAMPLE_PERCENT';
 export const QUERY_EDITOR_SET_TEMPLATE_PARAMS =
   'QUERY_EDITOR_SET_TEMPLATE_PARAMS';
 export const QUERY_EDITOR_SET_SELECTED_TEXT = 'QUERY_EDITOR_SET_SELECTED_TEXT';
@@ -329,6 +331,7 @@ export function runQuery(query) {
       ctas_method: query.ctas_method,
       templateParams: query.templateParams,
       queryLimit: query.queryLimit,
+      samplePercent: query.samplePercent,
       expand_data: true,
     };
 
@@ -984,6 +987,10 @@ export function queryEditorSetSelectedText(queryEditor, sql) {
   return { type: QUERY_EDITOR_SET_SELECTED_TEXT, queryEditor, sql };
 }
 
+export function queryEditorSetSamplePercent(queryEditor, samplePercent) {
+  return { type: QUERY_EDITOR_SET_SAMPLE_PERCENT, queryEditor, samplePercent };
+}
+
 export function mergeTable(table, query) {
   return { type: MERGE_TABLE, table, query };
 }
@@ -541,6 +541,14 @@ export default class ResultSet extends React.PureComponent<
     let limitMessage;
     const limitReached = results?.displayLimitReached;
     const limit = queryLimit || results.query.limit;
+    const sampleMessage = results?.query?.extra?.sampled && (
+      <span className="limitMessage">
+        {t(
+          `These results are a preview computed from a %(percent)s%% sample of the tables.`,
+          { percent: results.query.extra.sample_percent },
+        )}
+      </span>
+    );
     const isAdmin = !!this.props.user?.roles?.Admin;
     const displayMaxRowsReachedMessage = {
       withAdmin: t(
@@ -604,6 +612,7 @@ export default class ResultSet extends React.PureComponent<
         {!limitReached && !shouldUseDefaultDropdownAlert && (
           <span>
             {t(`%(rows)d rows returned`, { rows })} {limitMessage}
+            {sampleMessage}
           </span>
         )}
         {!limitReached && shouldUseDefaultDropdownAlert && (
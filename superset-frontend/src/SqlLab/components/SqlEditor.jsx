@@ -48,6 +48,7 @@ import {
   postStopQuery,
   queryEditorSetAutorun,
   queryEditorSetQueryLimit,
+  queryEditorSetSamplePercent,
   queryEditorSetSql,
   queryEditorSetTemplateParams,
   runQuery,
@@ -75,6 +76,8 @@ import AceEditorWrapper from './AceEditorWrapper';
 import RunQueryActionButton from './RunQueryActionButton';
 
 const LIMIT_DROPDOWN = [10, 100, 1000, 10000, 100000];
+// percentages of the rows of the tables read when previewing a query
+const SAMPLE_DROPDOWN = [1, 10];
 const SQL_EDITOR_PADDING = 10;
 const INITIAL_NORTH_PERCENT = 30;
 const INITIAL_SOUTH_PERCENT = 70;
@@ -180,6 +183,7 @@ class SqlEditor extends React.PureComponent {
     );
     this.queryPane = this.queryPane.bind(this);
     this.renderQueryLimit = this.renderQueryLimit.bind(this);
+    this.renderSamplePercent = this.renderSamplePercent.bind(this);
     this.getAceEditorAndSouthPaneHeights = this.getAceEditorAndSouthPaneHeights.bind(
       this,
     );
@@ -339,6 +343,13 @@ class SqlEditor extends React.PureComponent {
     this.props.queryEditorSetQueryLimit(this.props.queryEditor, queryLimit);
   }
 
+  setSamplePercent(samplePercent) {
+    this.props.queryEditorSetSamplePercent(
+      this.props.queryEditor,
+      samplePercent,
+    );
+  }
+
   getQueryCostEstimate() {
     if (this.props.database) {
       const qe = this.props.queryEditor;
@@ -416,6 +427,9 @@ class SqlEditor extends React.PureComponent {
       tempTable: ctas ? this.state.ctas : '',
       templateParams: qe.templateParams,
       queryLimit: qe.queryLimit || this.props.defaultQueryLimit,
+      samplePercent: this.props.database?.allows_sampling
+        ? qe.samplePercent
+        : undefined,
       runAsync: this.props.database
         ? this.props.database.allow_run_async
         : false,
@@ -570,6 +584,23 @@ class SqlEditor extends React.PureComponent {
     );
   }
 
+  renderSamplePercent() {
+    return (
+      <AntdMenu>
+        {[null, ...SAMPLE_DROPDOWN].map(percent => (
+          <AntdMenu.Item
+            key={`${percent}`}
+            onClick={() => this.setSamplePercent(percent)}
+          >
+            <a role="button" styling="link">
+              {percent ? `${percent}%` : t('Off')}
+            </a>
+          </AntdMenu.Item>
+        ))}
+      </AntdMenu>
+    );
+  }
+
   renderEditorBottomBar() {
     const { queryEditor: qe } = this.props;
 
@@ -657,6 +688,23 @@ class SqlEditor extends React.PureComponent {
               </Dropdown>
             </LimitSelectStyled>
           </span>
+          {this.props.database?.allows_sampling && (
+            <span>
+              <LimitSelectStyled>
+                <Dropdown overlay={this.renderSamplePercent()} trigger="click">
+                  <a onClick={e => e.preventDefault()}>
+                    <span>{t('SAMPLE:')}</span>
+                    <span>
+                      {qe.samplePercent ? `${qe.samplePercent}%` : t('Off')}
+                    </span>
+                    <Icons.TriangleDown
+                      iconColor={theme.colors.grayscale.base}
+                    />
+                  </a>
+                </Dropdown>
+              </LimitSelectStyled>
+            </span>
+          )}
           {this.props.latestQuery && (
             <Timer
               startTime={this.props.latestQuery.startDttm}
@@ -783,6 +831,7 @@ function mapDispatchToProps(dispatch) {
       postStopQuery,
       queryEditorSetAutorun,
       queryEditorSetQueryLimit,
+      queryEditorSetSamplePercent,
       queryEditorSetSql,
       queryEditorSetTemplateParams,
       runQuery,
@@ -470,6 +470,11 @@ export default function sqlLabReducer(state = {}, action) {
         queryLimit: action.queryLimit,
       });
     },
+    [actions.QUERY_EDITOR_SET_SAMPLE_PERCENT]() {
+      return alterInArr(state, 'queryEditors', action.queryEditor, {
+        samplePercent: action.samplePercent,
+      });
+    },
     [actions.QUERY_EDITOR_SET_TEMPLATE_PARAMS]() {
       return alterInArr(state, 'queryEditors', action.queryEditor, {
         templateParams: action.templateParams,
@@ -53,7 +53,10 @@ export type Query = {
     data: Record<string, unknown>[];
     expanded_columns: Column[];
     selected_columns: Column[];
-    query: { limit: number };
+    query: {
+      limit: number;
+      extra?: { sample_percent?: number; sampled?: boolean };
+    };
   };
   resultsKey: string | null;
   schema: string;
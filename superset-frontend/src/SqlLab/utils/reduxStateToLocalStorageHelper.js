@@ -27,6 +27,7 @@ const PERSISTENT_QUERY_EDITOR_KEYS = new Set([
   'latestQueryId',
   'northPercent',
   'queryLimit',
+  'samplePercent',
   'schema',
   'selectedText',
   'southPercent',
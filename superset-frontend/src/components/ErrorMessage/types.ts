@@ -70,6 +70,7 @@ export const ErrorTypeEnum = {
   SQLLAB_TIMEOUT_ERROR: 'SQLLAB_TIMEOUT_ERROR',
   RESULTS_BACKEND_ERROR: 'RESULTS_BACKEND_ERROR',
   ASYNC_WORKERS_ERROR: 'ASYNC_WORKERS_ERROR',
+  QUERY_COST_EXCEEDED_ERROR: 'QUERY_COST_EXCEEDED_ERROR',
 
   // Generic errors
   GENERIC_COMMAND_ERROR: 'GENERIC_COMMAND_ERROR',
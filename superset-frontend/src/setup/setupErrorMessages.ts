@@ -99,6 +99,10 @@ export default function setupErrorMessages() {
     ErrorTypeEnum.SQLLAB_TIMEOUT_ERROR,
     DatabaseErrorMessage,
   );
+  errorMessageComponentRegistry.registerValue(
+    ErrorTypeEnum.QUERY_COST_EXCEEDED_ERROR,
+    DatabaseErrorMessage,
+  );
   errorMessageComponentRegistry.registerValue(
     ErrorTypeEnum.CONNECTION_PORT_CLOSED_ERROR,
     DatabaseErrorMessage,
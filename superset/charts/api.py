@@ -70,6 +70,7 @@ from superset.exceptions import QueryObjectValidationError
 from superset.extensions import event_logger, security_manager
 from superset.models.slice import Slice
 from superset.tasks.thumbnails import cache_chart_thumbnail
+from superset.utils.arrow import ARROW_STREAM_MIMETYPE, df_to_arrow_stream
 from superset.utils.async_query_manager import AsyncQueryTokenException
 from superset.utils.core import (
     ChartDataResultFormat,
@@ -88,6 +89,13 @@ from superset.views.filters import FilterRelatedOwners
 
 logger = logging.getLogger(__name__)
 
+# result types whose data is a DataFrame, which can be sent in the Arrow format
+ARROW_RESULT_TYPES = {
+    ChartDataResultType.FULL.value,
+    ChartDataResultType.RESULTS.value,
+    ChartDataResultType.SAMPLES.value,
+}
+
 
 class ChartRestApi(BaseSupersetModelRestApi):
     datamodel = SQLAInterface(Slice)
@@ -480,7 +488,45 @@ class ChartRestApi(BaseSupersetModelRestApi):
         except ChartBulkDeleteFailedError as ex:
             return self.response_422(message=str(ex))
 
-    def send_chart_response(self, result: Dict[Any, Any]) -> Response:
+    @staticmethod
+    def _negotiate_result_format(query_context: Dict[str, Any]) -> bool:
+        """
+        Use the Arrow result format when the client prefers it over JSON in the
+        ``Accept`` header, unless another format is requested explicitly. Only
+        results made of DataFrames are negotiated, the other result types are
+        always sent as JSON.
+
+        :returns: whether the result format depends on the ``Accept`` header
+        """
+        if (
+            query_context.get("result_format", ChartDataResultFormat.JSON)
+            != ChartDataResultFormat.JSON
+        ):
+            return False
+        result_type = query_context.get("result_type") or ChartDataResultType.FULL.value
+        result_types = {
+            str(query.get("result_type") or result_type)
+            for query in query_context.get("queries") or []
+            if isinstance(query, dict)
+        }
+        if not result_types or not result_types <= ARROW_RESULT_TYPES:
+            return False
+        if (
+            request.accept_mimetypes.best_match(
+                ["application/json", ARROW_STREAM_MIMETYPE]
+            )
+            == ARROW_STREAM_MIMETYPE
+        ):
+            query_context["result_format"] = ChartDataResultFormat.ARROW.value
+        return True
+
+    def send_chart_response(
+        self, result: Dict[Any, Any], vary_accept: bool = False
+    ) -> Response:
+        """
+        :param vary_accept: whether the result format was negotiated from the
+            ``Accept`` header, which caches then need to take into account
+        """
         result_format = result["query_context"].result_format
 
         if result_format == ChartDataResultFormat.CSV:
@@ -492,7 +538,28 @@ class ChartRestApi(BaseSupersetModelRestApi):
             data = result["queries"][0]["data"]
             return CsvResponse(data, headers=generate_download_headers("csv"))
 
-        if result_format == ChartDataResultFormat.JSON:
+        if result_format == ChartDataResultFormat.ARROW:
+            # the body is the concatenation of one Arrow IPC stream per query, in
+            # order, with the rest of the query payload serialized as JSON in the
+            # schema metadata. Readers open the streams one after the other from
+            # the same buffer, as each stream ends with its own end-of-stream marker
+            resp = Response(
+                (
+                    df_to_arrow_stream(
+                        query.get("data"),
+                        {
+                            "superset": simplejson.dumps(
+                                {k: v for k, v in query.items() if k != "data"},
+                                default=json_int_dttm_ser,
+                                ignore_nan=True,
+                            )
+                        },
+                    )
+                    for query in result["queries"]
+                ),
+                mimetype=ARROW_STREAM_MIMETYPE,
+            )
+        elif result_format == ChartDataResultFormat.JSON:
             response_data = simplejson.dumps(
                 {"result": result["queries"]},
                 default=json_int_dttm_ser,
@@ -500,12 +567,20 @@ class ChartRestApi(BaseSupersetModelRestApi):
             )
             resp = make_response(response_data, 200)
             resp.headers["Content-Type"] = "application/json; charset=utf-8"
-            return resp
+        else:
+            return self.response_400(
+                message=f"Unsupported result_format: {result_format}"
+            )
 
-        return self.response_400(message=f"Unsupported result_format: {result_format}")
+        if vary_accept:
+            resp.vary.add("Accept")
+        return resp
 
     def get_data_response(
-        self, command: ChartDataCommand, force_cached: bool = False
+        self,
+        command: ChartDataCommand,
+        force_cached: bool = False,
+        vary_accept: bool = False,
     ) -> Response:
         try:
             result = command.run(force_cached=force_cached)
@@ -514,7 +589,7 @@ class ChartRestApi(BaseSupersetModelRestApi):
         except ChartDataQueryFailedError as exc:
             return self.response_400(message=exc.message)
 
-        return self.send_chart_response(result)
+        return self.send_chart_response(result, vary_accept)
 
     @expose("/data", methods=["POST"])
     @protect()
@@ -548,6 +623,10 @@ class ChartRestApi(BaseSupersetModelRestApi):
                 application/json:
                   schema:
                     $ref: "#/components/schemas/ChartDataResponseSchema"
+                application/vnd.apache.arrow.stream:
+                  schema:
+                    type: string
+                    format: binary
             202:
               description: Async job details
               content:
@@ -574,6 +653,7 @@ class ChartRestApi(BaseSupersetModelRestApi):
         if json_body is None:
             return self.response_400(message=_("Request is not JSON"))
 
+        negotiated = self._negotiate_result_format(json_body)
         try:
             command = ChartDataCommand()
             query_context = command.set_query_context(json_body)
@@ -603,7 +683,7 @@ class ChartRestApi(BaseSupersetModelRestApi):
 
             # If the chart query has already been cached, return it immediately.
             if already_cached_result:
-                return self.send_chart_response(result)
+                return self.send_chart_response(result, negotiated)
 
             # Otherwise, kick off a background job to run the chart query.
             # Clients will either poll or be notified of query completion,
@@ -617,7 +697,7 @@ class ChartRestApi(BaseSupersetModelRestApi):
             result = command.run_async(g.user.get_id())
             return self.response(202, **result)
 
-        return self.get_data_response(command)
+        return self.get_data_response(command, vary_accept=negotiated)
 
     @expose("/data/<cache_key>", methods=["GET"])
     @protect()
@@ -648,6 +728,10 @@ class ChartRestApi(BaseSupersetModelRestApi):
                 application/json:
                   schema:
                     $ref: "#/components/schemas/ChartDataResponseSchema"
+                application/vnd.apache.arrow.stream:
+                  schema:
+                    type: string
+                    format: binary
             400:
               $ref: '#/components/responses/400'
             401:
@@ -662,6 +746,7 @@ class ChartRestApi(BaseSupersetModelRestApi):
         command = ChartDataCommand()
         try:
             cached_data = command.load_query_context_from_cache(cache_key)
+            negotiated = self._negotiate_result_format(cached_data)
             command.set_query_context(cached_data)
             command.validate()
         except ChartDataCacheLoadError:
@@ -671,7 +756,7 @@ class ChartRestApi(BaseSupersetModelRestApi):
                 message=_("Request is incorrect: %(error)s", error=error.messages)
             )
 
-        return self.get_data_response(command, True)
+        return self.get_data_response(command, True, negotiated)
 
     @expose("/<pk>/cache_screenshot/", methods=["GET"])
     @protect()
@@ -571,6 +571,37 @@ def update_datasources_cache() -> None:
                 print("{}".format(str(ex)))
 
 
+@superset.command()
+@with_appcontext
+@click.option(
+    "--batch-size",
+    "-b",
+    default=1000,
+    help="Number of queries indexed per transaction",
+)
+def index_query_history(batch_size: int) -> None:
+    """Index the SQL Lab query history for search"""
+    from superset.models.sql_lab import Query
+    from superset.queries.dao import QueryDAO
+
+    last_id = 0
+    indexed = 0
+    while True:
+        queries = (
+            db.session.query(Query)
+            .filter(Query.id > last_id)
+            .order_by(Query.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not queries:
+            break
+        QueryDAO.index_search_terms(queries)
+        last_id = queries[-1].id
+        indexed += len(queries)
+        print("Indexed {} queries".format(indexed))
+
+
 @superset.command()
 @with_appcontext
 @click.option(
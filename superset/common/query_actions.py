@@ -137,6 +137,7 @@ def _get_samples(
     query_obj.post_processing = []
     query_obj.row_limit = min(row_limit, config["SAMPLES_ROW_LIMIT"])
     query_obj.row_offset = 0
+    query_obj.is_paginated = False
     query_obj.columns = [o.column_name for o in datasource.columns]
     return _get_full(query_context, query_obj, force_cached)
 
@@ -16,12 +16,28 @@
 # under the License.
 from __future__ import annotations
 
+import copy
 import logging
-from typing import Any, ClassVar, Dict, List, Optional, TYPE_CHECKING, Union
+from datetime import datetime
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    cast,
+    ClassVar,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    TYPE_CHECKING,
+    Union,
+)
 
 import numpy as np
 import pandas as pd
+from flask import g
 from flask_babel import _
+from sqlalchemy import inspect
 
 from superset import app, db, is_feature_enabled
 from superset.annotation_layers.dao import AnnotationLayerDAO
@@ -35,9 +51,18 @@ from superset.exceptions import (
     QueryObjectValidationError,
     SupersetException,
 )
-from superset.extensions import cache_manager, security_manager
+from superset.extensions import cache_manager, query_executor, security_manager
+from superset.models.helpers import QueryResult
 from superset.utils import csv
-from superset.utils.cache import generate_cache_key, set_and_log_cache
+from superset.utils.cache import (
+    deserialize_df,
+    generate_cache_key,
+    get_or_lock_cache,
+    is_cache_value_stale,
+    schedule_cache_refresh,
+    serialize_df,
+    set_and_log_cache,
+)
 from superset.utils.core import (
     ChartDataResultFormat,
     ChartDataResultType,
@@ -45,10 +70,14 @@ from superset.utils.core import (
     DTTM_ALIAS,
     error_msg_from_exception,
     get_column_names_from_metrics,
+    get_metric_name,
     get_stacktrace,
+    get_user_id,
     normalize_dttm_col,
     QueryStatus,
+    TimeRangeEndpoint,
 )
+from superset.utils.query_executor import load_attributes
 from superset.views.utils import get_viz
 
 if TYPE_CHECKING:
@@ -108,16 +137,31 @@ class QueryContext:
         # a valid assumption for current setting. In the long term, we may
         # support multiple queries from different data sources.
 
+        if self.is_incremental(query_object):
+            result = self.get_incremental_query_result(query_object)
+        else:
+            # The datasource here can be different backend but the interface is common
+            result = self.datasource.query(query_object.to_dict())
+            result.df = self.normalize_df(result.df, query_object)
+
+        df = result.df
+        if not df.empty:
+            df = query_object.exec_post_processing(df)
+
+        return {
+            "query": result.query,
+            "status": result.status,
+            "error_message": result.error_message,
+            "df": df,
+        }
+
+    def normalize_df(self, df: pd.DataFrame, query_object: QueryObject) -> pd.DataFrame:
         timestamp_format = None
         if self.datasource.type == "table":
             dttm_col = self.datasource.get_column(query_object.granularity)
             if dttm_col:
                 timestamp_format = dttm_col.python_date_format
 
-        # The datasource here can be different backend but the interface is common
-        result = self.datasource.query(query_object.to_dict())
-
-        df = result.df
         # Transform the timestamp we received from database to pandas supported
         # datetime format. If no python_date_format is specified, the pattern will
         # be considered as the default ISO date format
@@ -135,14 +179,149 @@ class QueryContext:
                 self.df_metrics_to_num(df, query_object)
 
             df.replace([np.inf, -np.inf], np.nan, inplace=True)
-            df = query_object.exec_post_processing(df)
+        return df
 
-        return {
-            "query": result.query,
-            "status": result.status,
-            "error_message": result.error_message,
-            "df": df,
-        }
+    def is_incremental(self, query_object: QueryObject) -> bool:
+        """
+        Whether the time series of a query object can be cached incrementally: its
+        time range must be split into independent buckets, so that the buckets
+        queried at different times can be stitched back together.
+        """
+        return bool(
+            config["DATA_CACHE_INCREMENTAL"]
+            and self.datasource.type == "table"
+            and query_object.is_timeseries
+            and query_object.granularity
+            and query_object.from_dttm
+            and query_object.to_dttm
+            and not query_object.timeseries_limit
+            and not query_object.is_rowcount
+            and not query_object.is_paginated
+            and not query_object.time_shift
+            and not self.datasource.offset
+            and tuple(query_object.extras.get("time_range_endpoints") or ())
+            == (TimeRangeEndpoint.INCLUSIVE, TimeRangeEndpoint.EXCLUSIVE)
+        )
+
+    def get_incremental_query_result(  # pylint: disable=too-many-locals
+        self, query_object: QueryObject
+    ) -> QueryResult:
+        """
+        Query a time series, reusing the final buckets cached by the previous
+        queries of the same time series. Only the time ranges before and after the
+        cached buckets are queried, and the rows are stitched back together.
+
+        :param query_object: the query object of the time series
+        :returns: the normalized result of the query, before post processing
+        """
+        qry_start_dttm = datetime.now()
+        from_dttm, to_dttm = query_object.from_dttm, query_object.to_dttm
+
+        # the buckets are shared by all the time ranges of the time series
+        bucket_query_object = copy.copy(query_object)
+        bucket_query_object.time_range = None
+        bucket_query_object.post_processing = []
+        cache_key = self.query_cache_key(bucket_query_object, incremental=True)
+
+        cached_df = None
+        cache_value = None
+        if cache_key and not self.force:
+            cache_value = cache_manager.data_cache.get(cache_key)
+        if (
+            cache_value
+            and cache_value["from_dttm"] <= from_dttm < cache_value["final_dttm"]
+            and cache_value["final_dttm"] < to_dttm
+        ):
+            try:
+                cached_df = deserialize_df(cache_value["df"])
+                cached_df = cached_df[cached_df[DTTM_ALIAS] >= from_dttm]
+            except (KeyError, CacheLoadError) as ex:
+                logger.warning("Error reading incremental cache: %s", str(ex))
+
+        ranges = [(from_dttm, to_dttm)]
+        if cached_df is not None and not cached_df.empty:
+            # a bucket that starts before the first cached one only has some of
+            # its rows in the time range, so it's queried again
+            head_end_dttm = cached_df[DTTM_ALIAS].min().to_pydatetime()
+            ranges = [(cache_value["final_dttm"], to_dttm)]  # type: ignore
+            if from_dttm < head_end_dttm:
+                ranges.insert(0, (from_dttm, head_end_dttm))
+            stats_logger.incr("loaded_incrementally_from_cache")
+        else:
+            cached_df = None
+
+        dfs = []
+        queries = []
+        for start_dttm, end_dttm in ranges:
+            result = self.datasource.query(
+                {**query_object.to_dict(), "from_dttm": start_dttm, "to_dttm": end_dttm}
+            )
+            if result.status == QueryStatus.FAILED:
+                return result
+            queries.append(result.query)
+            dfs.append(self.normalize_df(result.df, query_object))
+        if cached_df is not None:
+            dfs.insert(len(dfs) - 1, cached_df)
+        df = pd.concat(dfs, ignore_index=True) if len(dfs) > 1 else dfs[0]
+
+        row_limit = query_object.row_limit
+        if row_limit and (
+            len(df.index) > row_limit or any(len(part) >= row_limit for part in dfs)
+        ):
+            # the time series is truncated, so its buckets are incomplete
+            if cached_df is None:
+                return QueryResult(
+                    df=df, query=queries[0], duration=datetime.now() - qry_start_dttm,
+                )
+            result = self.datasource.query(query_object.to_dict())
+            result.df = self.normalize_df(result.df, query_object)
+            return result
+
+        if cached_df is not None and query_object.orderby:
+            df = self.sort_df(df, query_object)
+
+        # the last buckets can still change, only the older ones are cached
+        timestamps = sorted(df[DTTM_ALIAS].unique()) if not df.empty else []
+        open_buckets = config["DATA_CACHE_INCREMENTAL_OPEN_BUCKETS"]
+        if cache_key and len(timestamps) > open_buckets:
+            final_dttm = pd.Timestamp(timestamps[-open_buckets]).to_pydatetime()
+            timeout = config["DATA_CACHE_INCREMENTAL_TIMEOUT"]
+            set_and_log_cache(
+                cache_manager.data_cache,
+                cache_key,
+                {
+                    "df": serialize_df(
+                        df[df[DTTM_ALIAS] < final_dttm], cache_key, timeout
+                    ),
+                    "from_dttm": from_dttm,
+                    "final_dttm": final_dttm,
+                },
+                timeout,
+                self.datasource.uid,
+            )
+
+        return QueryResult(
+            df=df,
+            query=";\n\n".join(queries),
+            duration=datetime.now() - qry_start_dttm,
+        )
+
+    @staticmethod
+    def sort_df(df: pd.DataFrame, query_object: QueryObject) -> pd.DataFrame:
+        """
+        Sort the rows of a stitched time series like the database would have.
+        """
+        columns = []
+        ascending = []
+        for col, asc in query_object.orderby:
+            name = get_metric_name(col)
+            if not isinstance(name, str) or name not in df.columns:
+                return df
+            columns.append(name)
+            ascending.append(asc)
+        return df.sort_values(
+            columns, ascending=ascending, kind="mergesort", ignore_index=True
+        )
 
     @staticmethod
     def df_metrics_to_num(df: pd.DataFrame, query_object: QueryObject) -> None:
@@ -153,13 +332,19 @@ class QueryContext:
                 # will stay as strings if conversion fails
                 df[col] = df[col].infer_objects()
 
-    def get_data(self, df: pd.DataFrame,) -> Union[str, List[Dict[str, Any]]]:
+    def get_data(
+        self, df: pd.DataFrame,
+    ) -> Union[Iterator[str], List[Dict[str, Any]], pd.DataFrame]:
+        if self.result_format == ChartDataResultFormat.ARROW:
+            # the DataFrame is serialized as it is when sending the response
+            return df
+
         if self.result_format == ChartDataResultFormat.CSV:
             include_index = not isinstance(df.index, pd.RangeIndex)
-            result = csv.df_to_escaped_csv(
-                df, index=include_index, **config["CSV_EXPORT"]
+            # the CSV is rendered while it's sent, one chunk of rows at a time
+            return csv.df_to_escaped_csv_chunks(
+                [df], index=include_index, **config["CSV_EXPORT"]
             )
-            return result or ""
 
         return df.to_dict(orient="records")
 
@@ -168,13 +353,23 @@ class QueryContext:
     ) -> Dict[str, Any]:
         """Returns the query results with both metadata and data"""
 
-        # Get all the payloads from the QueryObjects
-        query_results = [
-            get_query_results(
-                query_obj.result_type or self.result_type, self, query_obj, force_cached
+        def get_results(index: int) -> Dict[str, Any]:
+            # worker threads don't share the ORM objects of the request thread
+            query_context = (
+                self.merge_into_session() if query_executor.in_worker else self
             )
-            for query_obj in self.queries
-        ]
+            query_obj = query_context.queries[index]
+            return get_query_results(
+                query_obj.result_type or self.result_type,
+                query_context,
+                query_obj,
+                force_cached,
+            )
+
+        # Get all the payloads from the QueryObjects
+        query_results = self.run_concurrently(
+            [partial(get_results, index) for index in range(len(self.queries))]
+        )
         return_value = {"queries": query_results}
 
         if cache_query_context:
@@ -189,6 +384,80 @@ class QueryContext:
 
         return return_value
 
+    def run_concurrently(
+        self, funcs: List[Callable[[], Any]], raise_on_timeout: bool = False
+    ) -> List[Any]:
+        """
+        Run the query callables through the query executor, which runs them
+        concurrently when ``CHART_DATA_MAX_CONCURRENT_QUERIES`` is greater than 1.
+
+        :param funcs: the callables running the queries
+        :param raise_on_timeout: raise an exception when a query times out, instead
+            of returning a failed payload for it
+        :returns: the results of the callables, in order
+        """
+        if query_executor.enabled and len(funcs) > 1:
+            self.load_query_attributes()
+        timeout_message = _(
+            "The query did not complete within %(timeout)s seconds",
+            timeout=config["CHART_DATA_CONCURRENT_QUERIES_TIMEOUT"],
+        )
+
+        def on_timeout(_index: int) -> Dict[str, Any]:
+            if raise_on_timeout:
+                raise QueryObjectValidationError(timeout_message)
+            return {
+                "error": timeout_message,
+                "status": QueryStatus.TIMED_OUT,
+                "data": [],
+            }
+
+        database = getattr(self.datasource, "database", None)
+        return query_executor.run(database, funcs, on_timeout)
+
+    def load_query_attributes(self) -> None:
+        """
+        Load the attributes of the ORM objects used to build and run the queries in
+        this thread, since lazy loading them from the worker threads isn't safe.
+        """
+        datasources = {self.datasource} | {
+            query_obj.datasource for query_obj in self.queries if query_obj.datasource
+        }
+        for datasource in datasources:
+            load_attributes(datasource, "database", "cluster", "columns", "metrics")
+            for obj in [*datasource.columns, *datasource.metrics]:
+                load_attributes(obj, "table", "datasource")
+            load_attributes(getattr(datasource, "database", None))
+            load_attributes(getattr(datasource, "cluster", None))
+        user = getattr(g, "user", None)
+        load_attributes(user, "roles")
+
+    def merge_into_session(self) -> QueryContext:
+        """
+        Return a copy of the query context, and of its query objects, with their
+        datasources merged into the session of the current thread, without loading
+        them again from the metadata database.
+        """
+        merged: Dict[int, BaseDatasource] = {}
+
+        def merge(datasource: Optional[BaseDatasource]) -> Optional[BaseDatasource]:
+            state = inspect(datasource, raiseerr=False)
+            if state is None or state.key is None:
+                # not a persisted ORM object
+                return datasource
+            if id(datasource) not in merged:
+                merged[id(datasource)] = db.session.merge(datasource, load=False)
+            return merged[id(datasource)]
+
+        query_context = copy.copy(self)
+        query_context.datasource = cast(BaseDatasource, merge(self.datasource))
+        query_context.queries = []
+        for query_obj in self.queries:
+            query_obj = copy.copy(query_obj)
+            query_obj.datasource = merge(query_obj.datasource)
+            query_context.queries.append(query_obj)
+        return query_context
+
     @property
     def cache_timeout(self) -> int:
         if self.custom_cache_timeout is not None:
@@ -202,6 +471,33 @@ class QueryContext:
             return self.datasource.database.cache_timeout
         return config["CACHE_DEFAULT_TIMEOUT"]
 
+    @property
+    def cache_grace_period(self) -> int:
+        if getattr(self.datasource, "cache_grace_period", None) is not None:
+            return self.datasource.cache_grace_period
+        database = getattr(self.datasource, "database", None)
+        if database and database.cache_grace_period is not None:
+            return database.cache_grace_period
+        return config["DATA_CACHE_GRACE_PERIOD"]
+
+    def refresh_cache(self, query_obj: QueryObject, cache_key: str) -> None:
+        """
+        Refresh the stale cached data of a query object in the background.
+        """
+        # pylint: disable=import-outside-toplevel
+        from superset.tasks.async_queries import refresh_chart_data_cache
+
+        if query_obj not in self.queries:
+            # eg, samples are queried with a copy of the query object
+            return
+        form_data = {
+            **self.cache_values,
+            "queries": [self.cache_values["queries"][self.queries.index(query_obj)]],
+        }
+        schedule_cache_refresh(
+            cache_key, lambda: refresh_chart_data_cache.delay(form_data, get_user_id()),
+        )
+
     def cache_key(self, **extra: Any) -> str:
         """
         The QueryContext cache key is made out of the key/values from
@@ -297,15 +593,20 @@ class QueryContext:
         :return:
         """
         annotation_data: Dict[str, Any] = self.get_native_annotation_data(query_obj)
-        for annotation_layer in [
+        annotation_layers = [
             layer
             for layer in query_obj.annotation_layers
             if layer["sourceType"] in ("line", "table")
-        ]:
-            name = annotation_layer["name"]
-            annotation_data[name] = self.get_viz_annotation_data(
-                annotation_layer, self.force
-            )
+        ]
+        results = self.run_concurrently(
+            [
+                partial(self.get_viz_annotation_data, annotation_layer, self.force)
+                for annotation_layer in annotation_layers
+            ],
+            raise_on_timeout=True,
+        )
+        for annotation_layer, result in zip(annotation_layers, results):
+            annotation_data[annotation_layer["name"]] = result
         return annotation_data
 
     def get_df_payload(  # pylint: disable=too-many-statements,too-many-locals
@@ -322,78 +623,101 @@ class QueryContext:
         query = ""
         annotation_data = {}
         error_message = None
-        if cache_key and cache_manager.data_cache and not self.force:
-            cache_value = cache_manager.data_cache.get(cache_key)
-            if cache_value:
-                stats_logger.incr("loading_from_cache")
-                try:
-                    df = cache_value["df"]
-                    query = cache_value["query"]
-                    annotation_data = cache_value.get("annotation_data", {})
-                    status = QueryStatus.SUCCESS
-                    is_loaded = True
-                    stats_logger.incr("loaded_from_cache")
-                except KeyError as ex:
-                    logger.exception(ex)
-                    logger.error(
-                        "Error reading cache: %s",
-                        error_msg_from_exception(ex),
-                        exc_info=True,
-                    )
-                logger.info("Serving from cache")
+        cache_lock = None
+        try:
+            if cache_key and cache_manager.data_cache and not self.force:
+                cache_value, cache_lock = get_or_lock_cache(
+                    cache_manager.data_cache, cache_key, coalesce=not force_cached
+                )
+                if cache_value:
+                    stats_logger.incr("loading_from_cache")
+                    try:
+                        df = deserialize_df(cache_value["df"])
+                        query = cache_value["query"]
+                        annotation_data = cache_value.get("annotation_data", {})
+                        status = QueryStatus.SUCCESS
+                        is_loaded = True
+                        stats_logger.incr("loaded_from_cache")
+                        if self.cache_grace_period and is_cache_value_stale(
+                            cache_value, self.cache_timeout
+                        ):
+                            stats_logger.incr("loaded_stale_from_cache")
+                            self.refresh_cache(query_obj, cache_key)
+                    except (KeyError, CacheLoadError) as ex:
+                        logger.exception(ex)
+                        logger.error(
+                            "Error reading cache: %s",
+                            error_msg_from_exception(ex),
+                            exc_info=True,
+                        )
+                    logger.info("Serving from cache")
 
-        if force_cached and not is_loaded:
-            logger.warning(
-                "force_cached (QueryContext): value not found for key %s", cache_key
-            )
-            raise CacheLoadError("Error loading data from cache")
+            if force_cached and not is_loaded:
+                logger.warning(
+                    "force_cached (QueryContext): value not found for key %s", cache_key
+                )
+                raise CacheLoadError("Error loading data from cache")
 
-        if query_obj and not is_loaded:
-            try:
-                invalid_columns = [
-                    col
-                    for col in query_obj.columns
-                    + query_obj.groupby
-                    + get_column_names_from_metrics(query_obj.metrics or [])
-                    if col not in self.datasource.column_names and col != DTTM_ALIAS
-                ]
-                if invalid_columns:
-                    raise QueryObjectValidationError(
-                        _(
-                            "Columns missing in datasource: %(invalid_columns)s",
-                            invalid_columns=invalid_columns,
+            if query_obj and not is_loaded:
+                try:
+                    invalid_columns = [
+                        col
+                        for col in query_obj.columns
+                        + query_obj.groupby
+                        + get_column_names_from_metrics(query_obj.metrics or [])
+                        if col not in self.datasource.column_names and col != DTTM_ALIAS
+                    ]
+                    if invalid_columns:
+                        raise QueryObjectValidationError(
+                            _(
+                                "Columns missing in datasource: %(invalid_columns)s",
+                                invalid_columns=invalid_columns,
+                            )
                         )
-                    )
-                query_result = self.get_query_result(query_obj)
-                status = query_result["status"]
-                query = query_result["query"]
-                error_message = query_result["error_message"]
-                df = query_result["df"]
-                annotation_data = self.get_annotation_data(query_obj)
-
-                if status != QueryStatus.FAILED:
-                    stats_logger.incr("loaded_from_source")
-                    if not self.force:
-                        stats_logger.incr("loaded_from_source_without_force")
-                    is_loaded = True
-            except QueryObjectValidationError as ex:
-                error_message = str(ex)
-                status = QueryStatus.FAILED
-            except Exception as ex:  # pylint: disable=broad-except
-                logger.exception(ex)
-                if not error_message:
+                    query_result = self.get_query_result(query_obj)
+                    status = query_result["status"]
+                    query = query_result["query"]
+                    error_message = query_result["error_message"]
+                    df = query_result["df"]
+                    annotation_data = self.get_annotation_data(query_obj)
+
+                    if status != QueryStatus.FAILED:
+                        stats_logger.incr("loaded_from_source")
+                        if not self.force:
+                            stats_logger.incr("loaded_from_source_without_force")
+                        is_loaded = True
+                except QueryObjectValidationError as ex:
                     error_message = str(ex)
-                status = QueryStatus.FAILED
-                stacktrace = get_stacktrace()
-
-            if is_loaded and cache_key and status != QueryStatus.FAILED:
-                set_and_log_cache(
-                    cache_manager.data_cache,
-                    cache_key,
-                    {"df": df, "query": query, "annotation_data": annotation_data},
-                    self.cache_timeout,
-                    self.datasource.uid,
-                )
+                    status = QueryStatus.FAILED
+                except Exception as ex:  # pylint: disable=broad-except
+                    logger.exception(ex)
+                    if not error_message:
+                        error_message = str(ex)
+                    status = QueryStatus.FAILED
+                    stacktrace = get_stacktrace()
+
+                if is_loaded and cache_key and status != QueryStatus.FAILED:
+                    set_and_log_cache(
+                        cache_manager.data_cache,
+                        cache_key,
+                        {
+                            "df": serialize_df(
+                                df,
+                                cache_key,
+                                self.cache_timeout,
+                                self.cache_grace_period,
+                            ),
+                            "query": query,
+                            "annotation_data": annotation_data,
+                        },
+                        self.cache_timeout,
+                        self.datasource.uid,
+                        self.cache_grace_period,
+                    )
+        finally:
+            # the lock is released even when loading or storing the data fails
+            if cache_lock:
+                cache_lock.release()
         return {
             "cache_key": cache_key,
             "cached_dttm": cache_value["dttm"] if cache_value is not None else None,
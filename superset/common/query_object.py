@@ -83,6 +83,7 @@ class QueryObject:
     metrics: Optional[List[Metric]]
     row_limit: int
     row_offset: int
+    is_paginated: bool
     filter: List[Dict[str, Any]]
     timeseries_limit: int
     timeseries_limit_metric: Optional[Metric]
@@ -178,6 +179,8 @@ class QueryObject:
 
         self.row_limit = config["ROW_LIMIT"] if row_limit is None else row_limit
         self.row_offset = row_offset or 0
+        # a row window is requested, including when it's the first page
+        self.is_paginated = row_offset is not None
         self.filter = filters or []
         self.timeseries_limit = timeseries_limit
         self.timeseries_limit_metric = timeseries_limit_metric
@@ -274,7 +277,7 @@ class QueryObject:
             "is_timeseries": self.is_timeseries,
             "metrics": self.metrics,
             "row_limit": self.row_limit,
-            "row_offset": self.row_offset,
+            "row_offset": self.row_offset if self.is_paginated else None,
             "filter": self.filter,
             "timeseries_limit": self.timeseries_limit,
             "timeseries_limit_metric": self.timeseries_limit_metric,
@@ -313,6 +316,19 @@ class QueryObject:
         for k in ["from_dttm", "to_dttm"]:
             del cache_dict[k]
 
+        if self.is_paginated:
+            # the rows of a page are sorted, unlike the rows of the whole query
+            cache_dict["is_paginated"] = True
+        else:
+            cache_dict["row_offset"] = 0
+
+        if self.is_rowcount:
+            # the row count is shared by all the pages of a query
+            for k in ["row_offset", "orderby"]:
+                del cache_dict[k]
+            cache_dict.pop("is_paginated", None)
+            cache_dict.pop("post_processing", None)
+
         annotation_fields = [
             "annotationType",
             "descriptionColumns",
@@ -43,6 +43,7 @@ from superset.jinja_context import (  # pylint: disable=unused-import
 )
 from superset.stats_logger import DummyStatsLogger
 from superset.typing import CacheConfig
+from superset.utils.cache_serializers import DataFrameSerializer
 from superset.utils.core import is_test, parse_boolean_string
 from superset.utils.encrypt import SQLAlchemyUtilsAdapter
 from superset.utils.log import DBEventLogger
@@ -186,6 +187,17 @@ SQLALCHEMY_ENCRYPTED_FIELD_TYPE_ADAPTER = SQLAlchemyUtilsAdapter
 # The limit of queries fetched for query search
 QUERY_SEARCH_LIMIT = 1000
 
+# Index the words of the SQL of the queries run in SQL Lab, and the tables they
+# reference, in the query_search_term table, and search the query history through
+# it rather than by scanning the SQL of all the queries. The words of the search
+# text narrow down the queries from the start of the words of the SQL, without
+# changing the results of the search: the first word of the text, which may start
+# in the middle of a word, is left to the scan. Queries run before enabling it can
+# be indexed with `superset index-query-history`. On Postgres, the SQL of the
+# queries also has a trigram index when the pg_trgm extension is available, which
+# speeds up the default search.
+SQLLAB_QUERY_SEARCH_INDEX = False
+
 # Flask-WTF flag for CSRF
 WTF_CSRF_ENABLED = True
 
@@ -527,6 +539,43 @@ CACHE_CONFIG: CacheConfig = {"CACHE_TYPE": "null"}
 # Cache for datasource metadata and query results
 DATA_CACHE_CONFIG: CacheConfig = {"CACHE_TYPE": "null"}
 
+# Serializer for the DataFrames stored in the data cache. By default they are
+# pickled by the cache backend; ``ArrowDataFrameSerializer`` and
+# ``ParquetDataFrameSerializer`` store them as binary payloads compressed with
+# zstd or lz4 instead, which are smaller and faster to load. The payloads are
+# stored under their own cache keys, separately from the metadata of the cache
+# entries (eg, the query). eg:
+#
+#     from superset.utils.cache_serializers import ArrowDataFrameSerializer
+#     DATA_CACHE_SERIALIZER = ArrowDataFrameSerializer(compression="lz4")
+DATA_CACHE_SERIALIZER: DataFrameSerializer = DataFrameSerializer()
+
+# Coalesce concurrent requests for the same chart data. On a data cache miss the
+# first request takes a lock in the cache backend and runs the query, while the
+# other requests (including async queries run by the Celery workers) wait for its
+# result, for up to DATA_CACHE_LOCK_TIMEOUT seconds before running the query
+# themselves. Requires a data cache shared by all the web servers and workers,
+# like Redis or Memcached.
+DATA_CACHE_COALESCE_MISSES = False
+DATA_CACHE_LOCK_TIMEOUT = 60
+
+# Duration (in seconds) during which expired chart data is still served from the
+# data cache, while a Celery task refreshes it in the background
+# (stale-while-revalidate). Cache entries are kept for their cache timeout plus
+# the grace period. Can be overridden per database and per datasource with their
+# ``cache_grace_period``; a grace period of 0 disables it.
+DATA_CACHE_GRACE_PERIOD = 0
+
+# Cache the results of time-series queries on SQL datasets incrementally: the
+# time buckets that are old enough to be final are cached on their own, for
+# DATA_CACHE_INCREMENTAL_TIMEOUT seconds, and refreshing a query only scans the
+# time range that isn't cached yet. The last DATA_CACHE_INCREMENTAL_OPEN_BUCKETS
+# buckets of a query are always queried again, as late rows can still change them.
+# Forcing a refresh of a chart queries its whole time range again.
+DATA_CACHE_INCREMENTAL = False
+DATA_CACHE_INCREMENTAL_OPEN_BUCKETS = 2
+DATA_CACHE_INCREMENTAL_TIMEOUT = 7 * 24 * 60 * 60
+
 # store cache keys by datasource UID (via CacheKey) for custom processing/invalidation
 STORE_CACHE_KEYS_IN_METADATA_DB = False
 
@@ -653,6 +702,36 @@ SQL_MAX_ROW = 100000
 # exported CSVs
 DISPLAY_MAX_ROW = 10000
 
+# Fetch query results from the cursor in batches of rows instead of all at once.
+# Each batch is converted to Arrow as soon as it's fetched, which lowers the peak
+# memory used by large results. The size of the batches can be tuned per engine
+# through `fetch_batch_size` in the DB engine spec.
+RESULTS_STREAMING_FETCH = False
+
+# Maximum number of SQLAlchemy engines kept in the engine registry. Engines are
+# keyed by database, effective user, schema and source, and are reused across
+# requests; the least recently used engine is disposed when the registry is full,
+# and an engine is disposed when the connection settings of its database change.
+# Engines whose parameters can't be fingerprinted (eg, objects added to the
+# ``connect_args`` by ``DB_CONNECTION_MUTATOR``) are never registered.
+# Databases can enable connection pooling by adding a ``connection_pool`` object
+# to their ``extra``, eg, ``{"pool_size": 5, "max_overflow": 10,
+# "pool_recycle": 3600, "pool_pre_ping": true}``. Queries that explicitly ask for
+# a ``NullPool`` engine (eg, SQL Lab queries run by Celery workers) don't use it.
+ENGINE_REGISTRY_MAX_SIZE = 100
+
+# Maximum number of queries of a single chart data request that run at the same
+# time. When greater than 1 the query objects (and the annotation layers) of a
+# request run concurrently, bounded by a thread pool per database of
+# ``CHART_DATA_QUERY_POOL_SIZE`` threads; the size of the pool can be overridden
+# per database by adding ``max_concurrent_queries`` to its ``extra``. Queries that
+# don't complete within ``CHART_DATA_CONCURRENT_QUERIES_TIMEOUT`` seconds are
+# reported as timed out; the ones that already started are not cancelled on the
+# database and keep a thread of the pool until they complete.
+CHART_DATA_MAX_CONCURRENT_QUERIES = 1
+CHART_DATA_QUERY_POOL_SIZE = 5
+CHART_DATA_CONCURRENT_QUERIES_TIMEOUT = 60
+
 # Default row limit for SQL Lab queries. Is overridden by setting a new limit in
 # the SQL Lab UI
 DEFAULT_SQLLAB_LIMIT = 10000
@@ -727,6 +806,11 @@ SQLLAB_TIMEOUT = 30
 # Timeout duration for SQL Lab query validation
 SQLLAB_VALIDATION_TIMEOUT = 10
 
+# How long the validation of the statements of SQL Lab queries is cached, in
+# seconds, in the metadata cache (CACHE_CONFIG). Validating a script again only
+# validates the statements that changed. Set to 0 to disable the cache.
+SQLLAB_VALIDATION_CACHE_TIMEOUT = 600
+
 # SQLLAB_DEFAULT_DBID
 SQLLAB_DEFAULT_DBID = None
 
@@ -738,6 +822,21 @@ SQLLAB_ASYNC_TIME_LIMIT_SEC = 60 * 60 * 6
 # query costs before they run. These EXPLAIN queries should have a small
 # timeout.
 SQLLAB_QUERY_COST_ESTIMATE_TIMEOUT = 10  # seconds
+# Cost estimates are cached in the metadata cache (CACHE_CONFIG), by database, schema
+# and statements, so that estimating the same query again doesn't run the EXPLAIN
+# queries again. Set to 0 to disable the cache.
+SQLLAB_QUERY_COST_ESTIMATE_CACHE_TIMEOUT = 60  # seconds
+# The cost of the queries run asynchronously in SQL Lab can be estimated before
+# running them, to reject the queries above the thresholds set for their engine. The
+# thresholds are keyed by the metrics of the estimates of the engine, eg:
+#
+# SQLLAB_QUERY_COST_THRESHOLDS = {
+#     "postgresql": {"Total cost": 1e7},
+#     "presto": {"cpuCost": 1e12, "outputSizeInBytes": 1e11},
+# }
+#
+# Cost estimation needs to be enabled on the databases, see below.
+SQLLAB_QUERY_COST_THRESHOLDS: Dict[str, Dict[str, float]] = {}
 # The feature is off by default, and currently only supported in Presto and Postgres.
 # It also need to be enabled on a per-database basis, by adding the key/value pair
 # `cost_estimate_enabled: true` to the database `extra` attribute.
@@ -806,6 +905,13 @@ RESULTS_BACKEND: Optional[BaseCache] = None
 # in order to disable should breaking issues be discovered.
 RESULTS_BACKEND_USE_MSGPACK = True
 
+# Store the results of SQL Lab queries in chunks of RESULTS_BACKEND_CHUNK_SIZE
+# rows, each one a compressed Arrow stream under its own key, instead of a single
+# blob. Displaying the first rows of the results then only fetches the chunks that
+# hold them. Requires RESULTS_BACKEND_USE_MSGPACK.
+RESULTS_BACKEND_CHUNKED = False
+RESULTS_BACKEND_CHUNK_SIZE = 100000
+
 # The S3 bucket where you want to store your external hive tables created
 # from CSV files. For example, 'companyname-superset'
 CSV_TO_HIVE_UPLOAD_S3_BUCKET = None
@@ -900,6 +1006,27 @@ FAB_ADD_SECURITY_PERMISSION_VIEW = False
 FAB_ADD_SECURITY_VIEW_MENU_VIEW = False
 FAB_ADD_SECURITY_PERMISSION_VIEWS_VIEW = False
 
+# The permissions granted by a user's roles are compiled into a set of
+# (permission, view menu) pairs once per request. Set a timeout (in seconds) to
+# also share the compiled sets across requests and workers through the metadata
+# cache (CACHE_CONFIG). They are invalidated whenever roles or permissions are
+# changed through Superset, so the timeout only bounds how long changes made
+# directly in the metadata database can go unnoticed.
+PERMISSIONS_CACHE_TIMEOUT = 0
+
+# Row level security filters are loaded into an index by table once per request.
+# Set a timeout (in seconds) to also share the index across requests and workers
+# through the metadata cache. It is invalidated whenever a filter is saved.
+RLS_FILTERS_CACHE_TIMEOUT = 0
+
+# Whether the user can access each table referenced by a SQL Lab query is decided
+# once per request. Set a short timeout (in seconds) to also cache the decisions
+# per role set through the metadata cache, so that fetching the results of a query
+# repeatedly only costs a cache lookup. Role and permission changes invalidate
+# them, while newly created or deleted datasets may take up to the timeout to be
+# taken into account.
+TABLE_ACCESS_CACHE_TIMEOUT = 0
+
 # The link to a page containing common errors and their resolutions
 # It will be appended at the bottom of sql_lab errors.
 TROUBLESHOOTING_LINK = ""
@@ -920,6 +1047,15 @@ BLUEPRINTS: List[Blueprint] = []
 # into a proxied one
 TRACKING_URL_TRANSFORMER = lambda x: x
 
+# Cache used as a channel between the web servers and the workers for the
+# progress and cancellation of running SQL Lab queries, e.g. a RedisCache. When
+# configured, the workers polling a running query read the cancellation flag from
+# it rather than from the metadata database, and persist the progress of the query
+# at most every SQLLAB_PROGRESS_FLUSH_INTERVAL seconds. A SimpleCache can only be
+# used when the queries run in the web server process.
+SQLLAB_PROGRESS_CACHE_CONFIG: CacheConfig = {"CACHE_TYPE": "null"}
+SQLLAB_PROGRESS_FLUSH_INTERVAL = 5
+
 # Interval between consecutive polls when using Hive Engine
 HIVE_POLL_INTERVAL = 5
 
@@ -1197,6 +1333,13 @@ GLOBAL_ASYNC_QUERIES_JWT_SECRET = "test-secret-change-me"
 GLOBAL_ASYNC_QUERIES_TRANSPORT = "polling"
 GLOBAL_ASYNC_QUERIES_POLLING_DELAY = 500
 GLOBAL_ASYNC_QUERIES_WEBSOCKET_URL = "ws://127.0.0.1:8080/"
+# When GLOBAL_ASYNC_QUERIES is enabled, the changes of SQL Lab queries are also
+# published to a stream per user, which clients can poll through
+# /superset/queries_feed/ instead of polling /superset/queries/. This is how long
+# a request waits for changes before returning, in milliseconds; with 0 it returns
+# immediately. A waiting request holds its web server worker, so only raise it to
+# long-poll (eg, 25000) when Superset runs with async workers, like gevent.
+SQLLAB_QUERY_FEED_TIMEOUT = 1000
 
 # A SQL dataset health check. Note if enabled it is strongly advised that the callable
 # be memoized to aid with performance, i.e.,
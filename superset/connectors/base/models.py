@@ -106,6 +106,7 @@ class BaseDatasource(
     filter_select_enabled = Column(Boolean, default=False)
     offset = Column(Integer, default=0)
     cache_timeout = Column(Integer)
+    cache_grace_period = Column(Integer)
     params = Column(String(1000))
     perm = Column(String(1000))
     schema_perm = Column(String(1000))
@@ -255,6 +256,7 @@ class BaseDatasource(
             "schema": self.schema,
             "offset": self.offset,
             "cache_timeout": self.cache_timeout,
+            "cache_grace_period": self.cache_grace_period,
             "params": self.params,
             "perm": self.perm,
             "edit_url": self.url,
@@ -108,12 +108,14 @@ class SqlaQuery(NamedTuple):
     labels_expected: List[str]
     prequeries: List[str]
     sqla_query: Select
+    skipped_rows: int = 0
 
 
 class QueryStringExtended(NamedTuple):
     labels_expected: List[str]
     prequeries: List[str]
     sql: str
+    skipped_rows: int = 0
 
 
 @dataclass
@@ -129,6 +131,7 @@ class AnnotationDatasource(BaseDatasource):
     """
 
     cache_timeout = 0
+    cache_grace_period = 0
     changed_on = None
     type = "annotation"
     column_names = [
@@ -823,7 +826,10 @@ class SqlaTable(  # pylint: disable=too-many-public-methods,too-many-instance-at
         sql = sqlparse.format(sql, reindent=True)
         sql = self.mutate_query_from_config(sql)
         return QueryStringExtended(
-            labels_expected=sqlaq.labels_expected, sql=sql, prequeries=sqlaq.prequeries
+            labels_expected=sqlaq.labels_expected,
+            sql=sql,
+            prequeries=sqlaq.prequeries,
+            skipped_rows=sqlaq.skipped_rows,
         )
 
     def get_query_str(self, query_obj: QueryObjectDict) -> str:
@@ -1039,6 +1045,7 @@ class SqlaTable(  # pylint: disable=too-many-public-methods,too-many-instance-at
         template_processor = self.get_template_processor(**template_kwargs)
         db_engine_spec = self.db_engine_spec
         prequeries: List[str] = []
+        skipped_rows = 0
         orderby = orderby or []
         extras = extras or {}
         need_groupby = bool(metrics is not None or groupby)
@@ -1333,7 +1340,25 @@ class SqlaTable(  # pylint: disable=too-many-public-methods,too-many-instance-at
 
         self.make_orderby_compatible(select_exprs, orderby_exprs)
 
-        for col, (orig_col, ascending) in zip(orderby_exprs, orderby):
+        order_clauses = [
+            (col, ascending)
+            for col, (_orig_col, ascending) in zip(orderby_exprs, orderby)
+        ]
+        if is_rowcount:
+            # the row count covers all the pages of the query, which are only
+            # capped by the row limit
+            order_clauses = []
+            row_offset = None
+        elif row_offset is not None and not order_clauses:
+            # rows need a stable order to be split into pages, including the first
+            # one
+            order_clauses = [
+                (col, True)
+                for col in list(groupby_exprs_with_timestamp.values())
+                or [col for col in select_exprs if col.key in labels_expected]
+            ]
+
+        for col, ascending in order_clauses:
             if not db_engine_spec.allows_alias_in_orderby and isinstance(col, Label):
                 # if engine does not allow using SELECT alias in ORDER BY
                 # revert to the underlying column
@@ -1341,6 +1366,12 @@ class SqlaTable(  # pylint: disable=too-many-public-methods,too-many-instance-at
             direction = asc if ascending else desc
             qry = qry.order_by(direction(col))
 
+        if row_offset and not db_engine_spec.allows_offset:
+            # fetch the rows up to the end of the page, the leading rows are
+            # dropped once the results are fetched
+            row_limit = row_limit + row_offset if row_limit else None
+            skipped_rows = row_offset
+            row_offset = None
         if row_limit:
             qry = qry.limit(row_limit)
         if row_offset:
@@ -1452,6 +1483,7 @@ class SqlaTable(  # pylint: disable=too-many-public-methods,too-many-instance-at
             labels_expected=labels_expected,
             sqla_query=qry,
             prequeries=prequeries,
+            skipped_rows=skipped_rows,
         )
 
     def _get_timeseries_orderby(
@@ -1520,6 +1552,8 @@ class SqlaTable(  # pylint: disable=too-many-public-methods,too-many-instance-at
                 if len(df.columns) > len(labels_expected):
                     df = df.iloc[:, 0 : len(labels_expected)]
                 df.columns = labels_expected
+            if df is not None and query_str_ext.skipped_rows:
+                df = df.iloc[query_str_ext.skipped_rows :].reset_index(drop=True)
             return df
 
         try:
@@ -1725,3 +1759,14 @@ class RowLevelSecurityFilter(Model, AuditMixinNullable):
     )
 
     clause = Column(Text, nullable=False)
+
+
+sa.event.listen(
+    RowLevelSecurityFilter, "after_insert", security_manager.rls_filters_changed
+)
+sa.event.listen(
+    RowLevelSecurityFilter, "after_update", security_manager.rls_filters_changed
+)
+sa.event.listen(
+    RowLevelSecurityFilter, "after_delete", security_manager.rls_filters_changed
+)
@@ -410,6 +410,7 @@ class TableModelView(  # pylint: disable=too-many-ancestors
         "default_endpoint",
         "offset",
         "cache_timeout",
+        "cache_grace_period",
         "is_sqllab_view",
         "template_params",
         "extra",
@@ -472,6 +473,11 @@ class TableModelView(  # pylint: disable=too-many-ancestors
             "A timeout of 0 indicates that the cache never expires. "
             "Note this defaults to the database timeout if undefined."
         ),
+        "cache_grace_period": _(
+            "Duration (in seconds) during which expired cached data of this table "
+            "is still served, while it's refreshed in the background. "
+            "Note this defaults to the database grace period if undefined."
+        ),
         "extra": utils.markdown(
             "Extra data to specify table metadata. Currently supports "
             'metadata of the format: `{ "certification": { "certified_by": '
@@ -492,6 +498,7 @@ class TableModelView(  # pylint: disable=too-many-ancestors
         "default_endpoint": _("Default Endpoint"),
         "offset": _("Offset"),
         "cache_timeout": _("Cache Timeout"),
+        "cache_grace_period": _("Cache Grace Period"),
         "table_name": _("Table Name"),
         "fetch_values_predicate": _("Fetch Values Predicate"),
         "owners": _("Owners"),
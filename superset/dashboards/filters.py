@@ -73,8 +73,10 @@ class DashboardAccessFilter(BaseFilter):
         if is_user_admin():
             return query
 
-        datasource_perms = security_manager.user_view_menu_names("datasource_access")
-        schema_perms = security_manager.user_view_menu_names("schema_access")
+        datasource_perms = security_manager.user_view_menu_names_query(
+            "datasource_access"
+        )
+        schema_perms = security_manager.user_view_menu_names_query("schema_access")
 
         is_rbac_disabled_filter = []
         dashboard_has_roles = Dashboard.roles.any()
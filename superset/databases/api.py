@@ -101,6 +101,7 @@ class DatabaseRestApi(BaseSupersetModelRestApi):
         "id",
         "database_name",
         "cache_timeout",
+        "cache_grace_period",
         "expose_in_sqllab",
         "allow_run_async",
         "allow_csv_upload",
@@ -126,6 +127,7 @@ class DatabaseRestApi(BaseSupersetModelRestApi):
         "allow_multi_schema_metadata_fetch",
         "allow_run_async",
         "allows_cost_estimate",
+        "allows_sampling",
         "allows_subquery",
         "allows_virtual_table_explore",
         "backend",
@@ -144,6 +146,7 @@ class DatabaseRestApi(BaseSupersetModelRestApi):
         "database_name",
         "sqlalchemy_uri",
         "cache_timeout",
+        "cache_grace_period",
         "expose_in_sqllab",
         "allow_run_async",
         "allow_csv_upload",
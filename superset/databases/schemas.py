@@ -29,7 +29,11 @@ from sqlalchemy.exc import ArgumentError
 
 from superset.db_engine_specs import BaseEngineSpec, get_engine_specs
 from superset.exceptions import CertificateException, SupersetSecurityException
-from superset.models.core import ConfigurationMethod, PASSWORD_MASK
+from superset.models.core import (
+    ConfigurationMethod,
+    CONNECTION_POOL_PARAMS,
+    PASSWORD_MASK,
+)
 from superset.security.analytics_db_safety import check_sqlalchemy_uri
 from superset.utils.core import markdown, parse_ssl_cert
 
@@ -45,6 +49,11 @@ cache_timeout_description = (
     "A timeout of 0 indicates that the cache never expires. "
     "Note this defaults to the global timeout if undefined."
 )
+cache_grace_period_description = (
+    "Duration (in seconds) during which expired cached data of charts of this "
+    "database is still served, while it's refreshed in the background. "
+    "Note this defaults to the global grace period if undefined."
+)
 expose_in_sqllab_description = "Expose this database to SQLLab"
 allow_run_async_description = (
     "Operate the database in asynchronous mode, meaning  "
@@ -117,7 +126,10 @@ extra_description = markdown(
     "4. the ``version`` field is a string specifying the this db's version. "
     "This should be used with Presto DBs so that the syntax is correct<br/>"
     "5. The ``allows_virtual_table_explore`` field is a boolean specifying "
-    "whether or not the Explore button in SQL Lab results is shown.",
+    "whether or not the Explore button in SQL Lab results is shown.<br/>"
+    "6. The ``connection_pool`` object enables connection pooling for this "
+    'database. Specify it as **"connection_pool": {"pool_size": 5, '
+    '"max_overflow": 10, "pool_recycle": 3600, "pool_pre_ping": true}**.',
     True,
 )
 get_export_ids_schema = {"type": "array", "items": {"type": "integer"}}
@@ -211,6 +223,18 @@ def extra_validator(value: str) -> str:
                             )
                         ]
                     )
+            for key in extra_.get("connection_pool", {}):
+                if key not in CONNECTION_POOL_PARAMS:
+                    raise ValidationError(
+                        [
+                            _(
+                                "The connection_pool in Extra field "
+                                "is not configured correctly. The key "
+                                "%(key)s is invalid.",
+                                key=key,
+                            )
+                        ]
+                    )
     return value
 
 
@@ -353,6 +377,9 @@ class DatabasePostSchema(Schema, DatabaseParametersSchemaMixin):
     cache_timeout = fields.Integer(
         description=cache_timeout_description, allow_none=True
     )
+    cache_grace_period = fields.Integer(
+        description=cache_grace_period_description, allow_none=True
+    )
     expose_in_sqllab = fields.Boolean(description=expose_in_sqllab_description)
     allow_run_async = fields.Boolean(description=allow_run_async_description)
     allow_csv_upload = fields.Boolean(description=allow_csv_upload_description)
@@ -395,6 +422,9 @@ class DatabasePutSchema(Schema, DatabaseParametersSchemaMixin):
     cache_timeout = fields.Integer(
         description=cache_timeout_description, allow_none=True
     )
+    cache_grace_period = fields.Integer(
+        description=cache_grace_period_description, allow_none=True
+    )
     expose_in_sqllab = fields.Boolean(description=expose_in_sqllab_description)
     allow_run_async = fields.Boolean(description=allow_run_async_description)
     allow_csv_upload = fields.Boolean(description=allow_csv_upload_description)
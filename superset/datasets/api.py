@@ -133,6 +133,7 @@ class DatasetRestApi(BaseSupersetModelRestApi):
         "offset",
         "default_endpoint",
         "cache_timeout",
+        "cache_grace_period",
         "is_sqllab_view",
         "template_params",
         "owners.id",
@@ -173,6 +174,7 @@ class DatasetRestApi(BaseSupersetModelRestApi):
         "offset",
         "default_endpoint",
         "cache_timeout",
+        "cache_grace_period",
         "is_sqllab_view",
         "template_params",
         "owners",
@@ -85,6 +85,7 @@ class DatasetPutSchema(Schema):
     offset = fields.Integer(allow_none=True)
     default_endpoint = fields.String(allow_none=True)
     cache_timeout = fields.Integer(allow_none=True)
+    cache_grace_period = fields.Integer(allow_none=True)
     is_sqllab_view = fields.Boolean(allow_none=True)
     template_params = fields.String(allow_none=True)
     owners = fields.List(fields.Integer())
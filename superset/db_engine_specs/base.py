@@ -24,6 +24,7 @@ from typing import (
     Any,
     Callable,
     Dict,
+    Iterator,
     List,
     Match,
     NamedTuple,
@@ -40,7 +41,7 @@ import pandas as pd
 import sqlparse
 from apispec import APISpec
 from apispec.ext.marshmallow import MarshmallowPlugin
-from flask import current_app, g
+from flask import current_app
 from flask_babel import gettext as __, lazy_gettext as _
 from marshmallow import fields, Schema
 from marshmallow.validate import Range
@@ -58,12 +59,13 @@ from typing_extensions import TypedDict
 
 from superset import security_manager, sql_parse
 from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
+from superset.extensions import cache_manager
 from superset.models.sql_lab import Query
 from superset.models.sql_types.base import literal_dttm_type_factory
 from superset.sql_parse import ParsedQuery, Table
 from superset.utils import core as utils
 from superset.utils.core import ColumnSpec, GenericDataType
-from superset.utils.hashing import md5_sha_from_str
+from superset.utils.hashing import md5_sha_from_dict, md5_sha_from_str
 from superset.utils.memoized import memoized
 from superset.utils.network import is_hostname_valid, is_port_open
 
@@ -287,11 +289,22 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
     # if TRUE, then it doesn't have to.
     allows_hidden_ordeby_agg = True
 
+    # Whether the OFFSET clause is supported, if not the leading rows of a row
+    # window are skipped after fetching them
+    allows_offset = True
+
     force_column_alias_quotes = False
     arraysize = 0
+    # number of rows fetched from the cursor at a time when streaming results
+    fetch_batch_size = 10000
     max_column_name_length = 0
     try_remove_schema_from_table_name = True  # pylint: disable=invalid-name
     run_multiple_statements_as_one = False
+    # clause sampling a table in the preview mode of SQL Lab, formatted with the
+    # percentage of rows to sample, eg "TABLESAMPLE SYSTEM ({percent})"
+    table_sample_clause: Optional[str] = None
+    # whether the sampling clause goes between the table name and its alias
+    table_sample_before_alias = False
     custom_errors: Dict[
         Pattern[str], Tuple[str, SupersetErrorType, Dict[str, Any]]
     ] = {}
@@ -509,6 +522,36 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
         except Exception as ex:
             raise cls.get_dbapi_mapped_exception(ex)
 
+    @classmethod
+    def fetch_data_batches(
+        cls, cursor: Any, limit: Optional[int] = None
+    ) -> Iterator[List[Tuple[Any, ...]]]:
+        """
+        Fetch the results of the cursor in batches of at most `fetch_batch_size`
+        rows, so that earlier batches can be released while the rest of the
+        result is being fetched. The stream stops as soon as `limit` rows have
+        been fetched.
+
+        :param cursor: Cursor instance
+        :param limit: Maximum number of rows to be returned by the cursor
+        :return: Iterator over the batches of rows
+        """
+        if cls.arraysize:
+            cursor.arraysize = cls.arraysize
+        fetched = 0
+        try:
+            while limit is None or fetched < limit:
+                batch_size = cls.fetch_batch_size
+                if limit is not None:
+                    batch_size = min(batch_size, limit - fetched)
+                data = cursor.fetchmany(batch_size)
+                if not data:
+                    break
+                fetched += len(data)
+                yield data
+        except Exception as ex:
+            raise cls.get_dbapi_mapped_exception(ex)
+
     @classmethod
     def expand_data(
         cls, columns: List[Dict[Any, Any]], data: List[Dict[Any, Any]]
@@ -967,6 +1010,26 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
             sql = sqlparse.format(sql, reindent=True)
         return sql
 
+    @classmethod
+    def apply_sample_to_sql(cls, sql: str, percent: float) -> Optional[str]:
+        """
+        Sample the tables read by a query, to preview its results without scanning
+        the whole tables.
+
+        :param sql: A single SQL statement
+        :param percent: The percentage of the rows of the tables to sample
+        :return: The query reading samples of its tables, or None if the engine
+            can't sample tables or the query reads no table
+        """
+        if not cls.table_sample_clause:
+            return None
+        parsed_query = ParsedQuery(sql)
+        sampled_sql = parsed_query.set_table_sample(
+            cls.table_sample_clause.format(percent=percent),
+            before_alias=cls.table_sample_before_alias,
+        )
+        return sampled_sql if sampled_sql != parsed_query.stripped() else None
+
     @classmethod
     def estimate_statement_cost(cls, statement: str, cursor: Any,) -> Dict[str, Any]:
         """
@@ -1010,35 +1073,95 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
 
         return sql
 
+    @classmethod
+    def estimate_statements_cost(
+        cls, statements: List[str], cursor: Any
+    ) -> List[Dict[str, Any]]:
+        """
+        Estimate the cost of the statements of a query, over a single cursor.
+
+        Engines whose driver can send the estimates in fewer round trips can
+        override this to do so.
+
+        :param statements: The processed SQL statements
+        :param cursor: Cursor instance
+        :return: The costs of the statements
+        """
+        return [
+            cls.estimate_statement_cost(statement, cursor) for statement in statements
+        ]
+
+    @classmethod
+    def get_query_cost_metrics(cls, raw_cost: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Get the numeric metrics of the cost estimate of a statement, which are
+        compared to the ``SQLLAB_QUERY_COST_THRESHOLDS``.
+
+        :param raw_cost: Raw estimate from `estimate_statement_cost`
+        :return: The metrics of the estimate, by name
+        """
+        return {
+            key: value
+            for key, value in raw_cost.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        }
+
     @classmethod
     def estimate_query_cost(
-        cls, database: "Database", schema: str, sql: str, source: Optional[str] = None
+        cls,
+        database: "Database",
+        schema: str,
+        sql: str,
+        source: Optional[str] = None,
+        user_name: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
         Estimate the cost of a multiple statement SQL query.
 
+        The estimates are cached for ``SQLLAB_QUERY_COST_ESTIMATE_CACHE_TIMEOUT``
+        seconds, by database, schema and processed statements.
+
         :param database: Database instance
         :param schema: Database schema
         :param sql: SQL query with possibly multiple statements
         :param source: Source of the query (eg, "sql_lab")
+        :param user_name: Effective username, the current user by default
         """
         extra = database.get_extra() or {}
         if not cls.get_allow_cost_estimate(extra):
             raise Exception("Database does not support cost estimation")
 
-        user_name = g.user.username if g.user and hasattr(g.user, "username") else None
+        if user_name is None:
+            user_name = utils.get_username()
         parsed_query = sql_parse.ParsedQuery(sql)
-        statements = parsed_query.get_statements()
+        statements = [
+            cls.process_statement(statement, database, user_name)
+            for statement in parsed_query.get_statements()
+        ]
 
-        engine = cls.get_engine(database, schema=schema, source=source)
-        costs = []
+        cache_timeout = current_app.config["SQLLAB_QUERY_COST_ESTIMATE_CACHE_TIMEOUT"]
+        cache_key = "cost_estimate_" + md5_sha_from_dict(
+            {
+                "database_id": database.id,
+                "schema": schema,
+                "statements": statements,
+                # the estimates depend on the permissions of the effective user
+                "user_name": user_name if database.impersonate_user else None,
+            }
+        )
+        if cache_timeout:
+            costs = cache_manager.cache.get(cache_key)
+            if costs is not None:
+                return costs
+
+        engine = database.get_sqla_engine(
+            schema=schema, nullpool=True, user_name=user_name, source=source
+        )
         with closing(engine.raw_connection()) as conn:
-            cursor = conn.cursor()
-            for statement in statements:
-                processed_statement = cls.process_statement(
-                    statement, database, user_name
-                )
-                costs.append(cls.estimate_statement_cost(processed_statement, cursor))
+            costs = cls.estimate_statements_cost(statements, conn.cursor())
+
+        if cache_timeout:
+            cache_manager.cache.set(cache_key, costs, timeout=cache_timeout)
         return costs
 
     @classmethod
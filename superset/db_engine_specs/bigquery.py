@@ -17,7 +17,7 @@
 import re
 import urllib
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Pattern, Tuple, TYPE_CHECKING
+from typing import Any, Dict, Iterator, List, Optional, Pattern, Tuple, TYPE_CHECKING
 
 import pandas as pd
 from apispec import APISpec
@@ -107,6 +107,7 @@ class BigQueryEngineSpec(BaseEngineSpec):
     https://github.com/mxmzdlv/pybigquery/blob/d214bb089ca0807ca9aaa6ce4d5a01172d40264e/pybigquery/sqlalchemy_bigquery.py#L102
     """
     arraysize = 5000
+    fetch_batch_size = arraysize
 
     _date_trunc_functions = {
         "DATE": "DATE_TRUNC",
@@ -204,6 +205,15 @@ class BigQueryEngineSpec(BaseEngineSpec):
             data = [r.values() for r in data]  # type: ignore
         return data
 
+    @classmethod
+    def fetch_data_batches(
+        cls, cursor: Any, limit: Optional[int] = None
+    ) -> Iterator[List[Tuple[Any, ...]]]:
+        for data in super().fetch_data_batches(cursor, limit):
+            if type(data[0]).__name__ == "Row":
+                data = [r.values() for r in data]  # type: ignore
+            yield data
+
     @staticmethod
     def _mutate_label(label: str) -> str:
         """
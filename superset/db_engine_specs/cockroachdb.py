@@ -21,3 +21,4 @@ class CockroachDbEngineSpec(PostgresEngineSpec):
     engine = "cockroachdb"
     engine_name = "CockroachDB"
     default_driver = ""
+    table_sample_clause = None
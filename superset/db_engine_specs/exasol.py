@@ -14,7 +14,7 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
-from typing import Any, List, Optional, Tuple
+from typing import Any, Iterator, List, Optional, Tuple
 
 from superset.db_engine_specs.base import BaseEngineSpec
 
@@ -46,3 +46,10 @@ class ExasolEngineSpec(BaseEngineSpec):  # pylint: disable=abstract-method
         data = super().fetch_data(cursor, limit)
         # Lists of `pyodbc.Row` need to be unpacked further
         return cls.pyodbc_rows_to_tuples(data)
+
+    @classmethod
+    def fetch_data_batches(
+        cls, cursor: Any, limit: Optional[int] = None
+    ) -> Iterator[List[Tuple[Any, ...]]]:
+        for data in super().fetch_data_batches(cursor, limit):
+            yield cls.pyodbc_rows_to_tuples(data)
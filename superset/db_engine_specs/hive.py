@@ -20,7 +20,7 @@ import re
 import tempfile
 import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+from typing import Any, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
 from urllib import parse
 
 import numpy as np
@@ -38,7 +38,7 @@ from sqlalchemy.sql.expression import ColumnClause, Select
 from superset.db_engine_specs.base import BaseEngineSpec
 from superset.db_engine_specs.presto import PrestoEngineSpec
 from superset.exceptions import SupersetException
-from superset.extensions import cache_manager
+from superset.extensions import cache_manager, query_progress_manager
 from superset.models.sql_lab import Query
 from superset.sql_parse import ParsedQuery, Table
 from superset.utils import core as utils
@@ -91,6 +91,8 @@ class HiveEngineSpec(PrestoEngineSpec):
     max_column_name_length = 767
     allows_alias_to_source_column = True
     allows_hidden_ordeby_agg = False
+    table_sample_clause = "TABLESAMPLE({percent} PERCENT)"
+    table_sample_before_alias = True
 
     # When running `SHOW FUNCTIONS`, what is the name of the column with the
     # function names?
@@ -163,6 +165,21 @@ class HiveEngineSpec(PrestoEngineSpec):
         except pyhive.exc.ProgrammingError:
             return []
 
+    @classmethod
+    def fetch_data_batches(
+        cls, cursor: Any, limit: Optional[int] = None
+    ) -> Iterator[List[Tuple[Any, ...]]]:
+        import pyhive
+        from TCLIService import ttypes
+
+        state = cursor.poll()
+        if state.operationState == ttypes.TOperationState.ERROR_STATE:
+            raise Exception("Query error", state.errorMessage)
+        try:
+            yield from super().fetch_data_batches(cursor, limit)
+        except pyhive.exc.ProgrammingError:
+            return
+
     @classmethod
     def df_to_sql(
         cls,
@@ -325,9 +342,9 @@ class HiveEngineSpec(PrestoEngineSpec):
         tracking_url = None
         job_id = None
         query_id = query.id
+        reporter = query_progress_manager.reporter(query, session)
         while polled.operationState in unfinished_states:
-            query = session.query(type(query)).filter_by(id=query_id).one()
-            if query.status == QueryStatus.STOPPED:
+            if reporter.is_stopped():
                 cursor.cancel()
                 break
 
@@ -343,10 +360,7 @@ class HiveEngineSpec(PrestoEngineSpec):
                 logger.info(
                     "Query %s: Progress total: %s", str(query_id), str(progress)
                 )
-                needs_commit = False
-                if progress > query.progress:
-                    query.progress = progress
-                    needs_commit = True
+                reporter.update(progress=progress)
                 if not tracking_url:
                     tracking_url = cls.get_tracking_url(log_lines)
                     if tracking_url:
@@ -362,9 +376,8 @@ class HiveEngineSpec(PrestoEngineSpec):
                             str(query_id),
                             tracking_url,
                         )
-                        query.tracking_url = tracking_url
+                        reporter.update(tracking_url=tracking_url)
                         logger.info("Query %s: Job id: %s", str(query_id), str(job_id))
-                        needs_commit = True
                 if job_id and len(log_lines) > last_log_line:
                     # Wait for job id before logging things out
                     # this allows for prefixing all log lines and becoming
@@ -372,10 +385,9 @@ class HiveEngineSpec(PrestoEngineSpec):
                     for l in log_lines[last_log_line:]:
                         logger.info("Query %s: [%s] %s", str(query_id), str(job_id), l)
                     last_log_line = len(log_lines)
-                if needs_commit:
-                    session.commit()
             time.sleep(current_app.config["HIVE_POLL_INTERVAL"])
             polled = cursor.poll()
+        reporter.flush()
 
     @classmethod
     def get_columns(
@@ -15,7 +15,7 @@
 # specific language governing permissions and limitations
 # under the License.
 from datetime import datetime
-from typing import Any, List, Optional, Tuple
+from typing import Any, Iterator, List, Optional, Tuple
 
 from superset.db_engine_specs.base import BaseEngineSpec, LimitMethod
 from superset.utils import core as utils
@@ -73,3 +73,11 @@ class OracleEngineSpec(BaseEngineSpec):
         if not cursor.description:
             return []
         return super().fetch_data(cursor, limit)
+
+    @classmethod
+    def fetch_data_batches(
+        cls, cursor: Any, limit: Optional[int] = None
+    ) -> Iterator[List[Tuple[Any, ...]]]:
+        if not cursor.description:
+            return iter([])
+        return super().fetch_data_batches(cursor, limit)
@@ -22,6 +22,7 @@ from typing import (
     Any,
     Callable,
     Dict,
+    Iterator,
     List,
     Match,
     Optional,
@@ -173,6 +174,15 @@ class PostgresBaseEngineSpec(BaseEngineSpec):
             return []
         return super().fetch_data(cursor, limit)
 
+    @classmethod
+    def fetch_data_batches(
+        cls, cursor: Any, limit: Optional[int] = None
+    ) -> Iterator[List[Tuple[Any, ...]]]:
+        cursor.tzinfo_factory = FixedOffsetTimezone
+        if not cursor.description:
+            return iter([])
+        return super().fetch_data_batches(cursor, limit)
+
     @classmethod
     def epoch_to_dttm(cls) -> str:
         return "(timestamp 'epoch' + {col} * interval '1 second')"
@@ -181,6 +191,7 @@ class PostgresBaseEngineSpec(BaseEngineSpec):
 class PostgresEngineSpec(PostgresBaseEngineSpec, BasicParametersMixin):
     engine = "postgresql"
     engine_aliases = {"postgres"}
+    table_sample_clause = "TABLESAMPLE SYSTEM ({percent})"
 
     default_driver = "psycopg2"
     sqlalchemy_uri_placeholder = (
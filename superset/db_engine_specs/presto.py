@@ -54,6 +54,7 @@ from superset import cache_manager, is_feature_enabled
 from superset.db_engine_specs.base import BaseEngineSpec
 from superset.errors import SupersetErrorType
 from superset.exceptions import SupersetTemplateException
+from superset.extensions import query_progress_manager
 from superset.models.sql_lab import Query
 from superset.models.sql_types.presto_sql_types import (
     Array,
@@ -148,6 +149,7 @@ class PrestoEngineSpec(BaseEngineSpec):  # pylint: disable=too-many-public-metho
     engine = "presto"
     engine_name = "Presto"
     allows_alias_to_source_column = False
+    table_sample_clause = "TABLESAMPLE SYSTEM ({percent})"
 
     _time_grain_expressions = {
         None: "{col}",
@@ -686,6 +688,10 @@ class PrestoEngineSpec(BaseEngineSpec):  # pylint: disable=too-many-public-metho
         result = json.loads(cursor.fetchone()[0])
         return result
 
+    @classmethod
+    def get_query_cost_metrics(cls, raw_cost: Dict[str, Any]) -> Dict[str, float]:
+        return raw_cost.get("estimate", {})
+
     @classmethod
     def query_cost_formatter(
         cls, raw_cost: List[Dict[str, Any]]
@@ -950,6 +956,7 @@ class PrestoEngineSpec(BaseEngineSpec):  # pylint: disable=too-many-public-metho
         poll_interval = query.database.connect_args.get(
             "poll_interval", current_app.config["PRESTO_POLL_INTERVAL"]
         )
+        reporter = query_progress_manager.reporter(query, session)
         logger.info("Query %i: Polling the cursor for progress", query_id)
         polled = cursor.poll()
         # poll returns dict -- JSON status information or ``None``
@@ -960,8 +967,7 @@ class PrestoEngineSpec(BaseEngineSpec):  # pylint: disable=too-many-public-metho
             # Update the object and wait for the kill signal.
             stats = polled.get("stats", {})
 
-            query = session.query(type(query)).filter_by(id=query_id).one()
-            if query.status in [QueryStatus.STOPPED, QueryStatus.TIMED_OUT]:
+            if reporter.is_stopped([QueryStatus.STOPPED, QueryStatus.TIMED_OUT]):
                 cursor.cancel()
                 break
 
@@ -980,12 +986,11 @@ class PrestoEngineSpec(BaseEngineSpec):  # pylint: disable=too-many-public-metho
                         "Query {} progress: {} / {} "  # pylint: disable=logging-format-interpolation
                         "splits".format(query_id, completed_splits, total_splits)
                     )
-                    if progress > query.progress:
-                        query.progress = progress
-                    session.commit()
+                    reporter.update(progress=progress)
             time.sleep(poll_interval)
             logger.info("Query %i: Polling the cursor for progress", query_id)
             polled = cursor.poll()
+        reporter.flush()
 
     @classmethod
     def _extract_error_message(cls, ex: Exception) -> str:
@@ -47,6 +47,7 @@ class SnowflakeEngineSpec(PostgresBaseEngineSpec):
     engine_name = "Snowflake"
     force_column_alias_quotes = True
     max_column_name_length = 256
+    table_sample_clause = "SAMPLE SYSTEM ({percent})"
 
     _time_grain_expressions = {
         None: "{col}",
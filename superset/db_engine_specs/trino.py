@@ -28,6 +28,7 @@ from superset.utils import core as utils
 class TrinoEngineSpec(BaseEngineSpec):
     engine = "trino"
     engine_name = "Trino"
+    table_sample_clause = "TABLESAMPLE SYSTEM ({percent})"
 
     # pylint: disable=line-too-long
     _time_grain_expressions = {
@@ -141,6 +142,10 @@ class TrinoEngineSpec(BaseEngineSpec):
         result = json.loads(cursor.fetchone()[0])
         return result
 
+    @classmethod
+    def get_query_cost_metrics(cls, raw_cost: Dict[str, Any]) -> Dict[str, float]:
+        return raw_cost.get("estimate", {})
+
     @classmethod
     def query_cost_formatter(
         cls, raw_cost: List[Dict[str, Any]]
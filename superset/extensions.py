@@ -30,8 +30,11 @@ from werkzeug.local import LocalProxy
 from superset.utils.async_query_manager import AsyncQueryManager
 from superset.utils.cache_manager import CacheManager
 from superset.utils.encrypt import EncryptedFieldFactory
+from superset.utils.engine_registry import EngineRegistry
 from superset.utils.feature_flag_manager import FeatureFlagManager
 from superset.utils.machine_auth import MachineAuthProviderFactory
+from superset.utils.query_executor import QueryExecutor
+from superset.utils.query_progress import QueryProgressManager
 
 
 class ResultsBackendManager:
@@ -106,11 +109,14 @@ csrf = CSRFProtect()
 db = SQLA()
 _event_logger: Dict[str, Any] = {}
 encrypted_field_factory = EncryptedFieldFactory()
+engine_registry = EngineRegistry()
 event_logger = LocalProxy(lambda: _event_logger.get("event_logger"))
 feature_flag_manager = FeatureFlagManager()
 machine_auth_provider_factory = MachineAuthProviderFactory()
 manifest_processor = UIManifestProcessor(APP_DIR)
 migrate = Migrate()
+query_executor = QueryExecutor()
+query_progress_manager = QueryProgressManager()
 results_backend_manager = ResultsBackendManager()
 security_manager = LocalProxy(lambda: appbuilder.sm)
 talisman = Talisman()
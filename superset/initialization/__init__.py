@@ -20,6 +20,7 @@ import logging
 import os
 from typing import Any, Callable, Dict, TYPE_CHECKING
 
+import sqlalchemy as sqla
 import wtforms_json
 from deprecation import deprecated
 from flask import Flask, redirect
@@ -38,10 +39,13 @@ from superset.extensions import (
     csrf,
     db,
     encrypted_field_factory,
+    engine_registry,
     feature_flag_manager,
     machine_auth_provider_factory,
     manifest_processor,
     migrate,
+    query_executor,
+    query_progress_manager,
     results_backend_manager,
     talisman,
 )
@@ -595,6 +599,9 @@ class SupersetAppInitializer:
     def configure_cache(self) -> None:
         cache_manager.init_app(self.superset_app)
         results_backend_manager.init_app(self.superset_app)
+        engine_registry.init_app(self.superset_app)
+        query_executor.init_app(self.superset_app)
+        query_progress_manager.init_app(self.superset_app)
 
     def configure_feature_flags(self) -> None:
         feature_flag_manager.init_app(self.superset_app)
@@ -616,6 +623,14 @@ class SupersetAppInitializer:
         appbuilder.security_manager_class = custom_sm
         appbuilder.init_app(self.superset_app, db.session)
 
+        # Compiled permissions are invalidated whenever roles or permissions change
+        for model, identifier in (
+            (appbuilder.sm.role_model, "after_update"),
+            (appbuilder.sm.role_model, "after_delete"),
+            (appbuilder.sm.permissionview_model, "after_delete"),
+        ):
+            sqla.event.listen(model, identifier, appbuilder.sm.permissions_changed)
+
     def configure_url_map_converters(self) -> None:
         #
         # Doing local imports here as model importing causes a reference to
@@ -0,0 +1,44 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""add cache_grace_period to datasources and databases
+
+Revision ID: 8b3a1d6c2f4e
+Revises: 3317e9248280
+Create Date: 2021-07-21 15:12:43.702536
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "8b3a1d6c2f4e"
+down_revision = "3317e9248280"
+
+import sqlalchemy as sa
+from alembic import op
+
+
+def upgrade():
+    for table in ("tables", "datasources", "dbs"):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(
+                sa.Column("cache_grace_period", sa.Integer(), nullable=True)
+            )
+
+
+def downgrade():
+    for table in ("tables", "datasources", "dbs"):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column("cache_grace_period")
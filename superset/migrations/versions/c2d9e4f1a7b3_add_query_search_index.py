@@ -0,0 +1,70 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""add query search index
+
+Revision ID: c2d9e4f1a7b3
+Revises: 8b3a1d6c2f4e
+Create Date: 2021-07-28 10:41:05.318842
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "c2d9e4f1a7b3"
+down_revision = "8b3a1d6c2f4e"
+
+import logging
+
+import sqlalchemy as sa
+from alembic import op
+
+logger = logging.getLogger(__name__)
+
+
+def upgrade():
+    op.create_table(
+        "query_search_term",
+        sa.Column("term", sa.String(length=256), nullable=False),
+        sa.Column("query_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["query_id"], ["query.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("term", "query_id"),
+    )
+    op.create_index("ix_query_search_term_query_id", "query_search_term", ["query_id"])
+    op.create_index("ti_user_id_start_time", "query", ["user_id", "start_time"])
+
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        # the trigram index speeds up searching the SQL of the queries with LIKE,
+        # it requires the pg_trgm extension, which may not be available
+        try:
+            with op.get_context().autocommit_block():
+                op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+                op.execute(
+                    "CREATE INDEX IF NOT EXISTS ix_query_sql_trgm "
+                    "ON query USING gin (sql gin_trgm_ops)"
+                )
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.warning("Could not create the trigram index on query.sql: %s", ex)
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_query_sql_trgm")
+
+    op.drop_index("ti_user_id_start_time", table_name="query")
+    op.drop_index("ix_query_search_term_query_id", table_name="query_search_term")
+    op.drop_table("query_search_term")
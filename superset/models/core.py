@@ -23,12 +23,12 @@ import textwrap
 from contextlib import closing
 from copy import deepcopy
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type
+from types import FunctionType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Type
 
 import numpy
 import pandas as pd
 import sqlalchemy as sqla
-import sqlparse
 from flask import g, request
 from flask_appbuilder import Model
 from sqlalchemy import (
@@ -55,11 +55,18 @@ from sqlalchemy.sql import expression, Select
 
 from superset import app, db_engine_specs, is_feature_enabled
 from superset.db_engine_specs.base import TimeGrain
-from superset.extensions import cache_manager, encrypted_field_factory, security_manager
+from superset.extensions import (
+    cache_manager,
+    encrypted_field_factory,
+    engine_registry,
+    security_manager,
+)
 from superset.models.helpers import AuditMixinNullable, ImportExportMixin
 from superset.models.tags import FavStarUpdater
 from superset.result_set import SupersetResultSet
+from superset.sql_parse import ParsedQuery
 from superset.utils import cache as cache_util, core as utils
+from superset.utils.hashing import md5_sha_from_str
 from superset.utils.memoized import memoized
 
 config = app.config
@@ -71,6 +78,14 @@ logger = logging.getLogger(__name__)
 
 PASSWORD_MASK = "X" * 10
 DB_CONNECTION_MUTATOR = config["DB_CONNECTION_MUTATOR"]
+# keys of the ``connection_pool`` object in ``extra`` passed to ``create_engine``
+CONNECTION_POOL_PARAMS = {
+    "pool_size",
+    "max_overflow",
+    "pool_recycle",
+    "pool_pre_ping",
+    "pool_timeout",
+}
 
 
 class Url(Model, AuditMixinNullable):
@@ -105,6 +120,41 @@ class ConfigurationMethod(str, enum.Enum):
     DYNAMIC_FORM = "dynamic_form"
 
 
+def _stringify_nested_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Serialize the lists and dicts of nested columns as JSON strings.
+    """
+
+    def needs_conversion(df_series: pd.Series) -> bool:
+        return (
+            not df_series.empty
+            and isinstance(df_series, pd.Series)
+            and isinstance(df_series[0], (list, dict))
+        )
+
+    for col, coltype in df.dtypes.to_dict().items():
+        if coltype == numpy.object_ and needs_conversion(df[col]):
+            df[col] = df[col].apply(utils.json_dumps_w_dates)
+    return df
+
+
+def _engine_fingerprint_default(obj: Any) -> Any:
+    """
+    Serialize the engine parameters that aren't JSON serializable in the engine
+    fingerprint. Classes and functions defined at the module level are serialized
+    by name. Other objects (eg, an SSL context in ``connect_args`` or a token added
+    by ``DB_CONNECTION_MUTATOR``) can't be told apart by their type, so they raise
+    a ``TypeError`` and the engine is not registered.
+    """
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=str)
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", "backslashreplace")
+    if isinstance(obj, (type, FunctionType)) and "<" not in obj.__qualname__:
+        return f"{obj.__module__}.{obj.__qualname__}"
+    raise TypeError(f"Object of type {type(obj).__name__} has no stable fingerprint")
+
+
 class Database(
     Model, AuditMixinNullable, ImportExportMixin
 ):  # pylint: disable=too-many-public-methods
@@ -122,6 +172,7 @@ class Database(
     sqlalchemy_uri = Column(String(1024), nullable=False)
     password = Column(encrypted_field_factory.create(String(1024)))
     cache_timeout = Column(Integer)
+    cache_grace_period = Column(Integer)
     select_as_create_table_as = Column(Boolean, default=False)
     expose_in_sqllab = Column(Boolean, default=True)
     configuration_method = Column(
@@ -200,6 +251,10 @@ class Database(
             self.db_engine_spec.get_allow_cost_estimate(extra) and cost_estimate_enabled
         )
 
+    @property
+    def allows_sampling(self) -> bool:
+        return bool(self.db_engine_spec.table_sample_clause)
+
     @property
     def allows_virtual_table_explore(self) -> bool:
         extra = self.get_extra()
@@ -277,6 +332,14 @@ class Database(
     def connect_args(self) -> Dict[str, Any]:
         return self.get_extra().get("engine_params", {}).get("connect_args", {})
 
+    @property
+    def connection_pool_params(self) -> Dict[str, Any]:
+        return {
+            key: value
+            for key, value in self.get_extra().get("connection_pool", {}).items()
+            if key in CONNECTION_POOL_PARAMS
+        }
+
     @classmethod
     def get_password_masked_url_from_uri(  # pylint: disable=invalid-name
         cls, uri: str
@@ -321,11 +384,10 @@ class Database(
                 effective_username = g.user.username
         return effective_username
 
-    @memoized(watch=("impersonate_user", "sqlalchemy_uri_decrypted", "extra"))
     def get_sqla_engine(
         self,
         schema: Optional[str] = None,
-        nullpool: bool = True,
+        nullpool: Optional[bool] = None,
         user_name: Optional[str] = None,
         source: Optional[utils.QuerySource] = None,
     ) -> Engine:
@@ -344,8 +406,15 @@ class Database(
         logger.debug("Database.get_sqla_engine(). Masked URL: %s", str(masked_url))
 
         params = extra.get("engine_params", {})
+        # unless ``nullpool`` is set explicitly, the engine is pooled when the
+        # database has a ``connection_pool`` in its extra
+        connection_pool_params = self.connection_pool_params
+        if nullpool is None:
+            nullpool = not connection_pool_params
         if nullpool:
             params["poolclass"] = NullPool
+        else:
+            params.update(connection_pool_params)
 
         connect_args = params.get("connect_args", {})
         if self.impersonate_user:
@@ -371,7 +440,28 @@ class Database(
                 sqlalchemy_url, params, effective_username, security_manager, source
             )
 
-        return create_engine(sqlalchemy_url, **params)
+        if self.id is None:
+            # transient databases (eg, when testing a connection) are not registered
+            return create_engine(sqlalchemy_url, **params)
+
+        # the fingerprint makes sure that a new engine is created when the
+        # connection settings of the database change
+        try:
+            fingerprint = md5_sha_from_str(
+                json.dumps(
+                    [str(sqlalchemy_url), params],
+                    default=_engine_fingerprint_default,
+                    sort_keys=True,
+                )
+            )
+        except (TypeError, ValueError) as ex:
+            logger.debug("Not registering the engine of database %s: %s", self.id, ex)
+            return create_engine(sqlalchemy_url, **params)
+        return engine_registry.get_engine(
+            (self.id, effective_username, schema, source, nullpool),
+            lambda: create_engine(sqlalchemy_url, **params),
+            fingerprint,
+        )
 
     def get_reserved_words(self) -> Set[str]:
         return self.get_dialect().preparer.reserved_words
@@ -379,51 +469,87 @@ class Database(
     def get_quoter(self) -> Callable[[str, Any], str]:
         return self.get_dialect().identifier_preparer.quote
 
-    def get_df(  # pylint: disable=too-many-locals
+    def get_df(
         self,
         sql: str,
         schema: Optional[str] = None,
         mutator: Optional[Callable[[pd.DataFrame], None]] = None,
     ) -> pd.DataFrame:
-        sqls = [str(s).strip(" ;") for s in sqlparse.parse(sql)]
+        engine = self.get_sqla_engine(schema=schema)
+        with closing(engine.raw_connection()) as conn:
+            cursor = conn.cursor()
+            self._execute_statements(engine, cursor, sql, schema)
+
+            if config["RESULTS_STREAMING_FETCH"]:
+                result_set = SupersetResultSet.from_batches(
+                    self.db_engine_spec.fetch_data_batches(cursor),
+                    cursor.description,
+                    self.db_engine_spec,
+                )
+            else:
+                data = self.db_engine_spec.fetch_data(cursor)
+                result_set = SupersetResultSet(
+                    data, cursor.description, self.db_engine_spec
+                )
+            df = result_set.to_pandas_df()
+            if mutator:
+                df = mutator(df)
 
+            return _stringify_nested_columns(df)
+
+    def iter_df_batches(
+        self, sql: str, schema: Optional[str] = None, limit: Optional[int] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Run a query and yield its results as DataFrames of at most
+        ``fetch_batch_size`` rows, fetching the rows from the cursor one batch at
+        a time, so that the whole result never has to be held in memory.
+
+        :param sql: the SQL statements to run, the results of the last one are
+            yielded
+        :param schema: the schema to run the statements in
+        :param limit: the maximum number of rows to fetch
+        """
         engine = self.get_sqla_engine(schema=schema)
+        with closing(engine.raw_connection()) as conn:
+            cursor = conn.cursor()
+            self._execute_statements(engine, cursor, sql, schema)
+
+            is_empty = True
+            for batch in self.db_engine_spec.fetch_data_batches(cursor, limit):
+                is_empty = False
+                result_set = SupersetResultSet(
+                    batch, cursor.description, self.db_engine_spec
+                )
+                yield _stringify_nested_columns(result_set.to_pandas_df())
+
+            if is_empty:
+                # an empty result is yielded as an empty DataFrame, with its columns
+                result_set = SupersetResultSet(
+                    [], cursor.description, self.db_engine_spec
+                )
+                yield result_set.to_pandas_df()
+
+    def _execute_statements(
+        self, engine: Engine, cursor: Any, sql: str, schema: Optional[str]
+    ) -> None:
+        """
+        Execute SQL statements, leaving the results of the last one in the cursor.
+        """
+        sqls = ParsedQuery(sql).get_statements()
         username = utils.get_username()
 
-        def needs_conversion(df_series: pd.Series) -> bool:
-            return (
-                not df_series.empty
-                and isinstance(df_series, pd.Series)
-                and isinstance(df_series[0], (list, dict))
-            )
-
         def _log_query(sql: str) -> None:
             if log_query:
                 log_query(engine.url, sql, schema, username, __name__, security_manager)
 
-        with closing(engine.raw_connection()) as conn:
-            cursor = conn.cursor()
-            for sql_ in sqls[:-1]:
-                _log_query(sql_)
-                self.db_engine_spec.execute(cursor, sql_)
-                cursor.fetchall()
-
-            _log_query(sqls[-1])
-            self.db_engine_spec.execute(cursor, sqls[-1])
-
-            data = self.db_engine_spec.fetch_data(cursor)
-            result_set = SupersetResultSet(
-                data, cursor.description, self.db_engine_spec
-            )
-            df = result_set.to_pandas_df()
-            if mutator:
-                df = mutator(df)
-
-            for col, coltype in df.dtypes.to_dict().items():
-                if coltype == numpy.object_ and needs_conversion(df[col]):
-                    df[col] = df[col].apply(utils.json_dumps_w_dates)
+        for sql_ in sqls[:-1]:
+            _log_query(sql_)
+            self.db_engine_spec.execute(cursor, sql_)
+            cursor.fetchall()
 
-            return df
+        _log_query(sqls[-1])
+        self.db_engine_spec.execute(cursor, sqls[-1])
 
     def compile_sqla_query(self, qry: Select, schema: Optional[str] = None) -> str:
         engine = self.get_sqla_engine(schema=schema)
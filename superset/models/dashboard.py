@@ -268,12 +268,25 @@ class Dashboard(  # pylint: disable=too-many-instance-attributes
         for slc in self.slices:
             slices_by_datasource[(slc.cls_model, slc.datasource_id)].add(slc)
 
+        # Load the datasources of each type with a single query
+        datasource_ids_by_model: Dict[Type["BaseDatasource"], Set[int]] = defaultdict(
+            set
+        )
+        for cls_model, datasource_id in slices_by_datasource:
+            datasource_ids_by_model[cls_model].add(datasource_id)
+
+        datasources = {
+            (cls_model, datasource.id): datasource
+            for cls_model, datasource_ids in datasource_ids_by_model.items()
+            for datasource in db.session.query(cls_model).filter(
+                cls_model.id.in_(datasource_ids)
+            )
+        }
+
         result: List[Dict[str, Any]] = []
 
-        for (cls_model, datasource_id), slices in slices_by_datasource.items():
-            datasource = (
-                db.session.query(cls_model).filter_by(id=datasource_id).one_or_none()
-            )
+        for key, slices in slices_by_datasource.items():
+            datasource = datasources.get(key)
 
             if datasource:
                 # Filter out unneeded fields from the datasource payload
@@ -16,13 +16,15 @@
 # under the License.
 """A collection of ORM sqlalchemy models for SQL Lab"""
 import enum
+import logging
 import re
+from collections import defaultdict
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Set
 
 import simplejson as json
 import sqlalchemy as sqla
-from flask import Markup
+from flask import current_app, Markup
 from flask_appbuilder import Model
 from flask_appbuilder.models.decorators import renders
 from humanize import naturaltime
@@ -37,10 +39,13 @@ from sqlalchemy import (
     String,
     Text,
 )
+from sqlalchemy.engine import Connection
 from sqlalchemy.engine.url import URL
-from sqlalchemy.orm import backref, relationship
+from sqlalchemy.orm import backref, object_session, relationship, Session
+from sqlalchemy.orm.mapper import Mapper
 
-from superset import security_manager
+from superset import is_feature_enabled, security_manager
+from superset.extensions import async_query_manager
 from superset.models.helpers import (
     AuditMixinNullable,
     ExtraJSONMixin,
@@ -50,6 +55,19 @@ from superset.models.tags import QueryUpdater
 from superset.sql_parse import CtasMethod, ParsedQuery, Table
 from superset.utils.core import QueryStatus, user_label
 
+logger = logging.getLogger(__name__)
+
+# the key of the session info where the changes of the queries are kept
+QUERY_UPDATES_KEY = "query_updates"
+
+# the query history search index, see QuerySearchTerm
+SEARCH_WORD_PATTERN = re.compile(r"\w+")
+SEARCH_TABLE_PREFIX = "table:"
+SEARCH_TERM_MAX_LENGTH = 256
+SEARCH_MAX_WORDS = 1000
+# the term of the queries that aren't fully indexed, which any search matches
+SEARCH_PARTIAL_TERM = "*"
+
 
 class LimitingFactor(str, enum.Enum):
     QUERY = "QUERY"
@@ -59,6 +77,37 @@ class LimitingFactor(str, enum.Enum):
     UNKNOWN = "UNKNOWN"
 
 
+# the column each field of ``Query.to_update_dict`` depends on
+QUERY_FIELD_COLUMNS = {
+    "changedOn": "changed_on",
+    "changed_on": "changed_on",
+    "dbId": "database_id",
+    "endDttm": "end_time",
+    "errorMessage": "error_message",
+    "executedSql": "executed_sql",
+    "id": "client_id",
+    "queryId": "id",
+    "limit": "limit",
+    "limitingFactor": "limiting_factor",
+    "progress": "progress",
+    "rows": "rows",
+    "schema": "schema",
+    "ctas": "select_as_cta",
+    "serverId": "id",
+    "sql": "sql",
+    "sqlEditorId": "sql_editor_id",
+    "startDttm": "start_time",
+    "state": "status",
+    "tab": "tab_name",
+    "tempSchema": "tmp_schema_name",
+    "tempTable": "tmp_table_name",
+    "userId": "user_id",
+    "resultsKey": "results_key",
+    "trackingUrl": "tracking_url",
+    "extra": "extra_json",
+}
+
+
 class Query(Model, ExtraJSONMixin):
     """ORM model for SQL query
 
@@ -119,14 +168,29 @@ class Query(Model, ExtraJSONMixin):
     )
     user = relationship(security_manager.user_model, foreign_keys=[user_id])
 
-    __table_args__ = (sqla.Index("ti_user_id_changed_on", user_id, changed_on),)
+    __table_args__ = (
+        sqla.Index("ti_user_id_changed_on", user_id, changed_on),
+        sqla.Index("ti_user_id_start_time", user_id, start_time),
+    )
 
     def to_dict(self) -> Dict[str, Any]:
         return {
+            **self.to_update_dict(),
+            "db": self.database.database_name,
+            "user": user_label(self.user),
+        }
+
+    def to_update_dict(self, columns: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """
+        The fields of ``to_dict`` that don't require loading relationships.
+
+        :param columns: the changed columns, to only return the fields depending on
+            them along with the ones identifying the query
+        """
+        fields = {
             "changedOn": self.changed_on,
             "changed_on": self.changed_on.isoformat(),
             "dbId": self.database_id,
-            "db": self.database.database_name,
             "endDttm": self.end_time,
             "errorMessage": self.error_message,
             "executedSql": self.executed_sql,
@@ -147,11 +211,17 @@ class Query(Model, ExtraJSONMixin):
             "tempSchema": self.tmp_schema_name,
             "tempTable": self.tmp_table_name,
             "userId": self.user_id,
-            "user": user_label(self.user),
             "resultsKey": self.results_key,
             "trackingUrl": self.tracking_url,
             "extra": self.extra,
         }
+        if columns is None:
+            return fields
+        return {
+            key: value
+            for key, value in fields.items()
+            if QUERY_FIELD_COLUMNS[key] in columns | {"id", "client_id", "changed_on"}
+        }
 
     @property
     def name(self) -> str:
@@ -184,6 +254,85 @@ class Query(Model, ExtraJSONMixin):
         security_manager.raise_for_access(query=self)
 
 
+class QuerySearchTerm(Model):  # pylint: disable=too-few-public-methods
+    """
+    A term of the SQL Lab query history search index: a word of the SQL of the
+    query, or a table it references prefixed with ``table:``.
+    """
+
+    __tablename__ = "query_search_term"
+    term = Column(String(SEARCH_TERM_MAX_LENGTH), primary_key=True)
+    query_id = Column(
+        Integer, ForeignKey("query.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    __table_args__ = (sqla.Index("ix_query_search_term_query_id", query_id),)
+
+
+def get_search_terms(sql: str) -> List[str]:
+    """
+    Get the terms indexing a query: the distinct words of its SQL, in order, and
+    the tables it references, by name and by fully qualified name. Long words are
+    indexed by their start, and queries with too many words or long table names
+    also get the ``SEARCH_PARTIAL_TERM`` term.
+    """
+    words = [
+        word[:SEARCH_TERM_MAX_LENGTH]
+        for word in SEARCH_WORD_PATTERN.findall(sql.lower())
+    ]
+    terms = list(dict.fromkeys(words))
+    if len(terms) > SEARCH_MAX_WORDS:
+        terms = terms[:SEARCH_MAX_WORDS] + [SEARCH_PARTIAL_TERM]
+    try:
+        tables = ParsedQuery(sql).tables
+    except Exception:  # pylint: disable=broad-except
+        tables = set()
+    for table in tables:
+        names = {
+            table.table,
+            ".".join(
+                part for part in (table.catalog, table.schema, table.table) if part
+            ),
+        }
+        for name in sorted(names):
+            term = f"{SEARCH_TABLE_PREFIX}{name.lower()}"
+            terms.append(
+                term if len(term) <= SEARCH_TERM_MAX_LENGTH else SEARCH_PARTIAL_TERM
+            )
+    return list(dict.fromkeys(terms))
+
+
+class QuerySearchIndexUpdater:
+    """
+    Keeps the query history search index up to date, when
+    SQLLAB_QUERY_SEARCH_INDEX is enabled.
+    """
+
+    @classmethod
+    def after_insert(
+        cls, _mapper: Mapper, connection: Connection, target: Query
+    ) -> None:
+        if not current_app.config["SQLLAB_QUERY_SEARCH_INDEX"] or not target.sql:
+            return
+        terms = get_search_terms(target.sql)
+        if terms:
+            connection.execute(
+                QuerySearchTerm.__table__.insert(),
+                [{"term": term, "query_id": target.id} for term in terms],
+            )
+
+    @classmethod
+    def before_delete(
+        cls, _mapper: Mapper, connection: Connection, target: Query
+    ) -> None:
+        # the terms are kept when the index is disabled, and need to be removed
+        connection.execute(
+            QuerySearchTerm.__table__.delete().where(
+                QuerySearchTerm.query_id == target.id
+            )
+        )
+
+
 class SavedQuery(Model, AuditMixinNullable, ExtraJSONMixin, ImportExportMixin):
     """ORM model for SQL query"""
 
@@ -345,6 +494,62 @@ class TableSchema(Model, AuditMixinNullable, ExtraJSONMixin):
         }
 
 
+def _add_query_update(query: Query, columns: Optional[Set[str]] = None) -> None:
+    """
+    Keep the changes of a query being flushed, to publish them to the query feed
+    of its user once the session is committed.
+    """
+    if not is_feature_enabled("GLOBAL_ASYNC_QUERIES") or not query.user_id:
+        return
+    session = object_session(query)
+    session.info.setdefault(QUERY_UPDATES_KEY, []).append(
+        (query.user_id, query.to_update_dict(columns))
+    )
+
+
+def query_after_insert(  # pylint: disable=unused-argument
+    mapper: Mapper, connection: Connection, target: Query
+) -> None:
+    _add_query_update(target)
+
+
+def query_after_update(  # pylint: disable=unused-argument
+    mapper: Mapper, connection: Connection, target: Query
+) -> None:
+    state = sqla.inspect(target)
+    columns = {attr.key for attr in state.attrs if attr.history.has_changes()}
+    if columns & set(QUERY_FIELD_COLUMNS.values()):
+        _add_query_update(target, columns)
+
+
+def publish_query_updates(session: Session) -> None:
+    updates = session.info.pop(QUERY_UPDATES_KEY, None)
+    if not updates:
+        return
+    updates_by_user: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    for user_id, update in updates:
+        updates_by_user[user_id].append(update)
+    try:
+        for user_id, user_updates in updates_by_user.items():
+            async_query_manager.publish_query_updates(user_id, user_updates)
+    except Exception as ex:  # pylint: disable=broad-except
+        logger.warning("Could not publish query updates: %s", str(ex))
+
+
+def discard_query_updates(session: Session) -> None:
+    session.info.pop(QUERY_UPDATES_KEY, None)
+
+
+# events for the query feed
+sqla.event.listen(Query, "after_insert", query_after_insert)
+sqla.event.listen(Query, "after_update", query_after_update)
+sqla.event.listen(Session, "after_commit", publish_query_updates)
+sqla.event.listen(Session, "after_rollback", discard_query_updates)
+
+# events for the query history search index
+sqla.event.listen(Query, "after_insert", QuerySearchIndexUpdater.after_insert)
+sqla.event.listen(Query, "before_delete", QuerySearchIndexUpdater.before_delete)
+
 # events for updating tags
 sqla.event.listen(SavedQuery, "after_insert", QueryUpdater.after_insert)
 sqla.event.listen(SavedQuery, "after_update", QueryUpdater.after_update)
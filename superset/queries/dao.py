@@ -15,15 +15,33 @@
 # specific language governing permissions and limitations
 # under the License.
 import logging
+import re
 from datetime import datetime
+from typing import List, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import and_, or_
 
 from superset.dao.base import BaseDAO
 from superset.extensions import db
-from superset.models.sql_lab import Query, SavedQuery
+from superset.models.sql_lab import (
+    get_search_terms,
+    Query,
+    QuerySearchTerm,
+    SavedQuery,
+    SEARCH_PARTIAL_TERM,
+    SEARCH_TABLE_PREFIX,
+    SEARCH_TERM_MAX_LENGTH,
+)
 from superset.queries.filters import QueryFilter
 
 logger = logging.getLogger(__name__)
 
+# the words of a search text that start a word wherever the text matches the SQL:
+# the text can start in the middle of a word, and the LIKE wildcards and escape
+# character can match word characters
+SEARCH_TEXT_WORD_PATTERN = re.compile(r"(?<=[^\w%\\])[^\W_]+")
+
 
 class QueryDAO(BaseDAO):
     model_cls = Query
@@ -48,3 +66,106 @@ class QueryDAO(BaseDAO):
                 saved_query.rows = query.rows
                 saved_query.last_run = datetime.now()
             db.session.commit()
+
+    @staticmethod
+    def search(  # pylint: disable=too-many-arguments
+        user_id: Optional[int] = None,
+        database_id: Optional[int] = None,
+        status: Optional[str] = None,
+        search_text: Optional[str] = None,
+        table: Optional[str] = None,
+        from_time: Optional[int] = None,
+        to_time: Optional[int] = None,
+        after: Optional[Tuple[float, int]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Query]:
+        """
+        Search the query history, ordered by start time.
+
+        :param user_id: the user who ran the queries
+        :param database_id: the database the queries ran on
+        :param status: the status of the queries
+        :param search_text: text contained in the SQL of the queries
+        :param table: a table referenced by the queries, by name or fully
+            qualified name
+        :param from_time: the earliest start time of the queries, in seconds
+        :param to_time: the latest start time of the queries, in seconds
+        :param after: the start time and id of the last query of the previous
+            page, to get the next page
+        :param limit: the maximum number of queries
+        :returns: the queries
+        """
+        use_index = current_app.config["SQLLAB_QUERY_SEARCH_INDEX"]
+        query = db.session.query(Query)
+        if user_id:
+            query = query.filter(Query.user_id == user_id)
+        if database_id:
+            query = query.filter(Query.database_id == database_id)
+        if status:
+            query = query.filter(Query.status == status)
+        if search_text:
+            if use_index:
+                # the index narrows down the queries having words that start with
+                # the words of the text, the SQL of which is then matched against
+                # the whole text
+                for word in SEARCH_TEXT_WORD_PATTERN.findall(search_text.lower()):
+                    word = word[:SEARCH_TERM_MAX_LENGTH]
+                    query = query.filter(
+                        Query.id.in_(
+                            db.session.query(QuerySearchTerm.query_id).filter(
+                                or_(
+                                    QuerySearchTerm.term.like(f"{word}%"),
+                                    QuerySearchTerm.term == SEARCH_PARTIAL_TERM,
+                                )
+                            )
+                        )
+                    )
+            query = query.filter(Query.sql.like(f"%{search_text}%"))
+        if table:
+            if use_index:
+                query = query.filter(
+                    Query.id.in_(
+                        db.session.query(QuerySearchTerm.query_id).filter(
+                            QuerySearchTerm.term.in_(
+                                [
+                                    f"{SEARCH_TABLE_PREFIX}{table.lower()}",
+                                    SEARCH_PARTIAL_TERM,
+                                ]
+                            )
+                        )
+                    )
+                )
+            else:
+                query = query.filter(Query.sql.like(f"%{table}%"))
+        if from_time:
+            query = query.filter(Query.start_time > from_time)
+        if to_time:
+            query = query.filter(Query.start_time < to_time)
+        if after:
+            start_time, query_id = after
+            query = query.filter(
+                or_(
+                    Query.start_time > start_time,
+                    and_(Query.start_time == start_time, Query.id > query_id),
+                )
+            )
+        return query.order_by(Query.start_time.asc(), Query.id.asc()).limit(limit).all()
+
+    @staticmethod
+    def index_search_terms(queries: List[Query]) -> None:
+        """
+        Index queries in the query history search index, replacing their terms.
+        """
+        query_ids = [query.id for query in queries]
+        db.session.query(QuerySearchTerm).filter(
+            QuerySearchTerm.query_id.in_(query_ids)
+        ).delete(synchronize_session=False)
+        db.session.bulk_insert_mappings(
+            QuerySearchTerm,
+            [
+                {"term": term, "query_id": query.id}
+                for query in queries
+                for term in get_search_terms(query.sql or "")
+            ],
+        )
+        db.session.commit()
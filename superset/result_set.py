@@ -19,9 +19,8 @@
 import datetime
 import json
 import logging
-from typing import Any, Dict, List, Optional, Tuple, Type
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type
 
-import numpy as np
 import pandas as pd
 import pyarrow as pa
 
@@ -62,17 +61,137 @@ def stringify(obj: Any) -> str:
     return json.dumps(obj, default=utils.json_iso_dttm_ser)
 
 
-def stringify_values(array: np.ndarray) -> np.ndarray:
-    vstringify = np.vectorize(stringify)
-    return vstringify(array)
+def stringify_offending_values(values: Sequence[Any]) -> List[Optional[str]]:
+    """
+    Stringify the values of a column that can't be represented natively in Arrow.
+
+    Only values that aren't already strings are serialized, so strings are not
+    wrapped in quotes and nulls are preserved.
+
+    >>> stringify_offending_values(["a", 1, None, [1, 2]])
+    ['a', '1', None, '[1, 2]']
+    """
+    return [
+        value if value is None or isinstance(value, str) else stringify(value)
+        for value in values
+    ]
 
 
 def destringify(obj: str) -> Any:
     return json.loads(obj)
 
 
+def column_to_arrow(values: Sequence[Any]) -> pa.Array:
+    """
+    Convert the values of a single column to an Arrow array.
+
+    The Arrow type is inferred from the values; if inference fails, or the
+    resulting type is nested, the offending values are stringified and the
+    column is stored as a string array.
+
+    :param values: the values of the column, in row order
+    :returns: an Arrow array with the column values
+    """
+    try:
+        array = pa.array(values)
+    except (
+        pa.lib.ArrowInvalid,
+        pa.lib.ArrowTypeError,
+        pa.lib.ArrowNotImplementedError,
+        TypeError,  # this is super hackey,
+        # https://issues.apache.org/jira/browse/ARROW-7855
+    ):
+        return pa.array(stringify_offending_values(values), type=pa.string())
+
+    if pa.types.is_nested(array.type):
+        # TODO: revisit nested column serialization once nested types
+        #  are added as a natively supported column type in Superset
+        #  (superset.utils.core.GenericDataType).
+        return pa.array(stringify_offending_values(values), type=pa.string())
+
+    if pa.types.is_temporal(array.type):
+        # workaround for bug converting
+        # `psycopg2.tz.FixedOffsetTimezone` tzinfo values.
+        # related: https://issues.apache.org/jira/browse/ARROW-5248
+        sample = SupersetResultSet.first_nonempty(values)
+        if sample and isinstance(sample, datetime.datetime):
+            try:
+                if sample.tzinfo:
+                    tz = sample.tzinfo
+                    series = pd.Series(values, dtype="datetime64[ns]")
+                    series = pd.to_datetime(series).dt.tz_localize(tz)
+                    array = pa.Array.from_pandas(series, type=pa.timestamp("ns", tz=tz))
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.exception(ex)
+
+    return array
+
+
+def rows_to_record_batch(data: DbapiResult, column_names: List[str]) -> pa.RecordBatch:
+    """
+    Convert a batch of DB-API rows to an Arrow record batch.
+
+    :param data: the rows, as returned by the cursor
+    :param column_names: the deduped names of the columns
+    :returns: a record batch with one array per column
+    """
+    # transpose the rows into columns in a single pass; the column tuples
+    # only hold references to the values returned by the driver, and each
+    # one is released as soon as it has been converted to Arrow
+    columns: List[Optional[Tuple[Any, ...]]] = list(zip(*data))
+    pa_data: List[pa.Array] = []
+    for i in range(len(column_names)):
+        pa_data.append(column_to_arrow(columns[i] or ()))
+        columns[i] = None
+    return pa.RecordBatch.from_arrays(pa_data, names=column_names)
+
+
+def concat_column_chunks(arrays: List[pa.Array]) -> pa.ChunkedArray:
+    """
+    Combine the chunks of a column that was converted batch by batch.
+
+    Since types are inferred for each batch, chunks of the same column can end
+    up with different types, eg, a batch with only nulls, or integers in one
+    batch and floats or strings in the next. The chunks are cast to a common
+    type, falling back to strings when the types can't be reconciled.
+
+    :param arrays: the chunks of the column, in row order
+    :returns: a chunked array with a single type
+    """
+    types = {array.type for array in arrays if not pa.types.is_null(array.type)}
+    if not types:
+        return pa.chunked_array(arrays, type=pa.null())
+    if len(types) == 1:
+        target_type = types.pop()
+    elif all(
+        pa.types.is_integer(type_) or pa.types.is_floating(type_) for type_ in types
+    ):
+        target_type = pa.float64()
+    else:
+        target_type = pa.string()
+
+    try:
+        return pa.chunked_array(
+            [
+                array if array.type == target_type else array.cast(target_type)
+                for array in arrays
+            ],
+            type=target_type,
+        )
+    except (pa.lib.ArrowInvalid, pa.lib.ArrowNotImplementedError):
+        return pa.chunked_array(
+            [
+                pa.array(
+                    stringify_offending_values(array.to_pylist()), type=pa.string()
+                )
+                for array in arrays
+            ],
+            type=pa.string(),
+        )
+
+
 class SupersetResultSet:
-    def __init__(  # pylint: disable=too-many-locals,too-many-branches
+    def __init__(
         self,
         data: DbapiResult,
         cursor_description: DbapiDescription,
@@ -83,8 +202,6 @@ class SupersetResultSet:
         column_names: List[str] = []
         pa_data: List[pa.Array] = []
         deduped_cursor_desc: List[Tuple[Any, ...]] = []
-        numpy_dtype: List[Tuple[str, ...]] = []
-        stringified_arr: np.ndarray
 
         if cursor_description:
             # get deduped list of column names
@@ -96,57 +213,13 @@ class SupersetResultSet:
                 for column_name, description in zip(column_names, cursor_description)
             ]
 
-            # generate numpy structured array dtype
-            numpy_dtype = [(column_name, "object") for column_name in column_names]
-
-        # only do expensive recasting if datatype is not standard list of tuples
-        if data and (not isinstance(data, list) or not isinstance(data[0], tuple)):
-            data = [tuple(row) for row in data]
-        array = np.array(data, dtype=numpy_dtype)
-        if array.size > 0:
-            for column in column_names:
-                try:
-                    pa_data.append(pa.array(array[column].tolist()))
-                except (
-                    pa.lib.ArrowInvalid,
-                    pa.lib.ArrowTypeError,
-                    pa.lib.ArrowNotImplementedError,
-                    TypeError,  # this is super hackey,
-                    # https://issues.apache.org/jira/browse/ARROW-7855
-                ):
-                    # attempt serialization of values as strings
-                    stringified_arr = stringify_values(array[column])
-                    pa_data.append(pa.array(stringified_arr.tolist()))
-
-        if pa_data:  # pylint: disable=too-many-nested-blocks
-            for i, column in enumerate(column_names):
-                if pa.types.is_nested(pa_data[i].type):
-                    # TODO: revisit nested column serialization once nested types
-                    #  are added as a natively supported column type in Superset
-                    #  (superset.utils.core.GenericDataType).
-                    stringified_arr = stringify_values(array[column])
-                    pa_data[i] = pa.array(stringified_arr.tolist())
-
-                elif pa.types.is_temporal(pa_data[i].type):
-                    # workaround for bug converting
-                    # `psycopg2.tz.FixedOffsetTimezone` tzinfo values.
-                    # related: https://issues.apache.org/jira/browse/ARROW-5248
-                    sample = self.first_nonempty(array[column])
-                    if sample and isinstance(sample, datetime.datetime):
-                        try:
-                            if sample.tzinfo:
-                                tz = sample.tzinfo
-                                series = pd.Series(
-                                    array[column], dtype="datetime64[ns]"
-                                )
-                                series = pd.to_datetime(series).dt.tz_localize(tz)
-                                pa_data[i] = pa.Array.from_pandas(
-                                    series, type=pa.timestamp("ns", tz=tz)
-                                )
-                        except Exception as ex:  # pylint: disable=broad-except
-                            logger.exception(ex)
-
-        self.table = pa.Table.from_arrays(pa_data, names=column_names)
+        if data and column_names:
+            pa_data = rows_to_record_batch(data, column_names).columns
+
+        # an empty result has no columns, regardless of the cursor description
+        self.table = pa.Table.from_arrays(
+            pa_data, names=column_names if pa_data else []
+        )
         self._type_dict: Dict[str, Any] = {}
         try:
             # The driver may not be passing a cursor.description
@@ -158,6 +231,45 @@ class SupersetResultSet:
         except Exception as ex:  # pylint: disable=broad-except
             logger.exception(ex)
 
+    @classmethod
+    def from_batches(
+        cls,
+        batches: Iterable[DbapiResult],
+        cursor_description: DbapiDescription,
+        db_engine_spec: Type[db_engine_specs.BaseEngineSpec],
+    ) -> "SupersetResultSet":
+        """
+        Build a result set from a stream of row batches, as returned by
+        ``BaseEngineSpec.fetch_data_batches``.
+
+        Each batch is converted to an Arrow record batch as soon as it's received,
+        so the raw rows of earlier batches can be released while the cursor is
+        still being consumed.
+
+        :param batches: the batches of rows, in order
+        :param cursor_description: the cursor description
+        :param db_engine_spec: the engine spec of the database
+        :returns: a result set with the rows of all the batches
+        """
+        result_set = cls([], cursor_description, db_engine_spec)
+        column_names = dedup([col[0] for col in cursor_description or []])
+        record_batches: List[pa.RecordBatch] = []
+        for data in batches:
+            if data and column_names:
+                record_batches.append(rows_to_record_batch(data, column_names))
+
+        if record_batches:
+            result_set.table = pa.Table.from_arrays(
+                [
+                    concat_column_chunks(
+                        [record_batch.column(i) for record_batch in record_batches]
+                    )
+                    for i in range(len(column_names))
+                ],
+                names=column_names,
+            )
+        return result_set
+
     @staticmethod
     def convert_pa_dtype(pa_dtype: pa.DataType) -> Optional[str]:
         if pa.types.is_boolean(pa_dtype):
@@ -24,15 +24,20 @@ from typing import (
     Callable,
     cast,
     Dict,
+    FrozenSet,
+    Iterable,
     List,
+    NamedTuple,
     Optional,
     Set,
     Tuple,
+    Type,
     TYPE_CHECKING,
     Union,
 )
+from uuid import uuid4
 
-from flask import current_app, g
+from flask import _request_ctx_stack, current_app, g
 from flask_appbuilder import Model
 from flask_appbuilder.models.sqla.interface import SQLAInterface
 from flask_appbuilder.security.sqla.manager import SecurityManager
@@ -52,7 +57,7 @@ from flask_appbuilder.security.views import (
 )
 from flask_appbuilder.widgets import ListWidget
 from flask_login import AnonymousUserMixin
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, false, or_
 from sqlalchemy.engine.base import Connection
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.mapper import Mapper
@@ -64,6 +69,7 @@ from superset.constants import RouteMethod
 from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
 from superset.exceptions import SupersetSecurityException
 from superset.utils.core import DatasourceName, RowLevelSecurityFilterType
+from superset.utils.hashing import md5_sha_from_dict
 
 if TYPE_CHECKING:
     from superset.common.query_context import QueryContext
@@ -77,6 +83,19 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+PERMISSIONS_VERSION_CACHE_KEY = "security_permissions_version"
+RLS_FILTERS_VERSION_CACHE_KEY = "security_rls_filters_version"
+
+
+class RLSFilterClause(NamedTuple):
+    id: int
+    group_key: Optional[str]
+    clause: str
+
+
+# Row level security filters by table id, with their type and role ids
+RLSFilterIndex = Dict[int, List[Tuple[str, FrozenSet[int], RLSFilterClause]]]
+
 
 class SupersetSecurityListWidget(ListWidget):
     """
@@ -256,10 +275,171 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :returns: Whether the user can access the FAB permission/view
         """
 
-        user = g.user
+        return self._has_view_access(g.user, permission_name, view_name)
+
+    def _has_view_access(
+        self, user: User, permission_name: str, view_name: str
+    ) -> bool:
+        """
+        Return True if the user's roles grant the FAB permission/view, False
+        otherwise.
+
+        Overrides FAB's check, which queries the metadata database for every call,
+        with a lookup in the compiled permissions of the user. Outside of a request,
+        where the compiled permissions are only kept with PERMISSIONS_CACHE_TIMEOUT,
+        the permission is checked on its own as FAB does.
+
+        :param user: The FAB user (possibly anonymous)
+        :param permission_name: The FAB permission name
+        :param view_name: The FAB view-menu name
+        :returns: Whether the user can access the FAB permission/view
+        """
+
+        roles = self._get_roles_for_user(user)
+        if (
+            _request_ctx_stack.top is None
+            and not current_app.config["PERMISSIONS_CACHE_TIMEOUT"]
+        ):
+            role_ids = [
+                role.id for role in roles if role.name not in self.builtin_roles
+            ]
+            if role_ids and self.exist_permission_on_roles(
+                view_name, permission_name, role_ids
+            ):
+                return True
+        elif (permission_name, view_name) in self.get_user_permissions(user):
+            return True
+
+        # Builtin (statically configured) roles are matched with regular expressions
+        return any(
+            self._has_access_builtin_roles(role, permission_name, view_name)
+            for role in roles
+            if role.name in self.builtin_roles
+        )
+
+    def _get_roles_for_user(self, user: User) -> List[Role]:
         if user.is_anonymous:
-            return self.is_item_public(permission_name, view_name)
-        return self._has_view_access(user, permission_name, view_name)
+            if self.auth_role_public in self.builtin_roles:
+                return [self.role_model(name=self.auth_role_public)]
+            public_role = self.get_public_role()
+            return [public_role] if public_role else []
+        return list(user.roles)
+
+    def get_user_permissions(self, user: User) -> FrozenSet[Tuple[str, str]]:
+        """
+        Return the (permission, view menu) pairs granted by the user's roles.
+
+        The pairs are compiled once per request for each set of roles and, when
+        PERMISSIONS_CACHE_TIMEOUT is set, shared through the metadata cache. Builtin
+        roles are not part of the compiled set.
+
+        :param user: The FAB user (possibly anonymous)
+        :returns: The permission/view menu pairs granted to the user
+        """
+
+        role_ids = tuple(
+            sorted(
+                role.id
+                for role in self._get_roles_for_user(user)
+                if role.name not in self.builtin_roles
+            )
+        )
+        compiled: Dict[
+            Tuple[int, ...], FrozenSet[Tuple[str, str]]
+        ] = self._get_request_cache().setdefault("compiled_permissions", {})
+        if role_ids not in compiled:
+            compiled[role_ids] = self._compile_permissions(role_ids)
+        return compiled[role_ids]
+
+    def _compile_permissions(
+        self, role_ids: Tuple[int, ...]
+    ) -> FrozenSet[Tuple[str, str]]:
+        from superset.extensions import cache_manager
+
+        if not role_ids:
+            return frozenset()
+
+        cache_timeout = current_app.config["PERMISSIONS_CACHE_TIMEOUT"]
+        cache_key = None
+        if cache_timeout:
+            version = self._get_cache_version(PERMISSIONS_VERSION_CACHE_KEY)
+            cache_key = "security_permissions_{}_{}".format(
+                version, "_".join(str(role_id) for role_id in role_ids)
+            )
+            permissions = cache_manager.cache.get(cache_key)
+            if permissions is not None:
+                return permissions
+
+        permissions = frozenset(
+            (permission_name, view_menu_name)
+            for permission_name, view_menu_name in (
+                self.get_session.query(
+                    self.permission_model.name, self.viewmenu_model.name
+                )
+                .select_from(self.permissionview_model)
+                .join(self.permission_model)
+                .join(self.viewmenu_model)
+                .join(assoc_permissionview_role)
+                .filter(assoc_permissionview_role.c.role_id.in_(role_ids))
+                .distinct()
+            )
+        )
+        if cache_key:
+            cache_manager.cache.set(cache_key, permissions, timeout=cache_timeout)
+        return permissions
+
+    def invalidate_permissions(self) -> None:
+        """
+        Discard the compiled permissions after roles or permissions have changed.
+        """
+
+        self._get_request_cache().pop("compiled_permissions", None)
+        self._bump_cache_version(PERMISSIONS_VERSION_CACHE_KEY)
+
+    @staticmethod
+    def _get_request_cache() -> Dict[str, Any]:
+        """
+        Return a dictionary scoped to the current request, or a throwaway one outside
+        of a request.
+        """
+
+        ctx = _request_ctx_stack.top
+        if ctx is None:
+            return {}
+        if not hasattr(ctx, "security_cache"):
+            ctx.security_cache = {}
+        return ctx.security_cache
+
+    @staticmethod
+    def _get_cache_version(key: str) -> str:
+        from superset.extensions import cache_manager
+
+        version = cache_manager.cache.get(key)
+        if version is None:
+            version = SupersetSecurityManager._bump_cache_version(key)
+        return version
+
+    @staticmethod
+    def _bump_cache_version(key: str) -> str:
+        from superset.extensions import cache_manager
+
+        version = uuid4().hex
+        cache_manager.cache.set(key, version, timeout=0)
+        return version
+
+    def permissions_changed(  # pylint: disable=unused-argument
+        self, mapper: Mapper, connection: Connection, target: Model
+    ) -> None:
+        """
+        Invalidate the compiled permissions when a role or a permission/view is
+        modified outside of the security manager, e.g., via the role model view.
+
+        :param mapper: The role or permission/view mapper
+        :param connection: The DB-API connection
+        :param target: The role or permission/view being persisted
+        """
+
+        self.invalidate_permissions()
 
     def can_access_all_queries(self) -> bool:
         """
@@ -433,40 +613,22 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
 
     def get_user_datasources(self) -> List["BaseDatasource"]:
         """
-        Collect datasources which the user has explicit permissions to.
+        Collect datasources which the user has access to, either explicitly or via
+        schema or database access.
 
         :returns: The list of datasources
         """
 
-        user_perms = self.user_view_menu_names("datasource_access")
-        schema_perms = self.user_view_menu_names("schema_access")
-        user_datasources = set()
+        user_datasources = []
         for datasource_class in ConnectorRegistry.sources.values():
-            user_datasources.update(
-                self.get_session.query(datasource_class)
-                .filter(
-                    or_(
-                        datasource_class.perm.in_(user_perms),
-                        datasource_class.schema_perm.in_(schema_perms),
-                    )
+            query = self.get_session.query(datasource_class).filter(
+                datasource_class.id.in_(
+                    self.get_accessible_datasource_ids(datasource_class)
                 )
-                .all()
             )
+            user_datasources.extend(datasource_class.default_query(query))
 
-        # group all datasources by database
-        all_datasources = ConnectorRegistry.get_all_datasources(self.get_session)
-        datasources_by_database: Dict["Database", Set["BaseDatasource"]] = defaultdict(
-            set
-        )
-        for datasource in all_datasources:
-            datasources_by_database[datasource.database].add(datasource)
-
-        # add datasources with implicit permission (eg, database access)
-        for database, datasources in datasources_by_database.items():
-            if self.can_access_database(database):
-                user_datasources.update(datasources)
-
-        return list(user_datasources)
+        return user_datasources
 
     def can_access_table(self, database: "Database", table: "Table") -> bool:
         """
@@ -485,35 +647,84 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         return True
 
     def user_view_menu_names(self, permission_name: str) -> Set[str]:
+        return {s.name for s in self.user_view_menu_names_query(permission_name)}
+
+    def user_view_menu_names_query(self, permission_name: str) -> SqlaQuery:
+        """
+        Return a query of the view-menu names on which the user's roles grant the
+        permission.
+
+        This allows matching perms against the user's permissions in SQL, e.g.,
+        ``SqlaTable.perm.in_(query)``, rather than loading them in memory.
+
+        :param permission_name: The FAB permission name
+        :returns: The query of FAB view-menu names
+        """
+
         base_query = (
             self.get_session.query(self.viewmenu_model.name)
             .join(self.permissionview_model)
             .join(self.permission_model)
             .join(assoc_permissionview_role)
             .join(self.role_model)
+            .filter(self.permission_model.name == permission_name)
         )
 
         if not g.user.is_anonymous:
             # filter by user id
-            view_menu_names = (
+            return (
                 base_query.join(assoc_user_role)
                 .join(self.user_model)
                 .filter(self.user_model.id == g.user.get_id())
-                .filter(self.permission_model.name == permission_name)
-            ).all()
-            return {s.name for s in view_menu_names}
+            )
 
         # Properly treat anonymous user
         public_role = self.get_public_role()
         if public_role:
             # filter by public role
-            view_menu_names = (
-                base_query.filter(self.role_model.id == public_role.id).filter(
-                    self.permission_model.name == permission_name
-                )
-            ).all()
-            return {s.name for s in view_menu_names}
-        return set()
+            return base_query.filter(self.role_model.id == public_role.id)
+        return base_query.filter(false())
+
+    def get_accessible_datasource_ids(
+        self, datasource_class: Type["BaseDatasource"]
+    ) -> SqlaQuery:
+        """
+        Return a query of the ids of the datasources the user can access, either
+        explicitly or via schema or database access.
+
+        The access is resolved in a single SQL statement so list endpoints can filter
+        and paginate with ``datasource_class.id.in_(query)``.
+
+        :param datasource_class: The datasource model, e.g., SqlaTable
+        :returns: The query of accessible datasource ids
+        """
+
+        query = self.get_session.query(datasource_class.id)
+        if self.can_access_all_datasources() or self.can_access_all_databases():
+            return query
+
+        # Druid datasources belong to a cluster rather than a database
+        database = (
+            datasource_class.cluster
+            if hasattr(datasource_class, "cluster")
+            else datasource_class.database
+        )
+        database_class = database.property.mapper.class_
+        return query.filter(
+            or_(
+                datasource_class.perm.in_(
+                    self.user_view_menu_names_query("datasource_access")
+                ),
+                datasource_class.schema_perm.in_(
+                    self.user_view_menu_names_query("schema_access")
+                ),
+                database.has(
+                    database_class.perm.in_(
+                        self.user_view_menu_names_query("database_access")
+                    )
+                ),
+            )
+        )
 
     def get_schemas_accessible_by_user(
         self, database: "Database", schemas: List[str], hierarchical: bool = True
@@ -540,17 +751,17 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         }
 
         # datasource_access
-        perms = self.user_view_menu_names("datasource_access")
-        if perms:
-            tables = (
-                self.get_session.query(SqlaTable.schema)
-                .filter(SqlaTable.database_id == database.id)
-                .filter(SqlaTable.schema.isnot(None))
-                .filter(SqlaTable.schema != "")
-                .filter(or_(SqlaTable.perm.in_(perms)))
-                .distinct()
+        tables = (
+            self.get_session.query(SqlaTable.schema)
+            .filter(SqlaTable.database_id == database.id)
+            .filter(SqlaTable.schema.isnot(None))
+            .filter(SqlaTable.schema != "")
+            .filter(
+                SqlaTable.perm.in_(self.user_view_menu_names_query("datasource_access"))
             )
-            accessible_schemas.update([table.schema for table in tables])
+            .distinct()
+        )
+        accessible_schemas.update([table.schema for table in tables])
 
         return [s for s in schemas if s in accessible_schemas]
 
@@ -577,10 +788,16 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
             if schema_perm and self.can_access("schema_access", schema_perm):
                 return datasource_names
 
-        user_perms = self.user_view_menu_names("datasource_access")
-        schema_perms = self.user_view_menu_names("schema_access")
-        user_datasources = ConnectorRegistry.query_datasources_by_permissions(
-            self.get_session, database, user_perms, schema_perms
+        datasource_class = ConnectorRegistry.sources[database.type]
+        user_datasources = (
+            self.get_session.query(datasource_class)
+            .filter_by(database_id=database.id)
+            .filter(
+                datasource_class.id.in_(
+                    self.get_accessible_datasource_ids(datasource_class)
+                )
+            )
+            .all()
         )
         if schema:
             names = {d.table_name for d in user_datasources if d.schema == schema}
@@ -705,6 +922,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         # commit role and view menu updates
         self.get_session.commit()
         self.clean_perms()
+        self.invalidate_permissions()
 
     def _get_pvms_from_builtin_role(self, role_name: str) -> List[PermissionView]:
         """
@@ -764,6 +982,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         role_to.permissions = role_from_permissions
         self.get_session.merge(role_to)
         self.get_session.commit()
+        self.invalidate_permissions()
 
     def set_role(
         self, role_name: str, pvm_check: Callable[[PermissionView], bool]
@@ -785,6 +1004,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         role.permissions = role_pvms
         self.get_session.merge(role)
         self.get_session.commit()
+        self.invalidate_permissions()
 
     def _is_admin_only(self, pvm: PermissionView) -> bool:
         """
@@ -971,6 +1191,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
                         permission_id=permission.id, view_menu_id=view_menu.id
                     )
                 )
+                self.invalidate_permissions()
 
     def raise_for_access(
         # pylint: disable=too-many-arguments,too-many-branches,
@@ -995,7 +1216,6 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :raises SupersetSecurityException: If the user cannot access the resource
         """
 
-        from superset.connectors.sqla.models import SqlaTable
         from superset.sql_parse import Table
 
         if database and table or query:
@@ -1018,19 +1238,8 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
             denied = set()
 
             for table_ in tables:
-                schema_perm = self.get_schema_perm(database, schema=table_.schema)
-
-                if not (schema_perm and self.can_access("schema_access", schema_perm)):
-                    datasources = SqlaTable.query_datasources_by_name(
-                        self.get_session, database, table_.table, schema=table_.schema
-                    )
-
-                    # Access to any datasource is suffice.
-                    for datasource_ in datasources:
-                        if self.can_access("datasource_access", datasource_.perm):
-                            break
-                    else:
-                        denied.add(table_)
+                if not self._can_access_sql_table(database, table_):
+                    denied.add(table_)
 
             if denied:
                 raise SupersetSecurityException(
@@ -1059,6 +1268,61 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
                     self.get_datasource_access_error_object(datasource)
                 )
 
+    def _can_access_sql_table(self, database: "Database", table: "Table") -> bool:
+        """
+        Return True if the user has schema access, or access to any of the datasources,
+        of the SQL table, False otherwise.
+
+        The decisions are memoized for the request and, when TABLE_ACCESS_CACHE_TIMEOUT
+        is set, cached for the user's roles until the permissions change.
+
+        :param database: The Superset database
+        :param table: The SQL table
+        :returns: Whether the user can access the SQL table
+        """
+
+        from superset.connectors.sqla.models import SqlaTable
+        from superset.extensions import cache_manager
+
+        request_cache = self._get_request_cache().setdefault("table_access", {})
+        key = (database.id, table.schema, table.table)
+        if key in request_cache:
+            return request_cache[key]
+
+        cache_timeout = current_app.config["TABLE_ACCESS_CACHE_TIMEOUT"]
+        cache_key = None
+        has_access = None
+        if cache_timeout:
+            cache_key = "table_access_" + md5_sha_from_dict(
+                {
+                    "version": self._get_cache_version(PERMISSIONS_VERSION_CACHE_KEY),
+                    "roles": sorted(
+                        role.name for role in self._get_roles_for_user(g.user)
+                    ),
+                    "database_id": database.id,
+                    "schema": table.schema,
+                    "table": table.table,
+                }
+            )
+            has_access = cache_manager.cache.get(cache_key)
+
+        if has_access is None:
+            schema_perm = self.get_schema_perm(database, schema=table.schema)
+            has_access = bool(
+                schema_perm and self.can_access("schema_access", schema_perm)
+            ) or any(
+                # Access to any datasource is suffice.
+                self.can_access("datasource_access", datasource.perm)
+                for datasource in SqlaTable.query_datasources_by_name(
+                    self.get_session, database, table.table, schema=table.schema
+                )
+            )
+            if cache_key:
+                cache_manager.cache.set(cache_key, has_access, timeout=cache_timeout)
+
+        request_cache[key] = has_access
+        return has_access
+
     def get_user_by_username(
         self, username: str, session: Session = None
     ) -> Optional[User]:
@@ -1077,7 +1341,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
     def get_anonymous_user(self) -> User:  # pylint: disable=no-self-use
         return AnonymousUserMixin()
 
-    def get_rls_filters(self, table: "BaseDatasource") -> List[SqlaQuery]:
+    def get_rls_filters(self, table: "BaseDatasource") -> List[RLSFilterClause]:
         """
         Retrieves the appropriate row level security filters for the current user and
         the passed table.
@@ -1086,66 +1350,106 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :returns: A list of filters
         """
         if hasattr(g, "user") and hasattr(g.user, "id"):
-            from superset.connectors.sqla.models import (
-                RLSFilterRoles,
-                RLSFilterTables,
-                RowLevelSecurityFilter,
-            )
+            user_role_ids = {role.id for role in g.user.roles}
+            filters = []
+            for filter_type, role_ids, filter_ in self._get_rls_filter_index().get(
+                table.id, []
+            ):
+                # Regular filters apply to their roles, base filters to all the others
+                has_role = not role_ids.isdisjoint(user_role_ids)
+                if (filter_type == RowLevelSecurityFilterType.REGULAR and has_role) or (
+                    filter_type == RowLevelSecurityFilterType.BASE and not has_role
+                ):
+                    filters.append(filter_)
+            return filters
+        return []
 
-            user_roles = (
-                self.get_session.query(assoc_user_role.c.role_id)
-                .filter(assoc_user_role.c.user_id == g.user.get_id())
-                .subquery()
-            )
-            regular_filter_roles = (
-                self.get_session.query(RLSFilterRoles.c.rls_filter_id)
-                .join(RowLevelSecurityFilter)
-                .filter(
-                    RowLevelSecurityFilter.filter_type
-                    == RowLevelSecurityFilterType.REGULAR
-                )
-                .filter(RLSFilterRoles.c.role_id.in_(user_roles))
-                .subquery()
-            )
-            base_filter_roles = (
-                self.get_session.query(RLSFilterRoles.c.rls_filter_id)
-                .join(RowLevelSecurityFilter)
-                .filter(
-                    RowLevelSecurityFilter.filter_type
-                    == RowLevelSecurityFilterType.BASE
-                )
-                .filter(RLSFilterRoles.c.role_id.in_(user_roles))
-                .subquery()
-            )
-            filter_tables = (
-                self.get_session.query(RLSFilterTables.c.rls_filter_id)
-                .filter(RLSFilterTables.c.table_id == table.id)
-                .subquery()
+    def _get_rls_filter_index(self) -> RLSFilterIndex:
+        """
+        Return all the row level security filters indexed by table id.
+
+        The index is loaded once per request and, when RLS_FILTERS_CACHE_TIMEOUT is
+        set, shared through the metadata cache.
+
+        :returns: The row level security filters by table id
+        """
+        from superset.extensions import cache_manager
+
+        request_cache = self._get_request_cache()
+        if "rls_filter_index" in request_cache:
+            return request_cache["rls_filter_index"]
+
+        cache_timeout = current_app.config["RLS_FILTERS_CACHE_TIMEOUT"]
+        cache_key = None
+        index = None
+        if cache_timeout:
+            version = self._get_cache_version(RLS_FILTERS_VERSION_CACHE_KEY)
+            cache_key = f"security_rls_filters_{version}"
+            index = cache_manager.cache.get(cache_key)
+
+        if index is None:
+            index = self._load_rls_filter_index()
+            if cache_key:
+                cache_manager.cache.set(cache_key, index, timeout=cache_timeout)
+
+        request_cache["rls_filter_index"] = index
+        return index
+
+    def _load_rls_filter_index(self) -> RLSFilterIndex:
+        from superset.connectors.sqla.models import (
+            RLSFilterRoles,
+            RLSFilterTables,
+            RowLevelSecurityFilter,
+        )
+
+        role_ids: Dict[int, Set[int]] = defaultdict(set)
+        for rls_filter_id, role_id in self.get_session.query(
+            RLSFilterRoles.c.rls_filter_id, RLSFilterRoles.c.role_id
+        ):
+            role_ids[rls_filter_id].add(role_id)
+
+        filters = {
+            id_: (
+                filter_type,
+                frozenset(role_ids[id_]),
+                RLSFilterClause(id_, group_key, clause),
             )
-            query = (
-                self.get_session.query(
-                    RowLevelSecurityFilter.id,
-                    RowLevelSecurityFilter.group_key,
-                    RowLevelSecurityFilter.clause,
-                )
-                .filter(RowLevelSecurityFilter.id.in_(filter_tables))
-                .filter(
-                    or_(
-                        and_(
-                            RowLevelSecurityFilter.filter_type
-                            == RowLevelSecurityFilterType.REGULAR,
-                            RowLevelSecurityFilter.id.in_(regular_filter_roles),
-                        ),
-                        and_(
-                            RowLevelSecurityFilter.filter_type
-                            == RowLevelSecurityFilterType.BASE,
-                            RowLevelSecurityFilter.id.notin_(base_filter_roles),
-                        ),
-                    )
-                )
+            for id_, filter_type, group_key, clause in self.get_session.query(
+                RowLevelSecurityFilter.id,
+                RowLevelSecurityFilter.filter_type,
+                RowLevelSecurityFilter.group_key,
+                RowLevelSecurityFilter.clause,
             )
-            return query.all()
-        return []
+        }
+        index: RLSFilterIndex = defaultdict(list)
+        for rls_filter_id, table_id in self.get_session.query(
+            RLSFilterTables.c.rls_filter_id, RLSFilterTables.c.table_id
+        ).order_by(RLSFilterTables.c.rls_filter_id):
+            if rls_filter_id in filters:
+                index[table_id].append(filters[rls_filter_id])
+        return dict(index)
+
+    def invalidate_rls_filters(self) -> None:
+        """
+        Discard the indexed row level security filters after a filter has changed.
+        """
+
+        self._get_request_cache().pop("rls_filter_index", None)
+        self._bump_cache_version(RLS_FILTERS_VERSION_CACHE_KEY)
+
+    def rls_filters_changed(  # pylint: disable=unused-argument
+        self, mapper: Mapper, connection: Connection, target: Model
+    ) -> None:
+        """
+        Invalidate the indexed row level security filters when a filter is persisted
+        or deleted.
+
+        :param mapper: The row level security filter mapper
+        :param connection: The DB-API connection
+        :param target: The row level security filter being persisted
+        """
+
+        self.invalidate_rls_filters()
 
     def get_rls_ids(self, table: "BaseDatasource") -> List[int]:
         """
@@ -1159,8 +1463,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         ids.sort()  # Combinations rather than permutations
         return ids
 
-    @staticmethod
-    def raise_for_dashboard_access(dashboard: "Dashboard") -> None:
+    def raise_for_dashboard_access(self, dashboard: "Dashboard") -> None:
         """
         Raise an exception if the user cannot access the dashboard.
 
@@ -1168,41 +1471,98 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :raises DashboardAccessDeniedError: If the user cannot access the resource
         """
         from superset.dashboards.commands.exceptions import DashboardAccessDeniedError
+
+        if dashboard.id not in self.get_accessible_dashboard_ids({dashboard.id}):
+            raise DashboardAccessDeniedError()
+
+    def get_accessible_dashboard_ids(self, dashboard_ids: Iterable[int]) -> Set[int]:
+        """
+        Return the dashboards, among the passed ones, which the user can access.
+
+        With DASHBOARD_RBAC enabled, users can access the dashboards they own and the
+        published dashboards granted to one of their roles. These are resolved with a
+        single query and memoized for the request.
+
+        :param dashboard_ids: The ids of the dashboards to check
+        :returns: The ids of the accessible dashboards
+        """
+        from superset import db, is_feature_enabled
+        from superset.models.dashboard import Dashboard
         from superset.views.base import get_user_roles, is_user_admin
-        from superset.views.utils import is_owner
-        from superset import is_feature_enabled
 
-        if is_feature_enabled("DASHBOARD_RBAC"):
-            has_rbac_access = any(
-                dashboard_role.id in [user_role.id for user_role in get_user_roles()]
-                for dashboard_role in dashboard.roles
-            )
-            can_access = (
-                is_user_admin()
-                or is_owner(dashboard, g.user)
-                or (dashboard.published and has_rbac_access)
+        dashboard_ids = set(dashboard_ids)
+        if not is_feature_enabled("DASHBOARD_RBAC") or is_user_admin():
+            return dashboard_ids
+
+        request_cache = self._get_request_cache().setdefault("dashboard_access", {})
+        pending = dashboard_ids - request_cache.keys()
+        if pending:
+            query = (
+                db.session.query(Dashboard.id)
+                .filter(Dashboard.id.in_(pending))
+                .filter(
+                    or_(
+                        Dashboard.owners.any(self.user_model.id == g.user.get_id()),
+                        and_(
+                            Dashboard.published.is_(True),
+                            Dashboard.roles.any(
+                                self.role_model.id.in_(
+                                    [role.id for role in get_user_roles()]
+                                )
+                            ),
+                        ),
+                    )
+                )
             )
+            accessible = {dashboard_id for dashboard_id, in query}
+            for dashboard_id in pending:
+                request_cache[dashboard_id] = dashboard_id in accessible
+
+        return {
+            dashboard_id
+            for dashboard_id in dashboard_ids
+            if request_cache[dashboard_id]
+        }
 
-            if not can_access:
-                raise DashboardAccessDeniedError()
+    def can_access_based_on_dashboard(self, datasource: "BaseDatasource") -> bool:
+        """
+        Return True if the datasource is used by a chart of a dashboard the user can
+        access, False otherwise.
+
+        :param datasource: The Superset datasource
+        :returns: Whether the user can access the datasource via a dashboard
+        """
+
+        return datasource.id in self.get_dashboard_datasource_ids(
+            type(datasource), {datasource.id}
+        )
 
     @staticmethod
-    def can_access_based_on_dashboard(datasource: "BaseDatasource") -> bool:
+    def get_dashboard_datasource_ids(
+        datasource_class: Type["BaseDatasource"], datasource_ids: Iterable[int]
+    ) -> Set[int]:
+        """
+        Return the datasources, among the passed ones, which are used by a chart of a
+        dashboard the user can access, with a single query.
+
+        :param datasource_class: The datasource model, e.g., SqlaTable
+        :param datasource_ids: The ids of the datasources to check
+        :returns: The ids of the datasources accessible via a dashboard
+        """
         from superset import db
         from superset.dashboards.filters import DashboardAccessFilter
-        from superset.models.slice import Slice
         from superset.models.dashboard import Dashboard
+        from superset.models.slice import Slice
 
-        datasource_class = type(datasource)
         query = (
-            db.session.query(datasource_class)
-            .join(Slice.table)
-            .filter(datasource_class.id == datasource.id)
+            db.session.query(Slice.datasource_id)
+            .join(Slice.dashboards)
+            .filter(Slice.datasource_type == datasource_class.type)
+            .filter(Slice.datasource_id.in_(set(datasource_ids)))
+            .distinct()
         )
-
         query = DashboardAccessFilter("id", SQLAInterface(Dashboard, db.session)).apply(
             query, None
         )
 
-        exists = db.session.query(query.exists()).scalar()
-        return exists
+        return {datasource_id for datasource_id, in query}
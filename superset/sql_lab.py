@@ -37,7 +37,7 @@ from superset.dataframe import df_to_records
 from superset.db_engine_specs import BaseEngineSpec
 from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
 from superset.exceptions import SupersetErrorException, SupersetErrorsException
-from superset.extensions import celery_app
+from superset.extensions import celery_app, query_progress_manager
 from superset.models.core import Database
 from superset.models.sql_lab import LimitingFactor, Query
 from superset.result_set import SupersetResultSet
@@ -47,10 +47,12 @@ from superset.utils.core import (
     json_iso_dttm_ser,
     QuerySource,
     QueryStatus,
+    timeout,
     zlib_compress,
 )
 from superset.utils.dates import now_as_float
 from superset.utils.decorators import stats_timing
+from superset.utils.results_chunks import write_result_chunks
 
 
 # pylint: disable=unused-argument, redefined-outer-name
@@ -70,6 +72,7 @@ SQLLAB_TIMEOUT = config["SQLLAB_ASYNC_TIME_LIMIT_SEC"]
 SQLLAB_HARD_TIMEOUT = SQLLAB_TIMEOUT + 60
 SQL_MAX_ROW = config["SQL_MAX_ROW"]
 SQLLAB_CTAS_NO_LIMIT = config["SQLLAB_CTAS_NO_LIMIT"]
+RESULTS_STREAMING_FETCH = config["RESULTS_STREAMING_FETCH"]
 SQL_QUERY_MUTATOR = config.get("SQL_QUERY_MUTATOR") or dummy_sql_query_mutator
 log_query = config["QUERY_LOGGER"]
 logger = logging.getLogger(__name__)
@@ -153,6 +156,59 @@ def get_query(query_id: int, session: Session) -> Query:
         raise SqlLabException("Failed at getting query")
 
 
+def check_query_cost(
+    query: Query, rendered_query: str, user_name: Optional[str]
+) -> None:
+    """
+    Estimate the cost of a query before running it, and reject it when the cost
+    of any of its statements exceeds the SQLLAB_QUERY_COST_THRESHOLDS of its
+    engine. Queries whose cost can't be estimated are run.
+    """
+    database = query.database
+    db_engine_spec = database.db_engine_spec
+    thresholds = config["SQLLAB_QUERY_COST_THRESHOLDS"].get(db_engine_spec.engine)
+    if not thresholds or not db_engine_spec.get_allow_cost_estimate(
+        database.get_extra()
+    ):
+        return
+
+    seconds = config["SQLLAB_QUERY_COST_ESTIMATE_TIMEOUT"]
+    timeout_msg = f"The estimation exceeded the {seconds} seconds timeout."
+    try:
+        with timeout(seconds=seconds, error_message=timeout_msg):
+            costs = db_engine_spec.estimate_query_cost(
+                database,
+                query.schema,
+                rendered_query,
+                QuerySource.SQL_LAB,
+                user_name=user_name,
+            )
+    except Exception as ex:  # pylint: disable=broad-except
+        logger.warning("Query %s: Could not estimate the cost: %s", query.id, ex)
+        return
+
+    for cost in costs:
+        metrics = db_engine_spec.get_query_cost_metrics(cost)
+        for metric, threshold in thresholds.items():
+            value = metrics.get(metric)
+            if value is not None and value > threshold:
+                stats_logger.incr("sqllab.query.cost_exceeded")
+                raise SupersetErrorException(
+                    SupersetError(
+                        message=__(
+                            "The estimated %(metric)s of the query (%(value)s) "
+                            "exceeds the limit of %(threshold)s. Please make the "
+                            "query less expensive and try again.",
+                            metric=metric,
+                            value=value,
+                            threshold=threshold,
+                        ),
+                        error_type=SupersetErrorType.QUERY_COST_EXCEEDED_ERROR,
+                        level=ErrorLevel.ERROR,
+                    )
+                )
+
+
 @celery_app.task(
     name="sql_lab.get_sql_results",
     bind=True,
@@ -171,7 +227,8 @@ def get_sql_results(  # pylint: disable=too-many-arguments
     log_params: Optional[Dict[str, Any]] = None,
 ) -> Optional[Dict[str, Any]]:
     """Executes the sql query returns the results."""
-    with session_scope(not ctask.request.called_directly) as session:
+    is_async = not ctask.request.called_directly
+    with session_scope(is_async) as session:
 
         try:
             return execute_sql_statements(
@@ -184,6 +241,7 @@ def get_sql_results(  # pylint: disable=too-many-arguments
                 start_time=start_time,
                 expand_data=expand_data,
                 log_params=log_params,
+                is_async=is_async,
             )
         except Exception as ex:  # pylint: disable=broad-except
             logger.debug("Query %d: %s", query_id, ex)
@@ -233,6 +291,19 @@ def execute_sql_statement(
         )
         query.select_as_cta_used = True
 
+    sample_percent = query.extra.get("sample_percent")
+    if (
+        sample_percent
+        and not query.select_as_cta_used
+        and db_engine_spec.is_select_query(parsed_query)
+    ):
+        # preview the results from samples of the tables, engines that can't
+        # sample tables only apply the limit
+        sampled_sql = db_engine_spec.apply_sample_to_sql(sql, sample_percent)
+        if sampled_sql:
+            sql = sampled_sql
+            query.set_extra_json_key("sampled", True)
+
     # Do not apply limit to the CTA queries when SQLLAB_CTAS_NO_LIMIT is set to true
     if db_engine_spec.is_select_query(parsed_query) and not (
         query.select_as_cta_used and SQLLAB_CTAS_NO_LIMIT
@@ -273,6 +344,19 @@ def execute_sql_statement(
                 query.id,
                 str(query.to_dict()),
             )
+            if RESULTS_STREAMING_FETCH:
+                result_set = SupersetResultSet.from_batches(
+                    db_engine_spec.fetch_data_batches(cursor, increased_limit),
+                    cursor.description,
+                    db_engine_spec,
+                )
+                if query.limit is None or result_set.size <= query.limit:
+                    query.limiting_factor = LimitingFactor.NOT_LIMITED
+                else:
+                    # return 1 row less than increased_query
+                    result_set.table = result_set.table.slice(0, query.limit)
+                return result_set
+
             data = db_engine_spec.fetch_data(cursor, increased_limit)
             if query.limit is None or len(data) <= query.limit:
                 query.limiting_factor = LimitingFactor.NOT_LIMITED
@@ -318,42 +402,90 @@ def _serialize_payload(
     return json.dumps(payload, default=json_iso_dttm_ser, ignore_nan=True)
 
 
+class SqlLabResults:
+    """
+    The results of a SQL Lab query, converted lazily to the formats needed by
+    their consumers.
+
+    The Arrow table of the result set is the canonical copy of the rows: the
+    payload stored in the results backend is serialized from it, and the records
+    returned to the client are built from it the same way they are built when the
+    payload is read back from the results backend, so both responses match.
+    """
+
+    def __init__(
+        self,
+        result_set: SupersetResultSet,
+        db_engine_spec: BaseEngineSpec,
+        expand_data: bool = False,
+    ) -> None:
+        self.result_set = result_set
+        self.db_engine_spec = db_engine_spec
+        self.expand_data = expand_data
+        self._columns: Optional[List[Any]] = None
+        self._arrow_data: Optional[bytes] = None
+        self._records: Optional[Tuple[List[Any], List[Any], List[Any]]] = None
+
+    @property
+    def columns(self) -> List[Any]:
+        if self._columns is None:
+            self._columns = self.result_set.columns
+        return self._columns
+
+    @property
+    def arrow_data(self) -> bytes:
+        """
+        The rows serialized with pyarrow, for the results backend.
+        """
+        if self._arrow_data is None:
+            with stats_timing(
+                "sqllab.query.results_backend_pa_serialization", stats_logger
+            ):
+                self._arrow_data = (
+                    pa.default_serialization_context()
+                    .serialize(self.result_set.pa_table)
+                    .to_buffer()
+                    .to_pybytes()
+                )
+        return self._arrow_data
+
+    @property
+    def records(self) -> Tuple[List[Any], List[Any], List[Any]]:
+        """
+        The rows as records, with their columns and expanded columns.
+        """
+        if self._records is None:
+            df = SupersetResultSet.convert_table_to_df(self.result_set.pa_table)
+            data = df_to_records(df) or []
+
+            if self.expand_data:
+                all_columns, data, expanded_columns = self.db_engine_spec.expand_data(
+                    self.columns, data
+                )
+            else:
+                all_columns = self.columns
+                expanded_columns = []
+            self._records = (data, all_columns, expanded_columns)
+        return self._records
+
+    def serialize(
+        self, use_msgpack: Optional[bool] = False
+    ) -> Tuple[Union[bytes, str], List[Any], List[Any], List[Any]]:
+        if use_msgpack:
+            # expand when loading data from results backend
+            return (self.arrow_data, self.columns, self.columns, [])
+
+        data, all_columns, expanded_columns = self.records
+        return (data, self.columns, all_columns, expanded_columns)
+
+
 def _serialize_and_expand_data(
     result_set: SupersetResultSet,
     db_engine_spec: BaseEngineSpec,
     use_msgpack: Optional[bool] = False,
     expand_data: bool = False,
 ) -> Tuple[Union[bytes, str], List[Any], List[Any], List[Any]]:
-    selected_columns = result_set.columns
-    all_columns: List[Any]
-    expanded_columns: List[Any]
-
-    if use_msgpack:
-        with stats_timing(
-            "sqllab.query.results_backend_pa_serialization", stats_logger
-        ):
-            data = (
-                pa.default_serialization_context()
-                .serialize(result_set.pa_table)
-                .to_buffer()
-                .to_pybytes()
-            )
-
-        # expand when loading data from results backend
-        all_columns, expanded_columns = (selected_columns, [])
-    else:
-        df = result_set.to_pandas_df()
-        data = df_to_records(df) or []
-
-        if expand_data:
-            all_columns, data, expanded_columns = db_engine_spec.expand_data(
-                selected_columns, data
-            )
-        else:
-            all_columns = selected_columns
-            expanded_columns = []
-
-    return (data, selected_columns, all_columns, expanded_columns)
+    return SqlLabResults(result_set, db_engine_spec, expand_data).serialize(use_msgpack)
 
 
 def execute_sql_statements(  # pylint: disable=too-many-arguments, too-many-locals, too-many-statements, too-many-branches
@@ -366,6 +498,7 @@ def execute_sql_statements(  # pylint: disable=too-many-arguments, too-many-loca
     start_time: Optional[float],
     expand_data: bool,
     log_params: Optional[Dict[str, Any]],
+    is_async: bool = False,
 ) -> Optional[Dict[str, Any]]:
     """Executes the sql query returns the results."""
     if store_results and start_time:
@@ -438,6 +571,10 @@ def execute_sql_statements(  # pylint: disable=too-many-arguments, too-many-loca
             )
         )
 
+    if is_async:
+        # the cost of asynchronous queries is checked before running them
+        check_query_cost(query, rendered_query, user_name)
+
     engine = database.get_sqla_engine(
         schema=query.schema,
         nullpool=True,
@@ -456,9 +593,8 @@ def execute_sql_statements(  # pylint: disable=too-many-arguments, too-many-loca
         statement_count = len(statements)
         for i, statement in enumerate(statements):
             # Check if stopped
-            session.refresh(query)
-            if query.status == QueryStatus.STOPPED:
-                payload.update({"status": query.status})
+            if query_progress_manager.is_stopped(query, session):
+                payload.update({"status": QueryStatus.STOPPED})
                 return payload
 
             # For CTAS we create the table only on the last statement
@@ -514,10 +650,18 @@ def execute_sql_statements(  # pylint: disable=too-many-arguments, too-many-loca
         )
     query.end_time = now_as_float()
 
+    results = SqlLabResults(result_set, db_engine_spec, expand_data)
     use_arrow_data = store_results and cast(bool, results_backend_use_msgpack)
-    data, selected_columns, all_columns, expanded_columns = _serialize_and_expand_data(
-        result_set, db_engine_spec, use_arrow_data, expand_data
-    )
+    use_chunks = use_arrow_data and config["RESULTS_BACKEND_CHUNKED"]
+    if use_chunks:
+        # the data is stored in chunks next to the payload
+        data: Any = []
+        selected_columns = all_columns = results.columns
+        expanded_columns: List[Any] = []
+    else:
+        data, selected_columns, all_columns, expanded_columns = results.serialize(
+            use_arrow_data
+        )
 
     # TODO: data should be saved separately from metadata (likely in Parquet)
     payload.update(
@@ -538,15 +682,26 @@ def execute_sql_statements(  # pylint: disable=too-many-arguments, too-many-loca
             "Query %s: Storing results in results backend, key: %s", str(query_id), key
         )
         with stats_timing("sqllab.query.results_backend_write", stats_logger):
+            cache_timeout = database.cache_timeout
+            if cache_timeout is None:
+                cache_timeout = config["CACHE_DEFAULT_TIMEOUT"]
+
+            if use_chunks:
+                payload["chunks"] = write_result_chunks(
+                    results_backend,
+                    key,
+                    result_set.pa_table,
+                    config["RESULTS_BACKEND_CHUNK_SIZE"],
+                    cache_timeout,
+                )
+                logger.debug("*** stored %i result chunks", len(payload["chunks"]))
+
             with stats_timing(
                 "sqllab.query.results_backend_write_serialization", stats_logger
             ):
                 serialized_payload = _serialize_payload(
                     payload, cast(bool, results_backend_use_msgpack)
                 )
-            cache_timeout = database.cache_timeout
-            if cache_timeout is None:
-                cache_timeout = config["CACHE_DEFAULT_TIMEOUT"]
 
             compressed = zlib_compress(serialized_payload)
             logger.debug(
@@ -560,21 +715,14 @@ def execute_sql_statements(  # pylint: disable=too-many-arguments, too-many-loca
     session.commit()
 
     if return_results:
+        payload.pop("chunks", None)
         # since we're returning results we need to create non-arrow data
         if use_arrow_data:
-            (
-                data,
-                selected_columns,
-                all_columns,
-                expanded_columns,
-            ) = _serialize_and_expand_data(
-                result_set, db_engine_spec, False, expand_data
-            )
+            data, all_columns, expanded_columns = results.records
             payload.update(
                 {
                     "data": data,
                     "columns": all_columns,
-                    "selected_columns": selected_columns,
                     "expanded_columns": expanded_columns,
                 }
             )
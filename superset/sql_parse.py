@@ -17,15 +17,19 @@
 import logging
 from dataclasses import dataclass  # pylint: disable=wrong-import-order
 from enum import Enum
-from typing import List, Optional, Set
+from functools import lru_cache
+from itertools import islice
+from typing import FrozenSet, List, Optional, Set
 from urllib import parse
 
 import sqlparse
+from sqlparse.engine import FilterStack
 from sqlparse.sql import (
     Identifier,
     IdentifierList,
     Parenthesis,
     remove_quotes,
+    Statement,
     Token,
     TokenList,
 )
@@ -36,6 +40,8 @@ RESULT_OPERATIONS = {"UNION", "INTERSECT", "EXCEPT", "SELECT"}
 ON_KEYWORD = "ON"
 PRECEDES_TABLE_NAME = {"FROM", "JOIN", "DESCRIBE", "WITH", "LEFT JOIN", "RIGHT JOIN"}
 CTE_PREFIX = "CTE__"
+# The number of distinct SQL strings whose parsing results are kept in memory
+PARSE_CACHE_SIZE = 256
 logger = logging.getLogger(__name__)
 
 
@@ -65,6 +71,45 @@ def _extract_limit_from_query(statement: TokenList) -> Optional[int]:
     return None
 
 
+def _extract_limit_from_tokens(tokens: List[Token]) -> Optional[int]:
+    """
+    Extract limit clause from the ungrouped tokens of a SQL statement, which is
+    equivalent to ``_extract_limit_from_query`` on the grouped statement.
+
+    :param tokens: the tokens of the SQL statement, as returned by the lexer
+    :return: Limit extracted from query, None if no limit present in statement
+    """
+    # skip the tokens within parentheses, unless these aren't closed, in which
+    # case they aren't grouped by sqlparse either
+    nesting = [0] * (len(tokens) + 1)
+    opened: List[int] = []
+    for idx, token in enumerate(tokens):
+        if token.match(Punctuation, "("):
+            opened.append(idx)
+        elif token.match(Punctuation, ")") and opened:
+            nesting[opened.pop()] += 1
+            nesting[idx + 1] -= 1
+
+    depth = 0
+    for idx, token in enumerate(tokens):
+        depth += nesting[idx]
+        if depth == 0 and token.match(Keyword, "LIMIT"):
+            following = list(
+                islice(
+                    (token for token in tokens[idx + 1 :] if not token.is_whitespace),
+                    3,
+                )
+            )
+            limit = following[0] if following else None
+            if len(following) > 1 and following[1].match(Punctuation, ","):
+                # In case of "LIMIT <offset>, <limit>", the limit follows the comma
+                limit = following[2] if len(following) > 2 else None
+            if limit and limit.ttype == sqlparse.tokens.Literal.Number.Integer:
+                return int(limit.value)
+            return None
+    return None
+
+
 def strip_comments_from_sql(statement: str) -> str:
     """
     Strips comments from a SQL statement, does a simple test first
@@ -100,88 +145,131 @@ class Table:  # pylint: disable=too-few-public-methods
         )
 
 
+@dataclass
+class _ParseResult:
+    """
+    The results of parsing a SQL string, shared by all the ``ParsedQuery``
+    instances built for it. The ones requiring the grouped token tree are only
+    computed on first use.
+    """
+
+    statements: List[str]
+    limit: Optional[int]
+    statement_types: Optional[List[str]] = None
+    tables: Optional[FrozenSet[Table]] = None
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_sql(sql: str) -> _ParseResult:
+    """
+    Split a SQL string into statements and extract its limit, without grouping
+    the tokens, which is the most expensive part of parsing.
+    """
+    statements: List[Statement] = list(FilterStack().run(sql))
+    return _ParseResult(
+        statements=[
+            stripped
+            for stripped in (str(statement).strip(" \n;\t") for statement in statements)
+            if stripped
+        ],
+        limit=_extract_limit_from_tokens(statements[-1].tokens) if statements else None,
+    )
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _format_without_comments(sql: str) -> str:
+    return sqlparse.format(sql, strip_comments=True)
+
+
 class ParsedQuery:
     def __init__(self, sql_statement: str, strip_comments: bool = False):
         if strip_comments:
-            sql_statement = sqlparse.format(sql_statement, strip_comments=True)
+            sql_statement = _format_without_comments(sql_statement)
 
         self.sql: str = sql_statement
         self._tables: Set[Table] = set()
         self._alias_names: Set[str] = set()
-        self._limit: Optional[int] = None
+        self._grouped: Optional[List[Statement]] = None
+
+        # the parsing results are cached, as the same SQL is usually parsed
+        # several times while handling a request
+        self._result = _parse_sql(self.stripped())
+        self._limit: Optional[int] = self._result.limit
+
+    @property
+    def _parsed(self) -> List[Statement]:
+        """
+        The statements, with their tokens grouped. They aren't cached, as
+        ``set_or_update_query_limit`` modifies them.
+        """
+        if self._grouped is None:
+            logger.debug("Parsing with sqlparse statement: %s", self.sql)
+            self._grouped = list(sqlparse.parse(self.stripped()))
+        return self._grouped
 
-        logger.debug("Parsing with sqlparse statement: %s", self.sql)
-        self._parsed = sqlparse.parse(self.stripped())
-        for statement in self._parsed:
-            self._limit = _extract_limit_from_query(statement)
+    @property
+    def _statement_types(self) -> List[str]:
+        if self._result.statement_types is None:
+            self._result.statement_types = [
+                statement.get_type() for statement in self._parsed
+            ]
+        return self._result.statement_types
 
     @property
     def tables(self) -> Set[Table]:
-        if not self._tables:
+        if self._result.tables is None:
             for statement in self._parsed:
                 self._extract_from_token(statement)
 
-            self._tables = {
+            self._result.tables = frozenset(
                 table for table in self._tables if str(table) not in self._alias_names
-            }
-        return self._tables
+            )
+        return set(self._result.tables)
 
     @property
     def limit(self) -> Optional[int]:
         return self._limit
 
     def is_select(self) -> bool:
-        return self._parsed[0].get_type() == "SELECT"
+        return self._statement_types[0] == "SELECT"
 
     def is_valid_ctas(self) -> bool:
-        return self._parsed[-1].get_type() == "SELECT"
+        return self._statement_types[-1] == "SELECT"
 
     def is_valid_cvas(self) -> bool:
-        return len(self._parsed) == 1 and self._parsed[0].get_type() == "SELECT"
+        return len(self._statement_types) == 1 and self._statement_types[0] == "SELECT"
 
     def is_explain(self) -> bool:
         # Remove comments
-        statements_without_comments = sqlparse.format(
-            self.stripped(), strip_comments=True
-        )
+        statements_without_comments = _format_without_comments(self.stripped())
 
         # Explain statements will only be the first statement
         return statements_without_comments.startswith("EXPLAIN")
 
     def is_show(self) -> bool:
         # Remove comments
-        statements_without_comments = sqlparse.format(
-            self.stripped(), strip_comments=True
-        )
+        statements_without_comments = _format_without_comments(self.stripped())
         # Show statements will only be the first statement
         return statements_without_comments.upper().startswith("SHOW")
 
     def is_set(self) -> bool:
         # Remove comments
-        statements_without_comments = sqlparse.format(
-            self.stripped(), strip_comments=True
-        )
+        statements_without_comments = _format_without_comments(self.stripped())
         # Set statements will only be the first statement
         return statements_without_comments.upper().startswith("SET")
 
     def is_unknown(self) -> bool:
-        return self._parsed[0].get_type() == "UNKNOWN"
+        return self._statement_types[0] == "UNKNOWN"
 
     def stripped(self) -> str:
         return self.sql.strip(" \t\n;")
 
     def strip_comments(self) -> str:
-        return sqlparse.format(self.stripped(), strip_comments=True)
+        return _format_without_comments(self.stripped())
 
     def get_statements(self) -> List[str]:
         """Returns a list of SQL statements as strings, stripped"""
-        statements = []
-        for statement in self._parsed:
-            if statement:
-                sql = str(statement).strip(" \n;\t")
-                if sql:
-                    statements.append(sql)
-        return statements
+        return list(self._result.statements)
 
     @staticmethod
     def _get_table(tlist: TokenList) -> Optional[Table]:
@@ -311,6 +399,77 @@ class ParsedQuery:
                 if any(not self._is_identifier(token2) for token2 in item.tokens):
                     self._extract_from_token(item)
 
+    def set_table_sample(self, clause: str, before_alias: bool = False) -> str:
+        """Returns the query with the tables it reads from sampled.
+
+        Only tables are sampled, not the subqueries or CTEs that read from them.
+        :param clause: The sampling clause, eg "TABLESAMPLE SYSTEM (1)"
+        :param before_alias: Whether the clause goes between the table name and its
+            alias, rather than after the alias
+        :return: The query with the sampling clause after its tables
+        """
+        tables = self.tables
+        statements = sqlparse.parse(self.stripped())
+        for statement in statements:
+            self._sample_tables(statement, tables, clause, before_alias)
+        return "".join(str(statement) for statement in statements)
+
+    def _sample_tables(
+        self, token: Token, tables: Set[Table], clause: str, before_alias: bool
+    ) -> None:
+        """
+        Add the sampling clause after the tables found in the token, recursively,
+        the same way ``_extract_from_token`` finds them.
+        """
+        if not hasattr(token, "tokens"):
+            return
+
+        table_name_preceding_token = False
+
+        for item in token.tokens:
+            if item.is_group and (
+                not self._is_identifier(item) or isinstance(item.tokens[0], Parenthesis)
+            ):
+                self._sample_tables(item, tables, clause, before_alias)
+
+            if item.ttype in Keyword and (
+                item.normalized in PRECEDES_TABLE_NAME
+                or item.normalized.endswith(" JOIN")
+            ):
+                table_name_preceding_token = True
+                continue
+
+            if item.ttype in Keyword:
+                table_name_preceding_token = False
+                continue
+            if not table_name_preceding_token:
+                continue
+
+            if isinstance(item, Identifier):
+                identifiers = [item]
+            elif isinstance(item, IdentifierList):
+                identifiers = [
+                    token2
+                    for token2 in item.get_identifiers()
+                    if isinstance(token2, Identifier)
+                ]
+            else:
+                continue
+            for identifier in identifiers:
+                if "(" in str(identifier):
+                    # subselects and CTEs
+                    if identifier is not item or not isinstance(
+                        identifier.tokens[0], Parenthesis
+                    ):
+                        self._sample_tables(identifier, tables, clause, before_alias)
+                elif self._get_table(identifier) in tables:
+                    idx = len(identifier.tokens)
+                    if before_alias and identifier.has_alias():
+                        ws_idx, _ = identifier.token_next_by(t=Whitespace)
+                        if ws_idx is not None:
+                            idx = ws_idx
+                    identifier.tokens.insert(idx, Token(Keyword, f" {clause}"))
+
     def set_or_update_query_limit(self, new_limit: int, force: bool = False) -> str:
         """Returns the query with the specified limit.
 
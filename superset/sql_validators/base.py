@@ -17,8 +17,10 @@
 
 # pylint: disable=too-few-public-methods
 
+import uuid
 from typing import Any, Dict, List, Optional
 
+from superset.extensions import cache_manager
 from superset.models.core import Database
 
 
@@ -47,6 +49,31 @@ class SQLValidationAnnotation:
         }
 
 
+class SQLValidationSupersededError(Exception):
+    """The validation was superseded by a newer request from the same client"""
+
+
+class SQLValidationRequest:
+    """
+    A validation request from a SQL Lab editor. Each request from an editor
+    supersedes the previous ones, which stop validating their statements.
+    """
+
+    def __init__(self, user_id: Optional[int], client_id: str, timeout: int):
+        self.key = f"sqllab_validation_{user_id}_{client_id}"
+        self.request_id = str(uuid.uuid4())
+        cache_manager.cache.set(self.key, self.request_id, timeout=timeout)
+
+    def is_superseded(self) -> bool:
+        latest_request_id = cache_manager.cache.get(self.key)
+        return latest_request_id not in (None, self.request_id)
+
+    def check(self) -> None:
+        """Raise if the request was superseded"""
+        if self.is_superseded():
+            raise SQLValidationSupersededError()
+
+
 class BaseSQLValidator:
     """BaseSQLValidator defines the interface for checking that a given sql
     query is valid for a given database engine."""
@@ -55,7 +82,11 @@ class BaseSQLValidator:
 
     @classmethod
     def validate(
-        cls, sql: str, schema: Optional[str], database: Database
+        cls,
+        sql: str,
+        schema: Optional[str],
+        database: Database,
+        validation_request: Optional[SQLValidationRequest] = None,
     ) -> List[SQLValidationAnnotation]:
         """Check that the given SQL querystring is valid for the given engine"""
         raise NotImplementedError
@@ -21,7 +21,11 @@ from typing import List, Optional
 from pgsanity.pgsanity import check_string
 
 from superset.models.core import Database
-from superset.sql_validators.base import BaseSQLValidator, SQLValidationAnnotation
+from superset.sql_validators.base import (
+    BaseSQLValidator,
+    SQLValidationAnnotation,
+    SQLValidationRequest,
+)
 
 
 class PostgreSQLValidator(BaseSQLValidator):  # pylint: disable=too-few-public-methods
@@ -31,7 +35,13 @@ class PostgreSQLValidator(BaseSQLValidator):  # pylint: disable=too-few-public-m
 
     @classmethod
     def validate(
-        cls, sql: str, schema: Optional[str], database: Database
+        cls,
+        sql: str,
+        schema: Optional[str],
+        database: Database,
+        validation_request: Optional[  # pylint: disable=unused-argument
+            SQLValidationRequest
+        ] = None,
     ) -> List[SQLValidationAnnotation]:
         annotations: List[SQLValidationAnnotation] = []
         valid, error = check_string(sql, add_semicolon=True)
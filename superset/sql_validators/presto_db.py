@@ -23,10 +23,17 @@ from typing import Any, Dict, List, Optional
 from flask import g
 
 from superset import app, security_manager
+from superset.extensions import cache_manager
 from superset.models.core import Database
 from superset.sql_parse import ParsedQuery
-from superset.sql_validators.base import BaseSQLValidator, SQLValidationAnnotation
+from superset.sql_validators.base import (
+    BaseSQLValidator,
+    SQLValidationAnnotation,
+    SQLValidationRequest,
+    SQLValidationSupersededError,
+)
 from superset.utils.core import QuerySource
+from superset.utils.hashing import md5_sha_from_dict
 
 MAX_ERROR_ROWS = 10
 
@@ -45,7 +52,12 @@ class PrestoDBSQLValidator(BaseSQLValidator):
 
     @classmethod
     def validate_statement(
-        cls, statement: str, database: Database, cursor: Any, user_name: str
+        cls,
+        statement: str,
+        database: Database,
+        cursor: Any,
+        user_name: str,
+        validation_request: Optional[SQLValidationRequest] = None,
     ) -> Optional[SQLValidationAnnotation]:
         # pylint: disable=too-many-locals
         db_engine_spec = database.db_engine_spec
@@ -71,6 +83,9 @@ class PrestoDBSQLValidator(BaseSQLValidator):
             db_engine_spec.execute(cursor, sql)
             polled = cursor.poll()
             while polled:
+                if validation_request and validation_request.is_superseded():
+                    cursor.cancel()
+                    validation_request.check()
                 logger.info("polling presto for validation progress")
                 stats = polled.get("stats", {})
                 if stats:
@@ -136,13 +151,38 @@ class PrestoDBSQLValidator(BaseSQLValidator):
                 start_column=start_column,
                 end_column=end_column,
             )
+        except SQLValidationSupersededError:
+            raise
         except Exception as ex:
             logger.exception("Unexpected error running validation query: %s", str(ex))
             raise ex
 
     @classmethod
-    def validate(
-        cls, sql: str, schema: Optional[str], database: Database
+    def get_cache_key(
+        cls,
+        statement: str,
+        schema: Optional[str],
+        database: Database,
+        user_name: Optional[str],
+    ) -> str:
+        return "sql_validation_" + md5_sha_from_dict(
+            {
+                "validator": cls.name,
+                "database_id": database.id,
+                "schema": schema,
+                "statement": ParsedQuery(statement).stripped(),
+                # the tables visible to the effective user may differ
+                "user_name": user_name if database.impersonate_user else None,
+            }
+        )
+
+    @classmethod
+    def validate(  # pylint: disable=too-many-locals
+        cls,
+        sql: str,
+        schema: Optional[str],
+        database: Database,
+        validation_request: Optional[SQLValidationRequest] = None,
     ) -> List[SQLValidationAnnotation]:
         """
         Presto supports query-validation queries by running them with a
@@ -150,29 +190,74 @@ class PrestoDBSQLValidator(BaseSQLValidator):
 
         For example, "SELECT 1 FROM default.mytable" becomes "EXPLAIN (TYPE
         VALIDATE) SELECT 1 FROM default.mytable.
+
+        The results are cached by statement for SQLLAB_VALIDATION_CACHE_TIMEOUT
+        seconds, so only the statements that changed since the last validation
+        are sent to Presto.
         """
         user_name = g.user.username if g.user and hasattr(g.user, "username") else None
         parsed_query = ParsedQuery(sql)
         statements = parsed_query.get_statements()
+        cache_timeout = config["SQLLAB_VALIDATION_CACHE_TIMEOUT"]
 
-        logger.info("Validating %i statement(s)", len(statements))
-        engine = database.get_sqla_engine(
-            schema=schema,
-            nullpool=True,
-            user_name=user_name,
-            source=QuerySource.SQL_LAB,
+        keys = [
+            cls.get_cache_key(statement, schema, database, user_name)
+            if cache_timeout
+            else str(i)
+            for i, statement in enumerate(statements)
+        ]
+        results: Dict[str, Optional[SQLValidationAnnotation]] = {}
+        if cache_timeout and keys:
+            for key, value in zip(keys, cache_manager.cache.get_many(*keys)):
+                if value is not None:
+                    results[key] = (
+                        SQLValidationAnnotation(**value["annotation"])
+                        if value["annotation"]
+                        else None
+                    )
+        pending = {
+            key: statement
+            for key, statement in zip(keys, statements)
+            if key not in results
+        }
+
+        logger.info(
+            "Validating %i statement(s), %i not cached", len(statements), len(pending)
         )
-        # Sharing a single connection and cursor across the
-        # execution of all statements (if many)
-        annotations: List[SQLValidationAnnotation] = []
-        with closing(engine.raw_connection()) as conn:
-            cursor = conn.cursor()
-            for statement in parsed_query.get_statements():
-                annotation = cls.validate_statement(
-                    statement, database, cursor, user_name
-                )
-                if annotation:
-                    annotations.append(annotation)
+        if pending:
+            engine = database.get_sqla_engine(
+                schema=schema,
+                nullpool=True,
+                user_name=user_name,
+                source=QuerySource.SQL_LAB,
+            )
+            # Sharing a single connection and cursor across the
+            # execution of all statements (if many)
+            with closing(engine.raw_connection()) as conn:
+                cursor = conn.cursor()
+                for key, statement in pending.items():
+                    if validation_request:
+                        validation_request.check()
+                    annotation = cls.validate_statement(
+                        statement, database, cursor, user_name, validation_request
+                    )
+                    results[key] = annotation
+                    if cache_timeout:
+                        cache_manager.cache.set(
+                            key,
+                            {
+                                "annotation": annotation.to_dict()
+                                if annotation
+                                else None
+                            },
+                            timeout=cache_timeout,
+                        )
+
+        annotations = [
+            annotation
+            for annotation in (results[key] for key in keys)
+            if annotation is not None
+        ]
         logger.debug("Validation found %i error(s)", len(annotations))
 
         return annotations
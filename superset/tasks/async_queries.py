@@ -75,6 +75,57 @@ def load_chart_data_into_cache(
         raise exc
 
 
+@celery_app.task(name="refresh_chart_data_cache", soft_time_limit=query_timeout)
+def refresh_chart_data_cache(
+    form_data: Dict[str, Any], user_id: Optional[int] = None
+) -> None:
+    """
+    Refresh the stale cached data of a query context, served meanwhile during its
+    cache grace period.
+    """
+    from superset.charts.commands.data import ChartDataCommand
+
+    try:
+        ensure_user_is_set(user_id)
+        command = ChartDataCommand()
+        command.set_query_context({**form_data, "force": True})
+        command.run()
+    except SoftTimeLimitExceeded as ex:
+        logger.warning("A timeout occurred while refreshing chart data, error: %s", ex)
+        raise ex
+    except Exception as ex:  # pylint: disable=broad-except
+        logger.warning("Could not refresh chart data cache: %s", str(ex))
+
+
+@celery_app.task(name="refresh_explore_json_cache", soft_time_limit=query_timeout)
+def refresh_explore_json_cache(
+    datasource_type: str,
+    datasource_id: int,
+    form_data: Dict[str, Any],
+    user_id: Optional[int] = None,
+) -> None:
+    """
+    Refresh the stale cached data of a viz, served meanwhile during its cache
+    grace period.
+    """
+    try:
+        ensure_user_is_set(user_id)
+        viz_obj = get_viz(
+            datasource_type=datasource_type,
+            datasource_id=datasource_id,
+            form_data=form_data,
+            force=True,
+        )
+        viz_obj.get_payload()
+    except SoftTimeLimitExceeded as ex:
+        logger.warning(
+            "A timeout occurred while refreshing explore json, error: %s", ex
+        )
+        raise ex
+    except Exception as ex:  # pylint: disable=broad-except
+        logger.warning("Could not refresh explore json cache: %s", str(ex))
+
+
 @celery_app.task(name="load_explore_json_into_cache", soft_time_limit=query_timeout)
 def load_explore_json_into_cache(  # pylint: disable=too-many-locals
     job_metadata: Dict[str, Any],
@@ -0,0 +1,77 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from typing import Any, Dict, List, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+
+from superset.result_set import column_to_arrow
+
+ARROW_STREAM_MIMETYPE = "application/vnd.apache.arrow.stream"
+
+
+def df_to_arrow_table(df: pd.DataFrame) -> pa.Table:
+    """
+    Convert a DataFrame to an Arrow table.
+
+    A non-default index is kept as regular columns, the same way it's included in
+    CSV exports. Columns that Arrow can't convert natively are stringified.
+    """
+    if not isinstance(df.index, pd.RangeIndex):
+        df = df.reset_index()
+
+    arrays: List[pa.Array] = []
+    for _, series in df.items():
+        try:
+            arrays.append(pa.Array.from_pandas(series))
+        except (
+            pa.lib.ArrowInvalid,
+            pa.lib.ArrowTypeError,
+            pa.lib.ArrowNotImplementedError,
+            TypeError,
+        ):
+            arrays.append(column_to_arrow(series.tolist()))
+    return pa.Table.from_arrays(arrays, names=[str(column) for column in df.columns])
+
+
+def df_to_arrow_stream(
+    df: Optional[Union[pd.DataFrame, List[Dict[str, Any]]]],
+    metadata: Optional[Dict[str, str]] = None,
+) -> bytes:
+    """
+    Serialize a DataFrame in the Arrow IPC streaming format.
+
+    :param df: the DataFrame, or its records; when missing an empty stream is
+        written
+    :param metadata: key/value pairs added to the metadata of the stream schema
+    :returns: the serialized stream
+    """
+    if df is None:
+        table = pa.Table.from_arrays([], names=[])
+    else:
+        if not isinstance(df, pd.DataFrame):
+            # eg, the empty data of a query that timed out
+            df = pd.DataFrame.from_records(df)
+        table = df_to_arrow_table(df)
+    if metadata:
+        table = table.replace_schema_metadata(metadata)
+
+    sink = pa.BufferOutputStream()
+    writer = pa.ipc.new_stream(sink, table.schema)
+    writer.write_table(table)
+    writer.close()
+    return sink.getvalue().to_pybytes()
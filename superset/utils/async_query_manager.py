@@ -23,6 +23,8 @@ import jwt
 import redis
 from flask import Flask, g, request, Request, Response, session
 
+from superset.utils.core import json_int_dttm_ser
+
 logger = logging.getLogger(__name__)
 
 
@@ -209,3 +211,53 @@ class AsyncQueryManager:
         self._redis.xadd(  # type: ignore
             full_stream_name, event_data, "*", self._stream_limit_firehose
         )
+
+    def _query_updates_stream_name(self, user_id: int) -> str:
+        return f"{self._stream_prefix}sqllab-{user_id}"
+
+    def publish_query_updates(
+        self, user_id: int, updates: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Publish the changes of the SQL Lab queries of a user to their query feed.
+
+        :param user_id: the id of the user running the queries
+        :param updates: the changed fields of each query, along with its ids
+        """
+        stream_name = self._query_updates_stream_name(user_id)
+        pipeline = self._redis.pipeline()
+        for update in updates:
+            event_data = {"data": json.dumps(update, default=json_int_dttm_ser)}
+            pipeline.xadd(  # type: ignore
+                stream_name, event_data, "*", self._stream_limit
+            )
+        pipeline.execute()
+
+    def read_query_updates(
+        self, user_id: int, last_id: Optional[str], timeout: int
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Read the changes of the SQL Lab queries of a user, waiting for the next
+        ones if there are none yet.
+
+        :param user_id: the id of the user running the queries
+        :param last_id: the id of the last event read, when missing only the
+            events published from now on are read
+        :param timeout: how long to wait for events, in milliseconds, 0 to return
+            immediately
+        :returns: the events, and the id to read the next events from
+        """
+        stream_name = self._query_updates_stream_name(user_id)
+        if not last_id:
+            latest = self._redis.xrevrange(  # type: ignore
+                stream_name, count=1
+            )
+            last_id = latest[0][0] if latest else "0-0"
+        # Redis blocks forever with a timeout of 0
+        results = self._redis.xread(  # type: ignore
+            {stream_name: last_id},
+            count=self.MAX_EVENT_COUNT,
+            block=timeout or None,
+        )
+        events = [parse_event(event) for _, stream in results or [] for event in stream]
+        return events, events[-1]["id"] if events else last_id
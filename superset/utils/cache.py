@@ -17,19 +17,29 @@
 from __future__ import annotations
 
 import logging
+import time
 from datetime import datetime, timedelta
 from functools import wraps
-from typing import Any, Callable, Dict, Optional, TYPE_CHECKING, Union
+from typing import Any, Callable, Dict, Optional, Tuple, TYPE_CHECKING, Union
+from uuid import uuid4
 
+import pandas as pd
 from flask import current_app as app, request
 from flask_caching import Cache
 from flask_caching.backends import NullCache
 from werkzeug.wrappers.etag import ETagResponseMixin
 
 from superset import db
+from superset.exceptions import CacheLoadError
 from superset.extensions import cache_manager
 from superset.models.cache import CacheKey
+from superset.utils.cache_serializers import (
+    DataFrameSerializer,
+    SerializedDataFrame,
+    SERIALIZERS,
+)
 from superset.utils.core import json_int_dttm_ser
+from superset.utils.dates import now_as_float
 from superset.utils.hashing import md5_sha_from_dict
 
 if TYPE_CHECKING:
@@ -45,17 +55,18 @@ def generate_cache_key(values_dict: Dict[str, Any], key_prefix: str = "") -> str
     return f"{key_prefix}{hash_str}"
 
 
-def set_and_log_cache(
+def set_and_log_cache(  # pylint: disable=too-many-arguments
     cache_instance: Cache,
     cache_key: str,
     cache_value: Dict[str, Any],
     cache_timeout: Optional[int] = None,
     datasource_uid: Optional[str] = None,
+    grace_period: int = 0,
 ) -> None:
     if isinstance(cache_instance.cache, NullCache):
         return
 
-    timeout = cache_timeout if cache_timeout else config["CACHE_DEFAULT_TIMEOUT"]
+    timeout = get_cache_timeout(cache_timeout, grace_period)
     try:
         dttm = datetime.utcnow().isoformat().split(".")[0]
         value = {**cache_value, "dttm": dttm}
@@ -76,6 +87,205 @@ def set_and_log_cache(
         logger.exception(ex)
 
 
+def get_cache_timeout(cache_timeout: Optional[int], grace_period: int = 0) -> int:
+    """
+    Return the duration a value is kept in the cache: its cache timeout, or the
+    default one, plus the grace period during which it's served while stale.
+    """
+    timeout = cache_timeout if cache_timeout else config["CACHE_DEFAULT_TIMEOUT"]
+    return timeout + grace_period if grace_period else timeout
+
+
+def is_cache_value_stale(
+    cache_value: Dict[str, Any], cache_timeout: Optional[int]
+) -> bool:
+    """
+    Whether a value set with ``set_and_log_cache`` is older than its cache
+    timeout, ie, it's only still in the cache because of its grace period.
+    """
+    timeout = cache_timeout if cache_timeout else config["CACHE_DEFAULT_TIMEOUT"]
+    try:
+        dttm = datetime.fromisoformat(cache_value["dttm"])
+    except (KeyError, TypeError, ValueError):
+        return False
+    return datetime.utcnow() - dttm > timedelta(seconds=timeout)
+
+
+def schedule_cache_refresh(cache_key: str, refresh: Callable[[], Any]) -> None:
+    """
+    Schedule the refresh of a stale value of the data cache, unless a refresh of
+    the same key was scheduled in the last ``DATA_CACHE_LOCK_TIMEOUT`` seconds.
+
+    :param cache_key: the cache key of the stale value
+    :param refresh: a callable that schedules the refresh, eg, a Celery task
+    """
+    lock = CacheLock(
+        cache_manager.data_cache,
+        f"{cache_key}__refresh",
+        config["DATA_CACHE_LOCK_TIMEOUT"],
+    )
+    try:
+        if lock.acquire():
+            refresh()
+            stats_logger.incr("stale_cache_refresh")
+    except Exception as ex:  # pylint: disable=broad-except
+        logger.warning("Could not refresh cache key %s: %s", cache_key, str(ex))
+
+
+class CacheLock:
+    """
+    A lock stored in a cache backend, shared by all the processes using it.
+    """
+
+    def __init__(self, cache_instance: Cache, cache_key: str, timeout: int) -> None:
+        self.cache_instance = cache_instance
+        self.key = f"{cache_key}__lock"
+        self.token = uuid4().hex
+        self.timeout = timeout
+
+    def acquire(self) -> bool:
+        # ``add`` only sets the key if it doesn't exist, atomically on backends
+        # like Redis and Memcached
+        return bool(self.cache_instance.add(self.key, self.token, self.timeout))
+
+    def release(self) -> None:
+        try:
+            if self.cache_instance.get(self.key) == self.token:
+                self.cache_instance.delete(self.key)
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.warning("Could not release cache lock %s: %s", self.key, str(ex))
+
+
+def get_or_lock_cache(
+    cache_instance: Cache, cache_key: str, coalesce: bool = True
+) -> Tuple[Optional[Dict[str, Any]], Optional[CacheLock]]:
+    """
+    Get a value from the cache, coalescing concurrent cache misses when
+    ``DATA_CACHE_COALESCE_MISSES`` is enabled.
+
+    On a cache miss only the first request acquires a lock for the key, and is
+    expected to compute the value, cache it and release the lock. The other
+    requests wait until the value is cached, the lock is released (in which case
+    one of them acquires it) or ``DATA_CACHE_LOCK_TIMEOUT`` seconds have passed.
+
+    :param cache_instance: the cache
+    :param cache_key: the cache key
+    :param coalesce: whether to coalesce the cache miss
+    :returns: the cached value, and the lock that was acquired if any
+    """
+    cache_value = cache_instance.get(cache_key)
+    if (
+        cache_value
+        or not coalesce
+        or not config["DATA_CACHE_COALESCE_MISSES"]
+        or isinstance(cache_instance.cache, NullCache)
+    ):
+        return cache_value, None
+
+    timeout = config["DATA_CACHE_LOCK_TIMEOUT"]
+    lock = CacheLock(cache_instance, cache_key, timeout)
+    deadline = time.time() + timeout
+    interval = 0.05
+    waited = False
+    try:
+        while not lock.acquire():
+            if time.time() >= deadline:
+                logger.warning("Timed out waiting for cache key %s", cache_key)
+                stats_logger.incr("coalesced_cache_miss_timeout")
+                return None, None
+            waited = True
+            time.sleep(interval)
+            interval = min(interval * 2, 1)
+            cache_value = cache_instance.get(cache_key)
+            if cache_value:
+                stats_logger.incr("coalesced_cache_miss")
+                return cache_value, None
+    except Exception as ex:  # pylint: disable=broad-except
+        logger.warning("Could not acquire cache lock %s: %s", lock.key, str(ex))
+        return None, None
+
+    if waited:
+        # the lock was released without a value being cached, eg, the query failed
+        cache_value = cache_instance.get(cache_key)
+        if cache_value:
+            lock.release()
+            return cache_value, None
+    return None, lock
+
+
+def serialize_df(
+    df: pd.DataFrame,
+    cache_key: str,
+    cache_timeout: Optional[int] = None,
+    grace_period: int = 0,
+) -> Any:
+    """
+    Serialize a DataFrame to be stored in the data cache, using the serializer
+    set in ``DATA_CACHE_SERIALIZER``. A serialized payload is stored in the data
+    cache under its own key, derived from the key of the cache entry, and the
+    returned value only references it. The DataFrame is stored as is if it can't
+    be serialized.
+
+    :param df: the DataFrame to serialize
+    :param cache_key: the key of the cache entry holding the DataFrame
+    :param cache_timeout: the cache timeout of the entry
+    :param grace_period: the grace period of the entry
+    :returns: the value to store in the cache entry
+    """
+    serializer: DataFrameSerializer = config["DATA_CACHE_SERIALIZER"]
+    start_ts = now_as_float()
+    try:
+        value = serializer.dumps(df)
+    except Exception as ex:  # pylint: disable=broad-except
+        logger.warning(
+            "Could not serialize DataFrame with the %s serializer: %s",
+            serializer.name,
+            str(ex),
+        )
+        return df
+    stats_logger.timing("data_cache.serialize", now_as_float() - start_ts)
+    if not isinstance(value, SerializedDataFrame):
+        return value
+
+    payload_key = f"{cache_key}-df"
+    timeout = get_cache_timeout(cache_timeout, grace_period)
+    try:
+        cache_manager.data_cache.set(payload_key, value.payload, timeout=timeout)
+    except Exception as ex:  # pylint: disable=broad-except
+        logger.warning("Could not cache key %s: %s", payload_key, str(ex))
+        return df
+    stats_logger.gauge("data_cache.bytes_stored", value.size)
+    return SerializedDataFrame(value.serializer, key=payload_key, size=value.size)
+
+
+def deserialize_df(value: Any) -> pd.DataFrame:
+    """
+    Deserialize a DataFrame loaded from the data cache, with the serializer it
+    was stored with.
+
+    :raises CacheLoadError: If the DataFrame can't be deserialized
+    """
+    if not isinstance(value, SerializedDataFrame):
+        return value
+
+    if value.key:
+        payload = cache_manager.data_cache.get(value.key)
+        if payload is None:
+            raise CacheLoadError(f"The DataFrame payload {value.key} is not cached")
+        value = SerializedDataFrame(value.serializer, payload=payload, size=value.size)
+
+    serializer: DataFrameSerializer = config["DATA_CACHE_SERIALIZER"]
+    if serializer.name != value.serializer:
+        serializer = SERIALIZERS[value.serializer]()
+    start_ts = now_as_float()
+    try:
+        df = serializer.loads(value)
+    except Exception as ex:  # pylint: disable=broad-except
+        raise CacheLoadError(f"Could not deserialize DataFrame: {ex}") from ex
+    stats_logger.timing("data_cache.deserialize", now_as_float() - start_ts)
+    return df
+
+
 # If a user sets `max_age` to 0, for long the browser should cache the
 # resource? Flask-Caching will cache forever, but for the HTTP header we need
 # to specify a "far future" date.
@@ -0,0 +1,134 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Serializers for the DataFrames stored in the data cache.
+
+By default the cache backend pickles the DataFrames along with the rest of the
+cache value. The Arrow and Parquet serializers store them as compressed binary
+payloads instead, wrapped in a ``SerializedDataFrame`` that records how the
+payload was written, so entries written with a different serializer can still be
+read back.
+
+pyarrow is imported when a DataFrame is serialized, since this module is
+imported by the default configuration.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Type
+
+import pandas as pd
+
+
+@dataclass
+class SerializedDataFrame:
+    """
+    A DataFrame serialized by a ``DataFrameSerializer``. In the data cache the
+    payload is stored under its own key, and the cache value only keeps this
+    metadata with the key of the payload.
+    """
+
+    serializer: str
+    payload: Optional[bytes] = None
+    key: Optional[str] = None
+    size: int = 0
+
+
+class DataFrameSerializer:
+    """
+    Stores the DataFrame as is, leaving its serialization to the cache backend.
+    """
+
+    name: str = "pickle"
+
+    def dumps(self, df: pd.DataFrame) -> Any:  # pylint: disable=no-self-use
+        """
+        Serialize a DataFrame.
+
+        :param df: the DataFrame to serialize
+        :returns: the value to store in the cache
+        """
+        return df
+
+    def loads(self, value: Any) -> pd.DataFrame:  # pylint: disable=no-self-use
+        """
+        Deserialize a value returned by ``dumps``.
+        """
+        return value
+
+
+class ArrowDataFrameSerializer(DataFrameSerializer):
+    """
+    Stores the DataFrame in the Arrow IPC format.
+    """
+
+    name = "arrow"
+
+    def __init__(self, compression: Optional[str] = "zstd") -> None:
+        self.compression = compression
+
+    def dumps(self, df: pd.DataFrame) -> Any:
+        import pyarrow as pa  # pylint: disable=import-outside-toplevel
+
+        table = pa.Table.from_pandas(df)
+        sink = pa.BufferOutputStream()
+        options = pa.ipc.IpcWriteOptions(compression=self.compression)
+        with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+        payload = sink.getvalue().to_pybytes()
+        return SerializedDataFrame(self.name, payload=payload, size=len(payload))
+
+    def loads(self, value: Any) -> pd.DataFrame:
+        import pyarrow as pa  # pylint: disable=import-outside-toplevel
+
+        return pa.ipc.open_stream(value.payload).read_all().to_pandas()
+
+
+class ParquetDataFrameSerializer(DataFrameSerializer):
+    """
+    Stores the DataFrame in the Parquet format, which is usually smaller than
+    Arrow at the cost of slower serialization.
+    """
+
+    name = "parquet"
+
+    def __init__(self, compression: Optional[str] = "zstd") -> None:
+        self.compression = compression
+
+    def dumps(self, df: pd.DataFrame) -> Any:
+        # pylint: disable=import-outside-toplevel
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        sink = pa.BufferOutputStream()
+        pq.write_table(
+            pa.Table.from_pandas(df), sink, compression=self.compression or "none"
+        )
+        payload = sink.getvalue().to_pybytes()
+        return SerializedDataFrame(self.name, payload=payload, size=len(payload))
+
+    def loads(self, value: Any) -> pd.DataFrame:
+        # pylint: disable=import-outside-toplevel
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        return pq.read_table(pa.BufferReader(value.payload)).to_pandas()
+
+
+SERIALIZERS: Dict[str, Type[DataFrameSerializer]] = {
+    DataFrameSerializer.name: DataFrameSerializer,
+    ArrowDataFrameSerializer.name: ArrowDataFrameSerializer,
+    ParquetDataFrameSerializer.name: ParquetDataFrameSerializer,
+}
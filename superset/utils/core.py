@@ -163,6 +163,7 @@ class ChartDataResultFormat(str, Enum):
     Chart data response format
     """
 
+    ARROW = "arrow"
     CSV = "csv"
     JSON = "json"
 
@@ -709,6 +710,10 @@ class SigalrmTimeout:
     def __init__(self, seconds: int = 1, error_message: str = "Timeout") -> None:
         self.seconds = seconds
         self.error_message = error_message
+        # an enclosing timeout is put back when leaving the block
+        self.previous_handler: Any = None
+        self.previous_alarm = 0
+        self.started = 0.0
 
     def handle_timeout(  # pylint: disable=unused-argument
         self, signum: int, frame: Any
@@ -724,8 +729,11 @@ class SigalrmTimeout:
     def __enter__(self) -> None:
         try:
             if threading.current_thread() == threading.main_thread():
-                signal.signal(signal.SIGALRM, self.handle_timeout)
-                signal.alarm(self.seconds)
+                self.previous_handler = signal.signal(
+                    signal.SIGALRM, self.handle_timeout
+                )
+                self.previous_alarm = signal.alarm(self.seconds)
+                self.started = default_timer()
         except ValueError as ex:
             logger.warning("timeout can't be used in the current context")
             logger.exception(ex)
@@ -735,6 +743,12 @@ class SigalrmTimeout:
     ) -> None:
         try:
             signal.alarm(0)
+            if self.previous_handler is not None:
+                signal.signal(signal.SIGALRM, self.previous_handler)
+            if self.previous_alarm:
+                elapsed = default_timer() - self.started
+                # an enclosing timeout that expired meanwhile fires right away
+                signal.alarm(max(1, round(self.previous_alarm - elapsed)))
         except ValueError as ex:
             logger.warning("timeout can't be used in the current context")
             logger.exception(ex)
@@ -1301,6 +1315,14 @@ def get_username() -> Optional[str]:
         return None
 
 
+def get_user_id() -> Optional[int]:
+    """Get the user id if within the flask context, otherwise return None"""
+    try:
+        return g.user.get_id()
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+
 def parse_ssl_cert(certificate: str) -> _Certificate:
     """
     Parses the contents of a certificate and returns a valid certificate object
@@ -16,7 +16,7 @@
 # under the License.
 import re
 import urllib.request
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, Optional
 from urllib.error import URLError
 
 import pandas as pd
@@ -69,6 +69,27 @@ def df_to_escaped_csv(df: pd.DataFrame, **kwargs: Any) -> Any:
     return df.to_csv(**kwargs)
 
 
+def df_to_escaped_csv_chunks(
+    dfs: Iterable[pd.DataFrame], chunk_size: int = 10000, **kwargs: Any
+) -> Iterator[str]:
+    """
+    Render DataFrames holding consecutive rows as a single escaped CSV, yielded
+    in chunks of at most `chunk_size` rows so that the whole CSV never has to be
+    held in memory. The header is only rendered for the first chunk.
+
+    :param dfs: the DataFrames, with the same columns
+    :param chunk_size: the maximum number of rows rendered at a time
+    :param kwargs: the arguments of `DataFrame.to_csv`
+    """
+    header = kwargs.pop("header", True)
+    for df in dfs:
+        for start in range(0, max(len(df.index), 1), chunk_size):
+            yield df_to_escaped_csv(
+                df.iloc[start : start + chunk_size], header=header, **kwargs
+            )
+            header = False
+
+
 def get_chart_csv_data(
     chart_url: str, auth_cookies: Optional[Dict[str, str]] = None
 ) -> Optional[bytes]:
@@ -0,0 +1,119 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List, Optional, Tuple
+
+from flask import Flask
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class EngineRegistry:
+    """
+    A bounded LRU registry of SQLAlchemy engines.
+
+    Engines are reused across requests so that their connection pools can be
+    shared, instead of creating a new engine (and a new connection) every time a
+    query runs. When the registry is full the least recently used engine is
+    evicted and disposed, closing the connections in its pool. An engine is also
+    replaced, and disposed, when the fingerprint of its settings changes.
+    """
+
+    def __init__(self, max_size: int = 100) -> None:
+        self._max_size = max_size
+        self._engines: "OrderedDict[Hashable, Tuple[Optional[str], Engine]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def init_app(self, app: Flask) -> None:
+        self._max_size = app.config["ENGINE_REGISTRY_MAX_SIZE"]
+
+    def get_engine(
+        self,
+        key: Hashable,
+        factory: Callable[[], Engine],
+        fingerprint: Optional[str] = None,
+    ) -> Engine:
+        """
+        Return the engine registered for ``key``, creating it with ``factory`` if
+        it's not in the registry or was created with other settings.
+
+        :param key: the key identifying the engine
+        :param factory: a callable that creates the engine
+        :param fingerprint: identifies the settings of the engine
+        :returns: the engine for the key
+        """
+        evicted: List[Engine] = []
+        with self._lock:
+            self._check_pid()
+            entry = self._engines.get(key)
+            if entry is not None:
+                if entry[0] == fingerprint:
+                    self._engines.move_to_end(key)
+                    return entry[1]
+                # the settings changed, the stale engine is no longer used
+                del self._engines[key]
+                evicted.append(entry[1])
+
+            engine = factory()
+            self._engines[key] = (fingerprint, engine)
+            while len(self._engines) > self._max_size:
+                _, (_, evicted_engine) = self._engines.popitem(last=False)
+                evicted.append(evicted_engine)
+
+        for evicted_engine in evicted:
+            self._dispose(evicted_engine)
+        return engine
+
+    def clear(self) -> None:
+        """
+        Remove and dispose all the engines in the registry.
+        """
+        with self._lock:
+            engines = [engine for _, engine in self._engines.values()]
+            self._engines.clear()
+
+        for engine in engines:
+            self._dispose(engine)
+
+    def __len__(self) -> int:
+        return len(self._engines)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._engines
+
+    def _check_pid(self) -> None:
+        # connections can't be shared with forked processes (eg, Celery workers);
+        # drop the engines inherited from the parent without disposing them, since
+        # that would close connections still in use by the parent process
+        pid = os.getpid()
+        if pid != self._pid:
+            self._engines.clear()
+            self._pid = pid
+
+    @staticmethod
+    def _dispose(engine: Engine) -> None:
+        try:
+            engine.dispose()
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.warning("Failed to dispose engine: %s", str(ex))
@@ -0,0 +1,208 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar
+
+from flask import _request_ctx_stack, current_app, Flask, g
+from sqlalchemy import inspect
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def load_attributes(obj: Any, *relationships: str) -> None:
+    """
+    Load the columns of an ORM object that aren't loaded, or were expired, and the
+    given relationships, so that worker threads sharing the object don't load
+    them lazily from the session of the request thread, which isn't thread safe.
+
+    :param obj: the ORM object, other objects are ignored
+    :param relationships: the names of the relationships to load
+    """
+    state = inspect(obj, raiseerr=False)
+    if state is None or not hasattr(state, "mapper"):
+        return
+    # the expired columns are loaded all at once when one of them is accessed
+    for key in state.mapper.column_attrs.keys():
+        if key in state.unloaded:
+            getattr(obj, key)
+    for key in relationships:
+        if key in state.mapper.relationships:
+            getattr(obj, key)
+
+
+class QueryExecutor:
+    """
+    Run independent queries concurrently, using one thread pool per database.
+
+    Each callable runs in a copy of the current request context, with the same
+    ``g.user``, so that security checks and impersonation work as they do in the
+    request thread. Worker threads have their own database session, which is
+    removed once the callable is done. Callables submitted from a worker thread run
+    inline, which prevents nested submissions from waiting on a saturated pool.
+    """
+
+    def __init__(self) -> None:
+        self._max_concurrency = 1
+        self._pool_size = 5
+        self._timeout = 60
+        self._executors: Dict[Any, ThreadPoolExecutor] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def init_app(self, app: Flask) -> None:
+        self._max_concurrency = app.config["CHART_DATA_MAX_CONCURRENT_QUERIES"]
+        self._pool_size = app.config["CHART_DATA_QUERY_POOL_SIZE"]
+        self._timeout = app.config["CHART_DATA_CONCURRENT_QUERIES_TIMEOUT"]
+
+    @property
+    def in_worker(self) -> bool:
+        return getattr(self._local, "in_worker", False)
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_concurrency > 1 and not self.in_worker
+
+    def get_executor(self, database: Any) -> ThreadPoolExecutor:
+        """
+        Return the thread pool for a database, creating it if needed. The size of
+        the pool can be set per database with ``max_concurrent_queries`` in its
+        ``extra``.
+        """
+        key = getattr(database, "id", None)
+        with self._lock:
+            executor = self._executors.get(key)
+            if executor is None:
+                pool_size = self._pool_size
+                if database is not None:
+                    pool_size = database.get_extra().get(
+                        "max_concurrent_queries", pool_size
+                    )
+                executor = ThreadPoolExecutor(
+                    max_workers=pool_size, thread_name_prefix=f"query_executor_{key}",
+                )
+                self._executors[key] = executor
+        return executor
+
+    def run(
+        self,
+        database: Any,
+        funcs: Sequence[Callable[[], T]],
+        on_timeout: Callable[[int], T],
+    ) -> List[T]:
+        """
+        Run the callables and return their results, in order.
+
+        At most ``CHART_DATA_MAX_CONCURRENT_QUERIES`` callables run at the same
+        time, and all of them have to complete within
+        ``CHART_DATA_CONCURRENT_QUERIES_TIMEOUT`` seconds; ``on_timeout`` is called
+        with the index of each callable that didn't complete in time to build its
+        result instead. Callables that didn't start are not run, but the ones that
+        are running can't be interrupted and run to completion in the background.
+        If a callable raises an exception it's re-raised once all the callables are
+        done.
+
+        :param database: the database the queries run against
+        :param funcs: the callables to run
+        :param on_timeout: builds the result of a callable that timed out
+        :returns: the results of the callables
+        """
+        if not self.enabled or len(funcs) < 2:
+            return [func() for func in funcs]
+
+        executor = self.get_executor(database)
+        deadline = time.time() + self._timeout
+        pending = list(enumerate(funcs))
+        running: Dict["Future[T]", int] = {}
+        futures: Dict[int, "Future[T]"] = {}
+        future: Optional["Future[T]"]
+        timed_out = False
+        while pending or running:
+            while pending and len(running) < self._max_concurrency:
+                index, func = pending.pop(0)
+                future = executor.submit(self._in_context(func))
+                running[future] = index
+                futures[index] = future
+
+            done, _ = wait(
+                list(running),
+                timeout=max(deadline - time.time(), 0),
+                return_when=FIRST_COMPLETED,
+            )
+            if not done:
+                timed_out = True
+                break
+            for future in done:
+                del running[future]
+
+        if timed_out:
+            # queries waiting for a thread of the pool can still be cancelled
+            still_running = [future for future in running if not future.cancel()]
+            logger.warning(
+                "%i queries did not complete within %i seconds, %i of them keep "
+                "running in the background",
+                len(pending) + len(running),
+                self._timeout,
+                len(still_running),
+            )
+
+        results: List[T] = []
+        error: Optional[BaseException] = None
+        for index in range(len(funcs)):
+            future = futures.get(index)
+            if future is None or not future.done() or future.cancelled():
+                if error is None:
+                    results.append(on_timeout(index))
+                continue
+            exception = future.exception()
+            if exception is not None:
+                error = error or exception
+                continue
+            results.append(future.result())
+
+        if error is not None:
+            raise error
+        return results
+
+    def _in_context(self, func: Callable[[], T]) -> Callable[[], T]:
+        # pylint: disable=import-outside-toplevel
+        from superset.extensions import db
+
+        app = current_app._get_current_object()  # pylint: disable=protected-access
+        user = getattr(g, "user", None)
+        request_ctx = _request_ctx_stack.top
+
+        def wrapper() -> T:
+            ctx = request_ctx.copy() if request_ctx else app.app_context()
+            if request_ctx and hasattr(request_ctx, "user"):
+                ctx.user = request_ctx.user
+            with ctx:
+                g.user = user
+                self._local.in_worker = True
+                try:
+                    return func()
+                finally:
+                    self._local.in_worker = False
+                    # the session of the worker thread would otherwise be reused,
+                    # with its stale objects, by the next callable of the thread
+                    db.session.remove()
+
+        return wrapper
@@ -0,0 +1,210 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+A channel for the progress and cancellation of running SQL Lab queries.
+
+The workers running the queries publish their progress to a cache shared with the
+web servers (typically Redis), and read the cancellation flags set there when
+queries are stopped, so that polling a running query doesn't hit the metadata
+database on every tick. The progress is still persisted on the query, but at most
+every ``SQLLAB_PROGRESS_FLUSH_INTERVAL`` seconds.
+
+When no cache is configured the metadata database is the channel, as before.
+"""
+import logging
+import time
+from typing import Any, Dict, Iterable, Optional, TYPE_CHECKING
+
+from flask import Flask
+from flask_caching import Cache
+from sqlalchemy.orm import Session
+
+from superset.utils.core import QueryStatus
+
+if TYPE_CHECKING:
+    from superset.models.sql_lab import Query
+
+logger = logging.getLogger(__name__)
+
+NULL_CACHE_TYPES = {"null", "NullCache"}
+
+
+class QueryProgressManager:
+    def __init__(self) -> None:
+        super().__init__()
+
+        self._cache = Cache()
+        self._enabled = False
+        self.flush_interval: float = 0
+
+    def init_app(self, app: Flask) -> None:
+        config = app.config["SQLLAB_PROGRESS_CACHE_CONFIG"]
+        self._cache.init_app(
+            app,
+            {
+                "CACHE_DEFAULT_TIMEOUT": app.config["SQLLAB_ASYNC_TIME_LIMIT_SEC"],
+                **config,
+            },
+        )
+        self._enabled = config.get("CACHE_TYPE", "null") not in NULL_CACHE_TYPES
+        self.flush_interval = app.config["SQLLAB_PROGRESS_FLUSH_INTERVAL"]
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @staticmethod
+    def _progress_key(query_id: int) -> str:
+        return f"sqllab_progress_{query_id}"
+
+    @staticmethod
+    def _cancel_key(query_id: int) -> str:
+        return f"sqllab_cancel_{query_id}"
+
+    def set_progress(self, query_id: int, progress: Dict[str, Any]) -> None:
+        if not self._enabled:
+            return
+        try:
+            self._cache.set(self._progress_key(query_id), progress)
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.warning("Could not publish query progress: %s", str(ex))
+
+    def get_progress(self, query_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get the latest progress published for the queries.
+
+        :param query_ids: the ids of the queries
+        :returns: the progress of the queries that published any, by query id
+        """
+        query_ids = list(query_ids)
+        if not self._enabled or not query_ids:
+            return {}
+        try:
+            values = self._cache.get_many(
+                *[self._progress_key(query_id) for query_id in query_ids]
+            )
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.warning("Could not read query progress: %s", str(ex))
+            return {}
+        return {
+            query_id: value
+            for query_id, value in zip(query_ids, values)
+            if value is not None
+        }
+
+    def cancel(self, query_id: int) -> None:
+        """
+        Flag a query as stopped, for the worker running it to cancel it.
+        """
+        if not self._enabled:
+            return
+        try:
+            self._cache.set(self._cancel_key(query_id), True)
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.warning("Could not publish query cancellation: %s", str(ex))
+
+    def is_cancelled(self, query_id: int) -> bool:
+        if not self._enabled:
+            return False
+        try:
+            return bool(self._cache.get(self._cancel_key(query_id)))
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.warning("Could not read query cancellation: %s", str(ex))
+            return False
+
+    def is_stopped(self, query: "Query", session: Session) -> bool:
+        """
+        Check whether a query was stopped, reading the channel when there is one
+        and the metadata database otherwise.
+        """
+        if self._enabled:
+            return self.is_cancelled(query.id)
+        session.refresh(query)
+        return query.status == QueryStatus.STOPPED
+
+    def reporter(self, query: "Query", session: Session) -> "QueryProgressReporter":
+        return QueryProgressReporter(self, query, session)
+
+
+class QueryProgressReporter:
+    """
+    Reports the progress of a running query from the cursor polling loop of its
+    engine spec.
+
+    Updates are published to the channel right away and persisted on the query
+    at most every ``flush_interval`` seconds. Cancellation is read from the
+    channel on every poll, and from the metadata database when the updates are
+    persisted, which is on every poll when there's no channel.
+    """
+
+    def __init__(
+        self, manager: QueryProgressManager, query: "Query", session: Session
+    ) -> None:
+        self.manager = manager
+        self.query = query
+        self.session = session
+        self._dirty = False
+        self._last_flush = time.monotonic()
+
+    def _flush_due(self) -> bool:
+        return (
+            not self.manager.enabled
+            or time.monotonic() - self._last_flush >= self.manager.flush_interval
+        )
+
+    def update(
+        self, progress: Optional[float] = None, tracking_url: Optional[str] = None
+    ) -> None:
+        changed = False
+        if progress is not None and progress > (self.query.progress or 0):
+            self.query.progress = progress
+            changed = True
+        if tracking_url and tracking_url != self.query.tracking_url:
+            self.query.tracking_url = tracking_url
+            changed = True
+        if not changed:
+            return
+
+        self._dirty = True
+        self.manager.set_progress(
+            self.query.id,
+            {"progress": self.query.progress, "tracking_url": self.query.tracking_url},
+        )
+        if self._flush_due():
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Persist the pending updates on the query.
+        """
+        if self._dirty:
+            self.session.commit()
+            self._dirty = False
+        self._last_flush = time.monotonic()
+
+    def is_stopped(self, statuses: Iterable[str] = (QueryStatus.STOPPED,)) -> bool:
+        """
+        Check whether the query was stopped, or reached any of the statuses.
+        """
+        if self.manager.is_cancelled(self.query.id):
+            return True
+        if not self._flush_due():
+            return False
+
+        self.flush()
+        self.session.refresh(self.query)
+        return self.query.status in statuses
@@ -0,0 +1,111 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Chunked storage of SQL Lab results in the results backend.
+
+The rows of a result set are split into chunks of a fixed number of rows, each
+stored under its own key as a compressed Arrow IPC stream. The results payload,
+stored under the results key, lists the chunks along with their row ranges, so
+that a window of rows can be read without fetching the other chunks.
+"""
+import logging
+from typing import Any, Dict, Iterator, List, Optional
+
+import pyarrow as pa
+from cachelib.base import BaseCache
+
+from superset.exceptions import SerializationError
+
+logger = logging.getLogger(__name__)
+
+CHUNK_COMPRESSION = "zstd"
+
+
+def write_result_chunks(
+    results_backend: BaseCache,
+    key: str,
+    table: pa.Table,
+    chunk_size: int,
+    cache_timeout: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Store the rows of a table in chunks.
+
+    :param results_backend: the results backend
+    :param key: the results key, the chunk keys are derived from it
+    :param table: the rows to store
+    :param chunk_size: the number of rows of each chunk
+    :param cache_timeout: the timeout of the chunks
+    :returns: the chunks, with their key, first row and number of rows
+    """
+    chunks = []
+    options = pa.ipc.IpcWriteOptions(compression=CHUNK_COMPRESSION)
+    # an empty table is stored as a single empty chunk, to keep its schema
+    for index, offset in enumerate(range(0, table.num_rows or 1, chunk_size)):
+        chunk = table.slice(offset, chunk_size)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+            writer.write_table(chunk)
+        chunk_key = f"{key}-{index}"
+        results_backend.set(chunk_key, sink.getvalue().to_pybytes(), cache_timeout)
+        chunks.append({"key": chunk_key, "offset": offset, "rows": chunk.num_rows})
+    return chunks
+
+
+def iter_result_chunks(
+    results_backend: BaseCache,
+    chunks: List[Dict[str, Any]],
+    rows: Optional[int] = None,
+) -> Iterator[pa.Table]:
+    """
+    Read the chunks of a result set, one at a time.
+
+    :param results_backend: the results backend
+    :param chunks: the chunks returned by ``write_result_chunks``
+    :param rows: the number of leading rows to read, all of them when missing
+    :raises SerializationError: if a chunk is missing or can't be deserialized
+    """
+    for chunk in chunks:
+        # the first chunk is always read, for the schema of the result set
+        if rows is not None and chunk["offset"] and chunk["offset"] >= rows:
+            return
+        blob = results_backend.get(chunk["key"])
+        if blob is None:
+            raise SerializationError(f"Missing results chunk {chunk['key']}")
+        try:
+            table = pa.ipc.open_stream(blob).read_all()
+        except pa.ArrowInvalid as ex:
+            raise SerializationError("Unable to deserialize results chunk") from ex
+        if rows is not None:
+            table = table.slice(0, rows - chunk["offset"])
+        yield table
+
+
+def read_result_chunks(
+    results_backend: BaseCache,
+    chunks: List[Dict[str, Any]],
+    rows: Optional[int] = None,
+) -> pa.Table:
+    """
+    Read the leading rows of a result set, fetching only the chunks holding them.
+
+    :param results_backend: the results backend
+    :param chunks: the chunks returned by ``write_result_chunks``
+    :param rows: the number of leading rows to read, all of them when missing
+    :raises SerializationError: if a chunk is missing or can't be deserialized
+    """
+    return pa.concat_tables(list(iter_result_chunks(results_backend, chunks, rows)))
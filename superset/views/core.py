@@ -25,9 +25,18 @@ from urllib import parse
 
 import backoff
 import humanize
-import pandas as pd
 import simplejson as json
-from flask import abort, flash, g, Markup, redirect, render_template, request, Response
+from flask import (
+    abort,
+    flash,
+    g,
+    Markup,
+    redirect,
+    render_template,
+    request,
+    Response,
+    stream_with_context,
+)
 from flask_appbuilder import expose
 from flask_appbuilder.models.sqla.interface import SQLAInterface
 from flask_appbuilder.security.decorators import (
@@ -90,7 +99,11 @@ from superset.exceptions import (
     SupersetTemplateParamsErrorException,
     SupersetTimeoutException,
 )
-from superset.extensions import async_query_manager, cache_manager
+from superset.extensions import (
+    async_query_manager,
+    cache_manager,
+    query_progress_manager,
+)
 from superset.jinja_context import get_template_processor
 from superset.models.core import Database, FavStar, Log
 from superset.models.dashboard import Dashboard
@@ -102,6 +115,10 @@ from superset.queries.dao import QueryDAO
 from superset.security.analytics_db_safety import check_sqlalchemy_uri
 from superset.sql_parse import CtasMethod, ParsedQuery, Table
 from superset.sql_validators import get_validator_by_name
+from superset.sql_validators.base import (
+    SQLValidationRequest,
+    SQLValidationSupersededError,
+)
 from superset.tasks.async_queries import load_explore_json_into_cache
 from superset.typing import FlaskResponse
 from superset.utils import core as utils, csv
@@ -129,6 +146,7 @@ from superset.views.base import (
 )
 from superset.views.utils import (
     _deserialize_results_payload,
+    _iter_results_payload_dfs,
     apply_display_max_row_limit,
     bootstrap_user_data,
     check_datasource_perms,
@@ -2270,10 +2288,29 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
                 status=403,
             ) from ex
 
+        rows = None
+        display_rows = None
+        if "rows" in request.args:
+            try:
+                rows = int(request.args["rows"])
+            except ValueError as ex:
+                raise SupersetErrorException(
+                    SupersetError(
+                        message=__(
+                            "The provided `rows` argument is not a valid integer."
+                        ),
+                        error_type=SupersetErrorType.INVALID_PAYLOAD_SCHEMA_ERROR,
+                        level=ErrorLevel.ERROR,
+                    ),
+                    status=400,
+                ) from ex
+            # only the displayed rows are read from chunked results
+            display_rows = rows or config["DISPLAY_MAX_ROW"]
+
         payload = utils.zlib_decompress(blob, decode=not results_backend_use_msgpack)
         try:
             obj = _deserialize_results_payload(
-                payload, query, cast(bool, results_backend_use_msgpack)
+                payload, query, cast(bool, results_backend_use_msgpack), display_rows,
             )
         except SerializationError as ex:
             raise SupersetErrorException(
@@ -2290,20 +2327,6 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
             ) from ex
 
         if "rows" in request.args:
-            try:
-                rows = int(request.args["rows"])
-            except ValueError as ex:
-                raise SupersetErrorException(
-                    SupersetError(
-                        message=__(
-                            "The provided `rows` argument is not a valid integer."
-                        ),
-                        error_type=SupersetErrorType.INVALID_PAYLOAD_SCHEMA_ERROR,
-                        level=ErrorLevel.ERROR,
-                    ),
-                    status=400,
-                ) from ex
-
             obj = apply_display_max_row_limit(obj, rows)
 
         return json_success(
@@ -2339,6 +2362,9 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
             )
             return self.json_response("OK")
 
+        # let the worker polling the query cancel it without waiting for the
+        # metadata database
+        query_progress_manager.cancel(query.id)
         if not sql_lab.cancel_query(query, g.user.username if g.user else None):
             raise SupersetCancelQueryException("Could not cancel query")
 
@@ -2392,11 +2418,18 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
                 )
             )
 
+        timeout = config["SQLLAB_VALIDATION_TIMEOUT"]
+        # a new validation from an editor cancels the previous one
+        sql_editor_id = request.form.get("sql_editor_id")
+        validation_request = (
+            SQLValidationRequest(g.user.get_id(), sql_editor_id, timeout)
+            if sql_editor_id
+            else None
+        )
         try:
-            timeout = config["SQLLAB_VALIDATION_TIMEOUT"]
             timeout_msg = f"The query exceeded the {timeout} seconds timeout."
             with utils.timeout(seconds=timeout, error_message=timeout_msg):
-                errors = validator.validate(sql, schema, mydb)
+                errors = validator.validate(sql, schema, mydb, validation_request)
             payload = json.dumps(
                 [err.to_dict() for err in errors],
                 default=utils.pessimistic_json_iso_dttm_ser,
@@ -2404,6 +2437,10 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
                 encoding=None,
             )
             return json_success(payload)
+        except SQLValidationSupersededError:
+            return json_error_response(
+                "The validation was superseded by a newer one", status=409
+            )
         except Exception as ex:  # pylint: disable=broad-except
             logger.exception(ex)
             msg = _(
@@ -2591,6 +2628,15 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
                 "Invalid limit of %i specified. Defaulting to max limit.", limit
             )
             limit = 0
+        sample_percent: Optional[float] = query_params.get("samplePercent")
+        if sample_percent is not None and not (
+            isinstance(sample_percent, (int, float)) and 0 < sample_percent <= 100
+        ):
+            logger.warning(
+                "Invalid sample percentage of %s specified. Not sampling.",
+                sample_percent,
+            )
+            sample_percent = None
         select_as_cta: bool = cast(bool, query_params.get("select_as_cta"))
         ctas_method: CtasMethod = cast(
             CtasMethod, query_params.get("ctas_method", CtasMethod.TABLE)
@@ -2659,6 +2705,8 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
             user_id=user_id,
             client_id=client_id_or_short_id,
         )
+        if sample_percent:
+            query.set_extra_json_key("sample_percent", sample_percent)
         try:
             session.add(query)
             session.flush()
@@ -2795,11 +2843,9 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
             payload = utils.zlib_decompress(
                 blob, decode=not results_backend_use_msgpack
             )
-            obj = _deserialize_results_payload(
+            dfs = _iter_results_payload_dfs(
                 payload, query, cast(bool, results_backend_use_msgpack)
             )
-            columns = [c["name"] for c in obj["columns"]]
-            df = pd.DataFrame.from_records(obj["data"], columns=columns)
             logger.info("Using pandas to convert to CSV")
         else:
             logger.info("Running a query to turn into CSV")
@@ -2816,17 +2862,21 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
             }:
                 # remove extra row from `increased_limit`
                 limit -= 1
-            df = query.database.get_df(sql, query.schema)[:limit]
+            dfs = query.database.iter_df_batches(sql, query.schema, limit)
 
-        csv_data = csv.df_to_escaped_csv(df, index=False, **config["CSV_EXPORT"])
+        # the CSV is rendered while it's sent, one chunk of rows at a time
+        csv_data = csv.df_to_escaped_csv_chunks(
+            dfs, index=False, **config["CSV_EXPORT"]
+        )
         quoted_csv_name = parse.quote(query.name)
         response = CsvResponse(
-            csv_data, headers=generate_download_headers("csv", quoted_csv_name)
+            stream_with_context(csv_data),
+            headers=generate_download_headers("csv", quoted_csv_name),
         )
         event_info = {
             "event_type": "data_export",
             "client_id": client_id,
-            "row_count": len(df.index),
+            "row_count": query.rows,
             "database": query.database.name,
             "schema": query.schema,
             "sql": query.sql,
@@ -2886,16 +2936,65 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
         # UTC date time, same that is stored in the DB.
         last_updated_dt = datetime.utcfromtimestamp(last_updated_ms / 1000)
 
+        updated = Query.changed_on >= last_updated_dt
+        if query_progress_manager.enabled:
+            # the progress of running queries is only persisted periodically, the
+            # latest one is read from the progress channel
+            updated = or_(updated, Query.status == QueryStatus.RUNNING)
         sql_queries = (
             db.session.query(Query)
-            .filter(
-                Query.user_id == g.user.get_id(), Query.changed_on >= last_updated_dt
-            )
+            .filter(Query.user_id == g.user.get_id(), updated)
             .all()
         )
         dict_queries = {q.client_id: q.to_dict() for q in sql_queries}
+        progress = query_progress_manager.get_progress(
+            q.id for q in sql_queries if q.status == QueryStatus.RUNNING
+        )
+        for query in sql_queries:
+            if query.id in progress:
+                dict_queries[query.client_id].update(
+                    {
+                        "progress": max(
+                            query.progress or 0, progress[query.id]["progress"] or 0
+                        ),
+                        "trackingUrl": progress[query.id]["tracking_url"]
+                        or query.tracking_url,
+                    }
+                )
         return json_success(json.dumps(dict_queries, default=utils.json_int_dttm_ser))
 
+    @event_logger.log_this
+    @has_access_api
+    @permission_name("queries")
+    @expose("/queries_feed/")
+    def queries_feed(self) -> FlaskResponse:  # pylint: disable=no-self-use
+        """
+        Get the changes of the queries of the user, waiting for them for up to
+        SQLLAB_QUERY_FEED_TIMEOUT milliseconds, which is kept short since the
+        request holds a web server worker while it waits. Only the changed fields
+        of each query are returned, along with the ones identifying it.
+
+        The ``last_id`` parameter is the ``last_id`` returned by the previous call;
+        without it only the changes made from now on are returned.
+        """
+        if not is_feature_enabled("GLOBAL_ASYNC_QUERIES"):
+            return json_error_response("The query feed is not enabled.", status=404)
+        if not g.user.get_id():
+            return json_error_response(
+                "Please login to access the queries.", status=403
+            )
+
+        events, last_id = async_query_manager.read_query_updates(
+            int(g.user.get_id()),
+            request.args.get("last_id"),
+            config["SQLLAB_QUERY_FEED_TIMEOUT"],
+        )
+        return json_success(
+            json.dumps(
+                {"result": events, "last_id": last_id}, default=utils.json_int_dttm_ser
+            )
+        )
+
     @has_access
     @event_logger.log_this
     @expose("/search_queries")
@@ -2907,6 +3006,9 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
         Custom permission can_only_search_queries_owned restricts queries
         to only queries run by current user.
 
+        The results are paginated by passing the start time and id of the last
+        query of a page as the ``after_start_time`` and ``after_id`` arguments.
+
         :returns: Response with list of sql query dicts
         """
         if security_manager.can_access_all_queries():
@@ -2920,38 +3022,31 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
                 return Response(status=403, mimetype="application/json")
         else:
             search_user_id = g.user.get_user_id()
-        database_id = request.args.get("database_id")
-        search_text = request.args.get("search_text")
-        status = request.args.get("status")
         # From and To time stamp should be Epoch timestamp in seconds
         from_time = request.args.get("from")
         to_time = request.args.get("to")
-
-        query = db.session.query(Query)
-        if search_user_id:
-            # Filter on user_id
-            query = query.filter(Query.user_id == search_user_id)
-
-        if database_id:
-            # Filter on db Id
-            query = query.filter(Query.database_id == database_id)
-
-        if status:
-            # Filter on status
-            query = query.filter(Query.status == status)
-
-        if search_text:
-            # Filter on search text
-            query = query.filter(Query.sql.like(f"%{search_text}%"))
-
-        if from_time:
-            query = query.filter(Query.start_time > int(from_time))
-
-        if to_time:
-            query = query.filter(Query.start_time < int(to_time))
-
-        query_limit = config["QUERY_SEARCH_LIMIT"]
-        sql_queries = query.order_by(Query.start_time.asc()).limit(query_limit).all()
+        after_start_time = request.args.get("after_start_time")
+        after_id = request.args.get("after_id")
+        try:
+            after = (
+                (float(after_start_time), int(after_id))
+                if after_start_time and after_id
+                else None
+            )
+        except ValueError:
+            return Response(status=400, mimetype="application/json")
+
+        sql_queries = QueryDAO.search(
+            user_id=search_user_id,
+            database_id=request.args.get("database_id", type=int),
+            status=request.args.get("status"),
+            search_text=request.args.get("search_text"),
+            table=request.args.get("table"),
+            from_time=int(from_time) if from_time else None,
+            to_time=int(to_time) if to_time else None,
+            after=after,
+            limit=config["QUERY_SEARCH_LIMIT"],
+        )
 
         dict_queries = [q.to_dict() for q in sql_queries]
 
@@ -55,6 +55,7 @@ class DatabaseMixin:
         "database_name",
         "sqlalchemy_uri",
         "cache_timeout",
+        "cache_grace_period",
         "expose_in_sqllab",
         "allow_run_async",
         "allow_csv_upload",
@@ -145,7 +146,10 @@ class DatabaseMixin:
             "4. the ``version`` field is a string specifying the this db's version. "
             "This should be used with Presto DBs so that the syntax is correct<br/>"
             "5. The ``allows_virtual_table_explore`` field is a boolean specifying "
-            "whether or not the Explore button in SQL Lab results is shown.",
+            "whether or not the Explore button in SQL Lab results is shown.<br/>"
+            "6. The ``connection_pool`` object enables connection pooling for this "
+            'database. Specify it as **"connection_pool": {"pool_size": 5, '
+            '"max_overflow": 10, "pool_recycle": 3600, "pool_pre_ping": true}**.',
             True,
         ),
         "encrypted_extra": utils.markdown(
@@ -177,6 +181,11 @@ class DatabaseMixin:
             "A timeout of 0 indicates that the cache never expires. "
             "Note this defaults to the global timeout if undefined."
         ),
+        "cache_grace_period": _(
+            "Duration (in seconds) during which expired cached data of charts of "
+            "this database is still served, while it's refreshed in the background. "
+            "Note this defaults to the global grace period if undefined."
+        ),
         "allow_csv_upload": _(
             "If selected, please set the schemas allowed for csv upload in Extra."
         ),
@@ -193,6 +202,7 @@ class DatabaseMixin:
         "changed_on_": _("Last Changed"),
         "sqlalchemy_uri": _("SQLAlchemy URI"),
         "cache_timeout": _("Chart Cache Timeout"),
+        "cache_grace_period": _("Chart Cache Grace Period"),
         "extra": _("Extra"),
         "encrypted_extra": _("Secure Extra"),
         "server_cert": _("Root certificate"),
@@ -18,10 +18,22 @@ import logging
 from collections import defaultdict
 from datetime import date
 from functools import wraps
-from typing import Any, Callable, DefaultDict, Dict, List, Optional, Set, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 from urllib import parse
 
 import msgpack
+import pandas as pd
 import pyarrow as pa
 import simplejson as json
 from flask import g, request
@@ -31,7 +43,7 @@ from flask_babel import _
 from sqlalchemy.orm.exc import NoResultFound
 
 import superset.models.core as models
-from superset import app, dataframe, db, result_set, viz
+from superset import app, dataframe, db, result_set, results_backend, viz
 from superset.connectors.connector_registry import ConnectorRegistry
 from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
 from superset.exceptions import (
@@ -49,6 +61,7 @@ from superset.models.sql_lab import Query
 from superset.typing import FormData
 from superset.utils.core import QueryStatus, TimeRangeEndpoint
 from superset.utils.decorators import stats_timing
+from superset.utils.results_chunks import iter_result_chunks, read_result_chunks
 from superset.viz import BaseViz
 
 logger = logging.getLogger(__name__)
@@ -583,8 +596,20 @@ def check_slice_perms(_self: Any, slice_id: int) -> None:
 
 
 def _deserialize_results_payload(
-    payload: Union[bytes, str], query: Query, use_msgpack: Optional[bool] = False
+    payload: Union[bytes, str],
+    query: Query,
+    use_msgpack: Optional[bool] = False,
+    rows: Optional[int] = None,
 ) -> Dict[str, Any]:
+    """
+    Deserialize a results payload read from the results backend.
+
+    :param payload: the decompressed payload
+    :param query: the query of the results
+    :param use_msgpack: whether the payload was serialized with msgpack
+    :param rows: the number of leading rows needed, when the data is stored in
+        chunks only the chunks holding them are fetched
+    """
     logger.debug("Deserializing from msgpack: %r", use_msgpack)
     if use_msgpack:
         with stats_timing(
@@ -592,27 +617,71 @@ def _deserialize_results_payload(
         ):
             ds_payload = msgpack.loads(payload, raw=False)
 
-        with stats_timing("sqllab.query.results_backend_pa_deserialize", stats_logger):
+        return _load_results_data(ds_payload, query, rows)
+
+    with stats_timing("sqllab.query.results_backend_json_deserialize", stats_logger):
+        return json.loads(payload)
+
+
+def _load_results_data(
+    ds_payload: Dict[str, Any], query: Query, rows: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Load the Arrow data of a msgpack results payload as records.
+    """
+    with stats_timing("sqllab.query.results_backend_pa_deserialize", stats_logger):
+        if "chunks" in ds_payload:
+            pa_table = read_result_chunks(
+                results_backend, ds_payload.pop("chunks"), rows
+            )
+        else:
             try:
                 pa_table = pa.deserialize(ds_payload["data"])
             except pa.ArrowSerializationError:
                 raise SerializationError("Unable to deserialize table")
 
-        df = result_set.SupersetResultSet.convert_table_to_df(pa_table)
-        ds_payload["data"] = dataframe.df_to_records(df) or []
+    df = result_set.SupersetResultSet.convert_table_to_df(pa_table)
+    ds_payload["data"] = dataframe.df_to_records(df) or []
 
-        db_engine_spec = query.database.db_engine_spec
-        all_columns, data, expanded_columns = db_engine_spec.expand_data(
-            ds_payload["selected_columns"], ds_payload["data"]
-        )
-        ds_payload.update(
-            {"data": data, "columns": all_columns, "expanded_columns": expanded_columns}
-        )
+    db_engine_spec = query.database.db_engine_spec
+    all_columns, data, expanded_columns = db_engine_spec.expand_data(
+        ds_payload["selected_columns"], ds_payload["data"]
+    )
+    ds_payload.update(
+        {"data": data, "columns": all_columns, "expanded_columns": expanded_columns}
+    )
 
-        return ds_payload
+    return ds_payload
 
-    with stats_timing("sqllab.query.results_backend_json_deserialize", stats_logger):
-        return json.loads(payload)
+
+def _iter_results_payload_dfs(
+    payload: Union[bytes, str], query: Query, use_msgpack: Optional[bool] = False
+) -> Iterator[pd.DataFrame]:
+    """
+    Deserialize the rows of a results payload as DataFrames. Results stored in
+    chunks are yielded one chunk at a time, without expanding nested fields.
+
+    :param payload: the decompressed payload
+    :param query: the query of the results
+    :param use_msgpack: whether the payload was serialized with msgpack
+    """
+    if use_msgpack:
+        with stats_timing(
+            "sqllab.query.results_backend_msgpack_deserialize", stats_logger
+        ):
+            ds_payload = msgpack.loads(payload, raw=False)
+
+        if "chunks" in ds_payload:
+            for table in iter_result_chunks(results_backend, ds_payload["chunks"]):
+                yield result_set.SupersetResultSet.convert_table_to_df(table)
+            return
+
+        obj = _load_results_data(ds_payload, query)
+    else:
+        obj = _deserialize_results_payload(payload, query)
+
+    columns = [c["name"] for c in obj["columns"]]
+    yield pd.DataFrame.from_records(obj["data"], columns=columns)
 
 
 def get_cta_schema_name(
@@ -33,6 +33,7 @@ from typing import (
     Callable,
     cast,
     Dict,
+    Iterator,
     List,
     Optional,
     Set,
@@ -68,7 +69,14 @@ from superset.models.cache import CacheKey
 from superset.models.helpers import QueryResult
 from superset.typing import Metric, QueryObjectDict, VizData, VizPayload
 from superset.utils import core as utils, csv
-from superset.utils.cache import set_and_log_cache
+from superset.utils.cache import (
+    deserialize_df,
+    get_or_lock_cache,
+    is_cache_value_stale,
+    schedule_cache_refresh,
+    serialize_df,
+    set_and_log_cache,
+)
 from superset.utils.core import (
     DTTM_ALIAS,
     JS_MAX_INTEGER,
@@ -399,6 +407,32 @@ class BaseViz:
             return config["DATA_CACHE_CONFIG"]["CACHE_DEFAULT_TIMEOUT"]
         return config["CACHE_DEFAULT_TIMEOUT"]
 
+    @property
+    def cache_grace_period(self) -> int:
+        if getattr(self.datasource, "cache_grace_period", None) is not None:
+            return self.datasource.cache_grace_period
+        database = getattr(self.datasource, "database", None)
+        if database and database.cache_grace_period is not None:
+            return database.cache_grace_period
+        return config["DATA_CACHE_GRACE_PERIOD"]
+
+    def refresh_cache(self, cache_key: str) -> None:
+        """
+        Refresh the stale cached data of the viz in the background.
+        """
+        # pylint: disable=import-outside-toplevel
+        from superset.tasks.async_queries import refresh_explore_json_cache
+
+        schedule_cache_refresh(
+            cache_key,
+            lambda: refresh_explore_json_cache.delay(
+                self.datasource.type,
+                self.datasource.id,
+                self.form_data,
+                utils.get_user_id(),
+            ),
+        )
+
     def get_json(self) -> str:
         return json.dumps(
             self.get_payload(), default=utils.json_int_dttm_ser, ignore_nan=True
@@ -424,6 +458,11 @@ class BaseViz:
             if k in cache_dict:
                 del cache_dict[k]
 
+        if cache_dict.get("is_rowcount"):
+            # the row count is shared by all the pages of a query
+            for k in ["row_offset", "orderby"]:
+                cache_dict.pop(k, None)
+
         cache_dict["time_range"] = self.form_data.get("time_range")
         cache_dict["datasource"] = self.datasource.uid
         cache_dict["extra_cache_keys"] = self.datasource.get_extra_cache_keys(query_obj)
@@ -496,85 +535,109 @@ class BaseViz:
         is_loaded = False
         stacktrace = None
         df = None
-        if cache_key and cache_manager.data_cache and not self.force:
-            cache_value = cache_manager.data_cache.get(cache_key)
-            if cache_value:
-                stats_logger.incr("loading_from_cache")
+        cache_lock = None
+        try:
+            if cache_key and cache_manager.data_cache and not self.force:
+                cache_value, cache_lock = get_or_lock_cache(
+                    cache_manager.data_cache, cache_key, coalesce=not self.force_cached
+                )
+                if cache_value:
+                    stats_logger.incr("loading_from_cache")
+                    try:
+                        df = deserialize_df(cache_value["df"])
+                        self.query = cache_value["query"]
+                        self.status = utils.QueryStatus.SUCCESS
+                        is_loaded = True
+                        stats_logger.incr("loaded_from_cache")
+                        if self.cache_grace_period and is_cache_value_stale(
+                            cache_value, self.cache_timeout
+                        ):
+                            stats_logger.incr("loaded_stale_from_cache")
+                            self.refresh_cache(cache_key)
+                    except Exception as ex:
+                        logger.exception(ex)
+                        logger.error(
+                            "Error reading cache: "
+                            + utils.error_msg_from_exception(ex),
+                            exc_info=True,
+                        )
+                    logger.info("Serving from cache")
+
+            if query_obj and not is_loaded:
+                if self.force_cached:
+                    logger.warning(
+                        "force_cached (viz.py): value not found for cache key %s",
+                        cache_key,
+                    )
+                    raise CacheLoadError(_("Cached value not found"))
                 try:
-                    df = cache_value["df"]
-                    self.query = cache_value["query"]
-                    self.status = utils.QueryStatus.SUCCESS
-                    is_loaded = True
-                    stats_logger.incr("loaded_from_cache")
+                    invalid_columns = [
+                        col
+                        for col in (query_obj.get("columns") or [])
+                        + (query_obj.get("groupby") or [])
+                        + utils.get_column_names_from_metrics(
+                            cast(List[Metric], query_obj.get("metrics") or [],)
+                        )
+                        if col not in self.datasource.column_names
+                    ]
+                    if invalid_columns:
+                        raise QueryObjectValidationError(
+                            _(
+                                "Columns missing in datasource: %(invalid_columns)s",
+                                invalid_columns=invalid_columns,
+                            )
+                        )
+                    df = self.get_df(query_obj)
+                    if self.status != utils.QueryStatus.FAILED:
+                        stats_logger.incr("loaded_from_source")
+                        if not self.force:
+                            stats_logger.incr("loaded_from_source_without_force")
+                        is_loaded = True
+                except QueryObjectValidationError as ex:
+                    error = dataclasses.asdict(
+                        SupersetError(
+                            message=str(ex),
+                            level=ErrorLevel.ERROR,
+                            error_type=SupersetErrorType.VIZ_GET_DF_ERROR,
+                        )
+                    )
+                    self.errors.append(error)
+                    self.status = utils.QueryStatus.FAILED
                 except Exception as ex:
                     logger.exception(ex)
-                    logger.error(
-                        "Error reading cache: " + utils.error_msg_from_exception(ex),
-                        exc_info=True,
-                    )
-                logger.info("Serving from cache")
 
-        if query_obj and not is_loaded:
-            if self.force_cached:
-                logger.warning(
-                    f"force_cached (viz.py): value not found for cache key {cache_key}"
-                )
-                raise CacheLoadError(_("Cached value not found"))
-            try:
-                invalid_columns = [
-                    col
-                    for col in (query_obj.get("columns") or [])
-                    + (query_obj.get("groupby") or [])
-                    + utils.get_column_names_from_metrics(
-                        cast(List[Metric], query_obj.get("metrics") or [],)
-                    )
-                    if col not in self.datasource.column_names
-                ]
-                if invalid_columns:
-                    raise QueryObjectValidationError(
-                        _(
-                            "Columns missing in datasource: %(invalid_columns)s",
-                            invalid_columns=invalid_columns,
+                    error = dataclasses.asdict(
+                        SupersetError(
+                            message=str(ex),
+                            level=ErrorLevel.ERROR,
+                            error_type=SupersetErrorType.VIZ_GET_DF_ERROR,
                         )
                     )
-                df = self.get_df(query_obj)
-                if self.status != utils.QueryStatus.FAILED:
-                    stats_logger.incr("loaded_from_source")
-                    if not self.force:
-                        stats_logger.incr("loaded_from_source_without_force")
-                    is_loaded = True
-            except QueryObjectValidationError as ex:
-                error = dataclasses.asdict(
-                    SupersetError(
-                        message=str(ex),
-                        level=ErrorLevel.ERROR,
-                        error_type=SupersetErrorType.VIZ_GET_DF_ERROR,
-                    )
-                )
-                self.errors.append(error)
-                self.status = utils.QueryStatus.FAILED
-            except Exception as ex:
-                logger.exception(ex)
-
-                error = dataclasses.asdict(
-                    SupersetError(
-                        message=str(ex),
-                        level=ErrorLevel.ERROR,
-                        error_type=SupersetErrorType.VIZ_GET_DF_ERROR,
+                    self.errors.append(error)
+                    self.status = utils.QueryStatus.FAILED
+                    stacktrace = utils.get_stacktrace()
+
+                if is_loaded and cache_key and self.status != utils.QueryStatus.FAILED:
+                    set_and_log_cache(
+                        cache_manager.data_cache,
+                        cache_key,
+                        {
+                            "df": serialize_df(
+                                df,
+                                cache_key,
+                                self.cache_timeout,
+                                self.cache_grace_period,
+                            ),
+                            "query": self.query,
+                        },
+                        self.cache_timeout,
+                        self.datasource.uid,
+                        self.cache_grace_period,
                     )
-                )
-                self.errors.append(error)
-                self.status = utils.QueryStatus.FAILED
-                stacktrace = utils.get_stacktrace()
-
-            if is_loaded and cache_key and self.status != utils.QueryStatus.FAILED:
-                set_and_log_cache(
-                    cache_manager.data_cache,
-                    cache_key,
-                    {"df": df, "query": self.query},
-                    self.cache_timeout,
-                    self.datasource.uid,
-                )
+        finally:
+            # the lock is released even when loading or storing the data fails
+            if cache_lock:
+                cache_lock.release()
         return {
             "cache_key": cache_key,
             "cached_dttm": cache_value["dttm"] if cache_value is not None else None,
@@ -617,10 +680,15 @@ class BaseViz:
         }
         return content
 
-    def get_csv(self) -> Optional[str]:
+    def get_csv(self) -> Iterator[str]:
+        """
+        Return the data as CSV, rendered in chunks while it's consumed.
+        """
         df = self.get_df_payload()["df"]  # leverage caching logic
         include_index = not isinstance(df.index, pd.RangeIndex)
-        return csv.df_to_escaped_csv(df, index=include_index, **config["CSV_EXPORT"])
+        return csv.df_to_escaped_csv_chunks(
+            [df], index=include_index, **config["CSV_EXPORT"]
+        )
 
     def get_data(self, df: pd.DataFrame) -> VizData:
         return df.to_dict(orient="records")
@@ -732,8 +800,59 @@ class TableViz(BaseViz):
                 # Legacy behavior of sorting by first metric by default
                 first_metric = d["metrics"][0]
                 d["orderby"] = [(first_metric, not fd.get("order_desc", True))]
+        if self.server_pagination:
+            row_limit = d["row_limit"]
+            page_length = int(fd.get("server_page_length") or 10)
+            row_offset = int(fd.get("server_page") or 0) * page_length
+            if row_limit:
+                # the pages don't go past the row limit of the chart
+                row_offset = min(
+                    row_offset, (row_limit - 1) // page_length * page_length
+                )
+                page_length = min(page_length, row_limit - row_offset)
+            d["row_limit"] = page_length
+            d["row_offset"] = row_offset
         return d
 
+    @property
+    def server_pagination(self) -> bool:
+        """
+        Whether the rows are fetched one page at a time, only SQL datasources
+        support row windows.
+        """
+        return bool(self.form_data.get("server_pagination")) and (
+            self.datasource.type == "table"
+        )
+
+    def get_payload(self, query_obj: Optional[QueryObjectDict] = None) -> VizPayload:
+        if not self.server_pagination:
+            return super().get_payload(query_obj)
+
+        query_obj = query_obj or self.query_obj()
+        payload = super().get_payload(query_obj)
+        if not self.has_error(payload):
+            payload["total_count"] = self.get_total_count(query_obj)
+        return payload
+
+    def get_total_count(self, query_obj: QueryObjectDict) -> Optional[int]:
+        """
+        Count the rows of all the pages. The count is cached on its own, so that
+        it's shared by the pages of the table.
+
+        :param query_obj: the query object of a page
+        :returns: the number of rows, or None if they couldn't be counted
+        """
+        row_limit = int(self.form_data.get("row_limit") or config["ROW_LIMIT"])
+        query = self.query
+        payload = self.get_df_payload(
+            {**query_obj, "is_rowcount": True, "row_limit": row_limit}
+        )
+        self.query = query
+        df = payload["df"]
+        if df is None or df.empty:
+            return None
+        return int(df.iloc[0, 0])
+
     def get_data(self, df: pd.DataFrame) -> VizData:
         """
         Transform the query result to the table representation.
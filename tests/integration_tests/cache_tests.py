@@ -16,15 +16,21 @@
 # under the License.
 """Unit tests for Superset with caching"""
 import json
+import threading
+import time
+from unittest import mock
 
 import pytest
 
 from superset import app, db
+from superset.charts.schemas import ChartDataQueryContextSchema
 from superset.extensions import cache_manager
+from superset.utils.cache import get_or_lock_cache
 from superset.utils.core import QueryStatus
 from tests.integration_tests.fixtures.birth_names_dashboard import (
     load_birth_names_dashboard_with_slices,
 )
+from tests.integration_tests.fixtures.query_context import get_query_context
 
 from .base_tests import SupersetTestCase
 
@@ -102,3 +108,77 @@ class TestCache(SupersetTestCase):
         app.config["DATA_CACHE_CONFIG"] = data_cache_config
         app.config["CACHE_DEFAULT_TIMEOUT"] = cache_default_timeout
         cache_manager.init_app(app)
+
+    def test_coalesce_cache_misses(self):
+        data_cache_config = app.config["DATA_CACHE_CONFIG"]
+        app.config["DATA_CACHE_CONFIG"] = {"CACHE_TYPE": "simple"}
+        cache_manager.init_app(app)
+        cache = cache_manager.data_cache
+        results = []
+
+        def get_from_another_request():
+            with app.app_context():
+                results.append(get_or_lock_cache(cache, "coalesced_key"))
+
+        with mock.patch.dict(app.config, {"DATA_CACHE_COALESCE_MISSES": True}):
+            cache_value, lock = get_or_lock_cache(cache, "coalesced_key")
+            self.assertIsNone(cache_value)
+            self.assertIsNotNone(lock)
+
+            # the other request waits until the first one caches the value
+            thread = threading.Thread(target=get_from_another_request)
+            thread.start()
+            time.sleep(0.2)
+            self.assertEqual(results, [])
+            cache.set("coalesced_key", {"query": "SELECT 1"})
+            lock.release()
+            thread.join()
+            self.assertEqual(results, [({"query": "SELECT 1"}, None)])
+
+            # requests stop waiting after the lock timeout
+            cache_value, lock = get_or_lock_cache(cache, "slow_key")
+            with mock.patch.dict(app.config, {"DATA_CACHE_LOCK_TIMEOUT": 1}):
+                self.assertEqual(get_or_lock_cache(cache, "slow_key"), (None, None))
+
+            # the lock can be acquired again once it's released, even if no value
+            # was cached
+            lock.release()
+            cache_value, lock = get_or_lock_cache(cache, "slow_key")
+            self.assertIsNone(cache_value)
+            self.assertIsNotNone(lock)
+            lock.release()
+
+        # reset cache config
+        app.config["DATA_CACHE_CONFIG"] = data_cache_config
+        cache_manager.init_app(app)
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_cache_lock_released_on_error(self):
+        data_cache_config = app.config["DATA_CACHE_CONFIG"]
+        app.config["DATA_CACHE_CONFIG"] = {"CACHE_TYPE": "simple"}
+        cache_manager.init_app(app)
+        query_context = ChartDataQueryContextSchema().load(
+            get_query_context("birth_names")
+        )
+        query_obj = query_context.queries[0]
+        cache_key = query_context.query_cache_key(query_obj)
+
+        with mock.patch.dict(
+            app.config,
+            {"DATA_CACHE_COALESCE_MISSES": True, "DATA_CACHE_LOCK_TIMEOUT": 1},
+        ), mock.patch(
+            "superset.common.query_context.set_and_log_cache",
+            side_effect=Exception("Cache unavailable"),
+        ):
+            with self.assertRaises(Exception):
+                query_context.get_df_payload(query_obj)
+
+            # the next request isn't kept waiting for the failed one
+            cache_value, lock = get_or_lock_cache(cache_manager.data_cache, cache_key)
+            self.assertIsNone(cache_value)
+            self.assertIsNotNone(lock)
+            lock.release()
+
+        # reset cache config
+        app.config["DATA_CACHE_CONFIG"] = data_cache_config
+        cache_manager.init_app(app)
@@ -343,6 +343,28 @@ def test_new_data_serialization():
     assert isinstance(data[0], bytes)
 
 
+def test_results_serialized_once():
+    db_engine_spec = BaseEngineSpec()
+    result_set = SupersetResultSet(SERIALIZATION_DATA, CURSOR_DESCR, db_engine_spec)
+    results = sql_lab.SqlLabResults(result_set, db_engine_spec, expand_data=True)
+
+    with mock.patch.object(
+        db_engine_spec, "expand_data", wraps=db_engine_spec.expand_data
+    ) as expand_data, mock.patch.object(
+        SupersetResultSet,
+        "convert_table_to_df",
+        wraps=SupersetResultSet.convert_table_to_df,
+    ) as convert_table_to_df:
+        arrow_data = results.serialize(use_msgpack=True)[0]
+        records = results.serialize(use_msgpack=False)[0]
+        assert results.serialize(use_msgpack=True)[0] is arrow_data
+        assert results.serialize(use_msgpack=False)[0] is records
+        convert_table_to_df.assert_called_once()
+        expand_data.assert_called_once()
+    assert isinstance(arrow_data, bytes)
+    assert isinstance(records[0], dict)
+
+
 @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
 def test_default_payload_serialization():
     use_new_deserialization = False
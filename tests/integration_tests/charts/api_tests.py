@@ -16,6 +16,7 @@
 # under the License.
 # isort:skip_file
 """Unit tests for Superset"""
+import copy
 import json
 from datetime import datetime, timedelta
 from io import BytesIO
@@ -32,6 +33,7 @@ from tests.integration_tests.fixtures.birth_names_dashboard import (
 
 import humanize
 import prison
+import pyarrow as pa
 import pytest
 import yaml
 from sqlalchemy import and_, or_
@@ -1203,6 +1205,86 @@ class TestChartApi(SupersetTestCase, ApiOwnersTestCaseMixin, InsertChartMixin):
         request_payload["result_format"] = "csv"
         rv = self.post_assert_metric(CHART_DATA_URI, request_payload, "data")
         self.assertEqual(rv.status_code, 200)
+        self.assertEqual(rv.mimetype, "text/csv")
+        self.assertIn(b"name,sum__num\n", rv.data)
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_chart_data_arrow_result_format(self):
+        """
+        Chart data API: Test chart data with Arrow result format
+        """
+        self.login(username="admin")
+        request_payload = get_query_context("birth_names")
+        request_payload["result_format"] = "arrow"
+        rv = self.post_assert_metric(CHART_DATA_URI, request_payload, "data")
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(rv.mimetype, "application/vnd.apache.arrow.stream")
+        reader = pa.ipc.open_stream(rv.data)
+        table = reader.read_all()
+        expected_row_count = self.get_expected_row_count("client_id_1")
+        self.assertEqual(table.num_rows, expected_row_count)
+        metadata = json.loads(reader.schema.metadata[b"superset"])
+        self.assertEqual(metadata["rowcount"], expected_row_count)
+        self.assertEqual(metadata["colnames"], table.column_names)
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_chart_data_arrow_accept_header(self):
+        """
+        Chart data API: Test chart data with Arrow requested in the Accept header
+        """
+        self.login(username="admin")
+        request_payload = get_query_context("birth_names")
+        rv = self.client.post(
+            CHART_DATA_URI,
+            json=request_payload,
+            headers={"Accept": "application/vnd.apache.arrow.stream"},
+        )
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(rv.mimetype, "application/vnd.apache.arrow.stream")
+        table = pa.ipc.open_stream(rv.data).read_all()
+        self.assertEqual(table.num_rows, self.get_expected_row_count("client_id_1"))
+
+        self.assertIn("Accept", rv.vary)
+
+        rv = self.client.post(
+            CHART_DATA_URI, json=request_payload, headers={"Accept": "*/*"}
+        )
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(rv.mimetype, "application/json")
+        self.assertIn("Accept", rv.vary)
+
+        # results that aren't DataFrames are always sent as JSON
+        request_payload["result_type"] = "columns"
+        rv = self.client.post(
+            CHART_DATA_URI,
+            json=request_payload,
+            headers={"Accept": "application/vnd.apache.arrow.stream"},
+        )
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(rv.mimetype, "application/json")
+        self.assertNotIn("Accept", rv.vary)
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_chart_data_arrow_multiple_queries(self):
+        """
+        Chart data API: Test chart data with one Arrow stream per query
+        """
+        self.login(username="admin")
+        request_payload = get_query_context("birth_names")
+        request_payload["result_format"] = "arrow"
+        second_query = copy.deepcopy(request_payload["queries"][0])
+        second_query["row_limit"] = 2
+        request_payload["queries"].append(second_query)
+        rv = self.post_assert_metric(CHART_DATA_URI, request_payload, "data")
+        self.assertEqual(rv.status_code, 200)
+
+        buffer = pa.BufferReader(rv.data)
+        tables = []
+        while buffer.tell() < buffer.size():
+            tables.append(pa.ipc.open_stream(buffer).read_all())
+        self.assertEqual(len(tables), 2)
+        self.assertEqual(tables[0].num_rows, self.get_expected_row_count("client_id_1"))
+        self.assertEqual(tables[1].num_rows, 2)
 
     # Test chart csv without permission
     @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
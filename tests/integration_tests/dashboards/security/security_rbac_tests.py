@@ -18,7 +18,9 @@
 from unittest import mock
 
 import pytest
+from flask import g
 
+from superset import app
 from tests.integration_tests.dashboards.dashboard_test_utils import *
 from tests.integration_tests.dashboards.security.base_case import (
     BaseTestDashboardSecurity,
@@ -146,6 +148,50 @@ class TestDashboardRoleBasedSecurity(BaseTestDashboardSecurity):
         # post
         revoke_access_to_dashboard(dashboard_to_access, new_role)
 
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_get_accessible_dashboard_ids(self):
+        # arrange
+        username = random_str()
+        new_role = f"role_{random_str()}"
+        self.create_user_with_roles(username, [new_role], should_create_roles=True)
+        user = security_manager.find_user(username)
+
+        slice = (
+            db.session.query(Slice)
+            .filter_by(slice_name="Girl Name Cloud")
+            .one_or_none()
+        )
+        owned_dashboard = create_dashboard_to_db(published=False, owners=[user])
+        granted_dashboard = create_dashboard_to_db(published=True, slices=[slice])
+        draft_dashboard = create_dashboard_to_db(published=False)
+        other_dashboard = create_dashboard_to_db(published=True)
+        grant_access_to_dashboard(granted_dashboard, new_role)
+        grant_access_to_dashboard(draft_dashboard, new_role)
+        dashboard_ids = {
+            owned_dashboard.id,
+            granted_dashboard.id,
+            draft_dashboard.id,
+            other_dashboard.id,
+        }
+
+        # act
+        with app.test_request_context():
+            g.user = user
+            accessible_ids = security_manager.get_accessible_dashboard_ids(
+                dashboard_ids
+            )
+            datasource_ids = security_manager.get_dashboard_datasource_ids(
+                SqlaTable, {slice.datasource_id}
+            )
+
+        # assert
+        assert accessible_ids == {owned_dashboard.id, granted_dashboard.id}
+        assert datasource_ids == {slice.datasource_id}
+
+        # post
+        revoke_access_to_dashboard(granted_dashboard, new_role)
+        revoke_access_to_dashboard(draft_dashboard, new_role)
+
     @pytest.mark.usefixtures("public_role_like_gamma")
     def test_get_dashboard_view__public_user_can_not_access_without_permission(self):
         dashboard_to_access = create_dashboard_to_db(published=True)
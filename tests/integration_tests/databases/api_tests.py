@@ -168,6 +168,7 @@ class TestDatabaseApi(SupersetTestCase):
             "allow_multi_schema_metadata_fetch",
             "allow_run_async",
             "allows_cost_estimate",
+            "allows_sampling",
             "allows_subquery",
             "allows_virtual_table_explore",
             "backend",
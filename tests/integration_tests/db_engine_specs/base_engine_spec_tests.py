@@ -18,6 +18,7 @@ import datetime
 from unittest import mock
 
 import pytest
+from flask_caching.backends import SimpleCache
 
 from superset.db_engine_specs import get_engine_specs
 from superset.db_engine_specs.base import (
@@ -26,7 +27,9 @@ from superset.db_engine_specs.base import (
     builtin_time_grains,
     LimitMethod,
 )
+from superset.db_engine_specs.hive import HiveEngineSpec
 from superset.db_engine_specs.mysql import MySQLEngineSpec
+from superset.db_engine_specs.postgres import PostgresEngineSpec
 from superset.db_engine_specs.sqlite import SqliteEngineSpec
 from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
 from superset.sql_parse import ParsedQuery
@@ -274,6 +277,32 @@ class TestDbEngineSpecs(TestDbEngineSpec):
         self.assertListEqual(result, data)
 
 
+def test_fetch_data_batches():
+    rows = [(i,) for i in range(25)]
+    cursor = mock.Mock()
+    cursor.fetchmany.side_effect = lambda size: [
+        rows.pop(0) for _ in range(min(size, len(rows)))
+    ]
+
+    with mock.patch.object(BaseEngineSpec, "fetch_batch_size", 10):
+        batches = list(BaseEngineSpec.fetch_data_batches(cursor, limit=22))
+
+    assert [len(batch) for batch in batches] == [10, 10, 2]
+    assert [call.args[0] for call in cursor.fetchmany.call_args_list] == [10, 10, 2]
+
+
+def test_fetch_data_batches_exhausted():
+    rows = [(i,) for i in range(5)]
+    cursor = mock.Mock()
+    cursor.fetchmany.side_effect = lambda size: [
+        rows.pop(0) for _ in range(min(size, len(rows)))
+    ]
+
+    batches = list(BaseEngineSpec.fetch_data_batches(cursor))
+
+    assert batches == [[(0,), (1,), (2,), (3,), (4,)]]
+
+
 def test_is_readonly():
     def is_readonly(sql: str) -> bool:
         return BaseEngineSpec.is_readonly_query(ParsedQuery(sql))
@@ -466,3 +495,49 @@ def test_validate_parameters_port_closed(is_port_open, is_hostname_valid):
             },
         )
     ]
+
+
+def test_estimate_query_cost_cached():
+    database = mock.MagicMock(id=1, impersonate_user=False)
+    database.get_extra.return_value = {"cost_estimate_enabled": True}
+    engine = database.get_sqla_engine.return_value
+    sql = "SELECT 1; SELECT 2"
+
+    with app.app_context(), mock.patch(
+        "superset.db_engine_specs.base.cache_manager"
+    ) as cache_manager, mock.patch.object(
+        PostgresEngineSpec, "estimate_statement_cost", return_value={"Total cost": 1.0}
+    ) as estimate_statement_cost:
+        cache_manager.cache = SimpleCache()
+        costs = PostgresEngineSpec.estimate_query_cost(
+            database, "public", sql, user_name="admin"
+        )
+        assert costs == [{"Total cost": 1.0}, {"Total cost": 1.0}]
+        assert (
+            PostgresEngineSpec.estimate_query_cost(
+                database, "public", sql, user_name="admin"
+            )
+            == costs
+        )
+        PostgresEngineSpec.estimate_query_cost(
+            database, "other", sql, user_name="admin"
+        )
+
+    # the statements are estimated over a single connection, once per schema
+    assert estimate_statement_cost.call_count == 4
+    assert engine.raw_connection.call_count == 2
+
+
+def test_apply_sample_to_sql():
+    sql = "SELECT * FROM t a"
+
+    assert BaseEngineSpec.apply_sample_to_sql(sql, 1) is None
+    assert (
+        PostgresEngineSpec.apply_sample_to_sql(sql, 1)
+        == "SELECT * FROM t a TABLESAMPLE SYSTEM (1)"
+    )
+    assert (
+        HiveEngineSpec.apply_sample_to_sql(sql, 0.5)
+        == "SELECT * FROM t TABLESAMPLE(0.5 PERCENT) a"
+    )
+    assert PostgresEngineSpec.apply_sample_to_sql("SELECT 1", 1) is None
@@ -22,8 +22,10 @@ from sqlalchemy import types
 from sqlalchemy.engine.result import RowProxy
 from sqlalchemy.sql import select
 
+from superset.dataframe import df_to_records
 from superset.db_engine_specs.presto import PrestoEngineSpec
 from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
+from superset.result_set import SupersetResultSet
 from superset.sql_parse import ParsedQuery
 from superset.utils.core import DatasourceName, GenericDataType
 from tests.integration_tests.db_engine_specs.base_tests import TestDbEngineSpec
@@ -237,6 +239,39 @@ class TestPrestoDbEngineSpec(TestDbEngineSpec):
         self.assertEqual(actual_data, expected_data)
         self.assertEqual(actual_expanded_cols, expected_expanded_cols)
 
+    @mock.patch.dict(
+        "superset.extensions.feature_flag_manager._feature_flags",
+        {"PRESTO_EXPAND_DATA": True},
+        clear=True,
+    )
+    def test_presto_expand_data_from_result_set(self):
+        """
+        The nested values of a result set are stringified, and destringified when
+        expanded, nulls included
+        """
+        cols = [
+            {"name": "row_column", "type": "ROW(NESTED_OBJ VARCHAR)"},
+            {"name": "array_column", "type": "ARRAY(BIGINT)"},
+        ]
+        result_set = SupersetResultSet(
+            [(["a"], [1, 2]), (None, None)],
+            [("row_column",), ("array_column",)],
+            PrestoEngineSpec,
+        )
+        data = df_to_records(result_set.to_pandas_df())
+        actual_cols, actual_data, actual_expanded_cols = PrestoEngineSpec.expand_data(
+            cols, data
+        )
+        expected_data = [
+            {"array_column": 1, "row_column": ["a"], "row_column.nested_obj": "a"},
+            {"array_column": 2, "row_column": "", "row_column.nested_obj": ""},
+            {"array_column": None, "row_column": None, "row_column.nested_obj": ""},
+        ]
+        self.assertEqual(actual_data, expected_data)
+        self.assertEqual(
+            actual_expanded_cols, [{"name": "row_column.nested_obj", "type": "VARCHAR"}]
+        )
+
     @mock.patch.dict(
         "superset.extensions.feature_flag_manager._feature_flags",
         {"PRESTO_EXPAND_DATA": True},
@@ -15,8 +15,10 @@
 # specific language governing permissions and limitations
 # under the License.
 # isort:skip_file
+import json
 import textwrap
 import unittest
+from collections import OrderedDict
 from unittest import mock
 from tests.integration_tests.fixtures.birth_names_dashboard import (
     load_birth_names_dashboard_with_slices,
@@ -25,9 +27,11 @@ from tests.integration_tests.fixtures.birth_names_dashboard import (
 import pandas
 import pytest
 from sqlalchemy.engine.url import make_url
+from sqlalchemy.pool import NullPool
 
 import tests.integration_tests.test_app
 from superset import app, db as metadata_db
+from superset.extensions import engine_registry
 from superset.models.core import Database
 from superset.models.slice import Slice
 from superset.utils.core import get_example_database, QueryStatus
@@ -232,6 +236,77 @@ class TestDatabaseModel(SupersetTestCase):
             "password": "original_user_password",
         }
 
+    @mock.patch("superset.models.core.create_engine")
+    def test_get_sqla_engine_connection_pool(self, mocked_create_engine):
+        uri = "postgresql://localhost"
+        extra = """
+                {
+                    "connection_pool": {
+                        "pool_size": 5,
+                        "max_overflow": 10,
+                        "pool_pre_ping": true
+                    }
+                }
+                """
+        model = Database(database_name="test_database", sqlalchemy_uri=uri, extra=extra)
+
+        model.get_sqla_engine()
+        call_args = mocked_create_engine.call_args
+
+        assert "poolclass" not in call_args[1]
+        assert call_args[1]["pool_size"] == 5
+        assert call_args[1]["max_overflow"] == 10
+        assert call_args[1]["pool_pre_ping"] is True
+
+    @mock.patch.object(engine_registry, "_engines", OrderedDict())
+    @mock.patch("superset.models.core.create_engine")
+    def test_get_sqla_engine_registry(self, mocked_create_engine):
+        uri = "postgresql://localhost"
+        model = Database(id=-1, database_name="test_database", sqlalchemy_uri=uri)
+
+        engine = model.get_sqla_engine(schema="public")
+        assert model.get_sqla_engine(schema="public") is engine
+        assert mocked_create_engine.call_count == 1
+
+        model.get_sqla_engine(schema="other")
+        assert mocked_create_engine.call_count == 2
+
+        # the stale engine is disposed when the settings of the database change
+        model.sqlalchemy_uri = "postgresql://otherhost"
+        model.get_sqla_engine(schema="public")
+        assert mocked_create_engine.call_count == 3
+        engine.dispose.assert_called_once()
+
+        # objects that can't be fingerprinted are never shared between engines
+        def mutator(url, params, *args):
+            params["connect_args"] = {"context": object()}
+            return url, params
+
+        with mock.patch("superset.models.core.DB_CONNECTION_MUTATOR", mutator):
+            engine = model.get_sqla_engine(schema="public")
+            assert model.get_sqla_engine(schema="public") is not engine
+        assert mocked_create_engine.call_count == 5
+
+    @mock.patch.object(engine_registry, "_engines", OrderedDict())
+    @mock.patch("superset.models.core.create_engine")
+    def test_get_sqla_engine_connection_pool(self, mocked_create_engine):
+        uri = "postgresql://localhost"
+        extra = json.dumps({"connection_pool": {"pool_size": 5}})
+        model = Database(
+            id=-1, database_name="test_database", sqlalchemy_uri=uri, extra=extra
+        )
+
+        model.get_sqla_engine()
+        _, kwargs = mocked_create_engine.call_args
+        assert kwargs["pool_size"] == 5
+        assert "poolclass" not in kwargs
+
+        model.get_sqla_engine(nullpool=True)
+        _, kwargs = mocked_create_engine.call_args
+        assert kwargs["poolclass"] == NullPool
+        assert "pool_size" not in kwargs
+        assert mocked_create_engine.call_count == 2
+
     @pytest.mark.usefixtures("load_energy_table_with_slice")
     def test_select_star(self):
         db = get_example_database()
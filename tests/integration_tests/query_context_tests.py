@@ -15,16 +15,22 @@
 # specific language governing permissions and limitations
 # under the License.
 import re
+from datetime import datetime, timedelta
 from typing import Any, Dict
+from unittest import mock
 
 import pytest
 
-from superset import db
+from superset import app, db
 from superset.charts.schemas import ChartDataQueryContextSchema
 from superset.common.query_context import QueryContext
 from superset.common.query_object import QueryObject
 from superset.connectors.connector_registry import ConnectorRegistry
-from superset.extensions import cache_manager
+from superset.extensions import cache_manager, query_executor
+from superset.utils.cache_serializers import (
+    ArrowDataFrameSerializer,
+    SerializedDataFrame,
+)
 from superset.utils.core import (
     AdhocMetricExpressionType,
     backend,
@@ -115,6 +121,152 @@ class TestQueryContext(SupersetTestCase):
         self.assertEqual(rehydrated_qc.result_format, query_context.result_format)
         self.assertFalse(rehydrated_qc.force)
 
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_cache_arrow_serializer(self):
+        """
+        Ensure that DataFrames cached with the Arrow serializer are loaded back
+        """
+        self.login(username="admin")
+        payload = get_query_context("birth_names")
+        payload["force"] = True
+        serializer = ArrowDataFrameSerializer()
+        with mock.patch.dict(app.config, {"DATA_CACHE_SERIALIZER": serializer}):
+            query_context = ChartDataQueryContextSchema().load(payload)
+            responses = query_context.get_payload()
+            cache_key = responses["queries"][0]["cache_key"]
+            cached = cache_manager.data_cache.get(cache_key)
+            assert isinstance(cached["df"], SerializedDataFrame)
+            assert cached["df"].serializer == "arrow"
+            # the payload is stored separately from the rest of the cache value
+            assert cached["df"].payload is None
+            payload_key = cached["df"].key
+            assert isinstance(cache_manager.data_cache.get(payload_key), bytes)
+
+            payload["force"] = False
+            query_context = ChartDataQueryContextSchema().load(payload)
+            cached_responses = query_context.get_payload()
+            assert cached_responses["queries"][0]["is_cached"]
+            assert (
+                cached_responses["queries"][0]["data"]
+                == responses["queries"][0]["data"]
+            )
+
+            # the query runs again when the payload is no longer cached
+            cache_manager.data_cache.delete(payload_key)
+            query_context = ChartDataQueryContextSchema().load(payload)
+            responses = query_context.get_payload()
+            assert isinstance(cache_manager.data_cache.get(payload_key), bytes)
+        assert responses["queries"][0]["data"] == cached_responses["queries"][0]["data"]
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    @mock.patch("superset.tasks.async_queries.refresh_chart_data_cache.delay")
+    def test_cache_stale_while_revalidate(self, mock_refresh):
+        """
+        Ensure that stale cached data is served during the grace period, while
+        it's refreshed in the background
+        """
+        self.login(username="admin")
+        payload = get_query_context("birth_names")
+        payload["force"] = True
+        with mock.patch.dict(app.config, {"DATA_CACHE_GRACE_PERIOD": 3600}):
+            query_context = ChartDataQueryContextSchema().load(payload)
+            cache_key = query_context.get_payload()["queries"][0]["cache_key"]
+            cache_manager.data_cache.delete(f"{cache_key}__refresh__lock")
+
+            # make the cached value stale
+            cache_value = cache_manager.data_cache.get(cache_key)
+            dttm = datetime.utcnow() - timedelta(
+                seconds=query_context.cache_timeout + 1
+            )
+            cache_value["dttm"] = dttm.isoformat().split(".")[0]
+            cache_manager.data_cache.set(cache_key, cache_value)
+
+            payload["force"] = False
+            for _ in range(2):
+                query_context = ChartDataQueryContextSchema().load(payload)
+                response = query_context.get_payload()["queries"][0]
+                assert response["is_cached"]
+                assert response["cached_dttm"] == cache_value["dttm"]
+            # the refresh is only scheduled once
+            mock_refresh.assert_called_once()
+            form_data = mock_refresh.call_args[0][0]
+            assert len(form_data["queries"]) == 1
+            cache_manager.data_cache.delete(f"{cache_key}__refresh__lock")
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    @mock.patch("superset.tasks.async_queries.refresh_chart_data_cache.delay")
+    def test_refresh_chart_data_cache(self, mock_refresh):
+        """
+        Ensure that the background refresh rewrites the stale cached data
+        """
+        from superset.tasks.async_queries import refresh_chart_data_cache
+
+        self.login(username="admin")
+        payload = get_query_context("birth_names")
+        payload["force"] = True
+        with mock.patch.dict(app.config, {"DATA_CACHE_GRACE_PERIOD": 3600}):
+            query_context = ChartDataQueryContextSchema().load(payload)
+            cache_key = query_context.get_payload()["queries"][0]["cache_key"]
+            cache_manager.data_cache.delete(f"{cache_key}__refresh__lock")
+
+            cache_value = cache_manager.data_cache.get(cache_key)
+            dttm = datetime.utcnow() - timedelta(
+                seconds=query_context.cache_timeout + 1
+            )
+            cache_value["dttm"] = dttm.isoformat().split(".")[0]
+            cache_manager.data_cache.set(cache_key, cache_value)
+
+            payload["force"] = False
+            query_context = ChartDataQueryContextSchema().load(payload)
+            query_context.get_payload()
+            mock_refresh.assert_called_once()
+
+            # run the task body with the scheduled arguments
+            refresh_chart_data_cache(*mock_refresh.call_args[0])
+            refreshed_value = cache_manager.data_cache.get(cache_key)
+            assert refreshed_value["dttm"] > cache_value["dttm"]
+
+            query_context = ChartDataQueryContextSchema().load(payload)
+            response = query_context.get_payload()["queries"][0]
+            assert response["is_cached"]
+            assert response["cached_dttm"] == refreshed_value["dttm"]
+            cache_manager.data_cache.delete(f"{cache_key}__refresh__lock")
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_incremental_cache(self):
+        """
+        Ensure that the cached buckets of a time series are reused when its time
+        range moves, and that the stitched time series matches the full one
+        """
+        self.login(username="admin")
+        payload = get_query_context("birth_names")
+        payload["queries"][0].update(
+            {
+                "groupby": ["gender"],
+                "is_timeseries": True,
+                "orderby": [],
+                "row_limit": 1000,
+                "time_range": "1960-01-01 : 2000-01-01",
+            }
+        )
+        payload["queries"][0]["extras"]["time_grain_sqla"] = "P1Y"
+        payload["force"] = True
+        with mock.patch.dict(app.config, {"DATA_CACHE_INCREMENTAL": True}):
+            query_context = ChartDataQueryContextSchema().load(payload)
+            query_context.get_payload()
+
+            payload["force"] = False
+            payload["queries"][0]["time_range"] = "1970-01-01 : 2010-01-01"
+            query_context = ChartDataQueryContextSchema().load(payload)
+            with mock.patch("superset.common.query_context.stats_logger") as stats:
+                response = query_context.get_payload()["queries"][0]
+            stats.incr.assert_any_call("loaded_incrementally_from_cache")
+
+        payload["force"] = True
+        query_context = ChartDataQueryContextSchema().load(payload)
+        expected = query_context.get_payload()["queries"][0]
+        assert response["data"] == expected["data"]
+
     def test_query_cache_key_changes_when_datasource_is_updated(self):
         self.login(username="admin")
         payload = get_query_context("birth_names")
@@ -183,6 +335,35 @@ class TestQueryContext(SupersetTestCase):
         cache_key = query_context.query_cache_key(query_object)
         self.assertNotEqual(cache_key_original, cache_key)
 
+    def test_query_cache_key_with_row_offset(self):
+        self.login(username="admin")
+        payload = get_query_context("birth_names")
+        payload["queries"][0].pop("row_offset", None)
+        query_context = ChartDataQueryContextSchema().load(payload)
+        cache_key_all_rows = query_context.query_cache_key(query_context.queries[0])
+
+        # the first page is sorted, unlike the query without a row window
+        payload["queries"][0]["row_offset"] = 0
+        query_context = ChartDataQueryContextSchema().load(payload)
+        cache_key_first_page = query_context.query_cache_key(query_context.queries[0])
+        self.assertNotEqual(cache_key_all_rows, cache_key_first_page)
+
+        # each page is cached on its own
+        payload["queries"][0]["row_offset"] = 100
+        query_context = ChartDataQueryContextSchema().load(payload)
+        cache_key_second_page = query_context.query_cache_key(query_context.queries[0])
+        self.assertNotEqual(cache_key_first_page, cache_key_second_page)
+
+        # while the row count is shared by all the pages
+        payload["queries"][0]["is_rowcount"] = True
+        query_context = ChartDataQueryContextSchema().load(payload)
+        cache_key_second_count = query_context.query_cache_key(query_context.queries[0])
+        payload["queries"][0]["row_offset"] = 0
+        query_context = ChartDataQueryContextSchema().load(payload)
+        cache_key_first_count = query_context.query_cache_key(query_context.queries[0])
+        self.assertEqual(cache_key_first_count, cache_key_second_count)
+        self.assertNotEqual(cache_key_first_count, cache_key_first_page)
+
     def test_query_context_time_range_endpoints(self):
         """
         Ensure that time_range_endpoints are populated automatically when missing
@@ -232,6 +413,24 @@ class TestQueryContext(SupersetTestCase):
         self.assertEqual(query_object.granularity, "timecol")
         self.assertIn("having_druid", query_object.extras)
 
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_merge_into_session(self):
+        """
+        Ensure that the copy used by worker threads has its own query objects and
+        the datasource of the session of the thread
+        """
+        self.login(username="admin")
+        payload = get_query_context("birth_names")
+        query_context = ChartDataQueryContextSchema().load(payload)
+        merged = query_context.merge_into_session()
+
+        assert merged is not query_context
+        assert merged.datasource.id == query_context.datasource.id
+        assert merged.datasource in db.session
+        assert len(merged.queries) == len(query_context.queries)
+        assert merged.queries[0] is not query_context.queries[0]
+        assert merged.queries[0].to_dict() == query_context.queries[0].to_dict()
+
     @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
     def test_csv_response_format(self):
         """
@@ -244,7 +443,7 @@ class TestQueryContext(SupersetTestCase):
         query_context = ChartDataQueryContextSchema().load(payload)
         responses = query_context.get_payload()
         self.assertEqual(len(responses), 1)
-        data = responses["queries"][0]["data"]
+        data = "".join(responses["queries"][0]["data"])
         self.assertIn("name,sum__num\n", data)
         self.assertEqual(len(data.split("\n")), 12)
 
@@ -437,3 +636,19 @@ class TestQueryContext(SupersetTestCase):
         responses = query_context.get_payload()
         new_cache_key = responses["queries"][0]["cache_key"]
         self.assertEqual(orig_cache_key, new_cache_key)
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    @mock.patch.object(query_executor, "_max_concurrency", 2)
+    def test_concurrent_queries(self):
+        """
+        Ensure that query objects running concurrently return their results in order
+        """
+        self.login(username="admin")
+        payload = get_query_context("birth_names")
+        payload["queries"] = [
+            {**payload["queries"][0], "row_limit": row_limit} for row_limit in (3, 5)
+        ]
+        query_context = ChartDataQueryContextSchema().load(payload)
+        responses = query_context.get_payload()
+        rowcounts = [query["rowcount"] for query in responses["queries"]]
+        assert rowcounts == [3, 5]
@@ -248,3 +248,56 @@ class TestSupersetResultSet(SupersetTestCase):
         ]
         results = SupersetResultSet(data, cursor_descr, BaseEngineSpec)
         self.assertEqual(results.columns, [])
+
+    def test_mixed_types_only_stringify_offending_values(self):
+        data = [("a", 1), (2, None), (None, 3)]
+        cursor_descr = [("mixed",), ("ints",)]
+        results = SupersetResultSet(data, cursor_descr, BaseEngineSpec)
+        self.assertEqual(results.columns[0]["type"], "STRING")
+        self.assertEqual(results.columns[1]["type"], "INT")
+        df = results.to_pandas_df()
+        self.assertEqual(
+            df_to_records(df),
+            [
+                {"mixed": "a", "ints": 1},
+                {"mixed": "2", "ints": None},
+                {"mixed": None, "ints": 3},
+            ],
+        )
+
+    def test_nested_types_keep_strings_and_nulls(self):
+        data = [([1, 2], "a"), (None, {"b": 1}), ("c", None)]
+        cursor_descr = [("nested",), ("mixed_nested",)]
+        results = SupersetResultSet(data, cursor_descr, BaseEngineSpec)
+        self.assertEqual(results.columns[0]["type"], "STRING")
+        self.assertEqual(results.columns[1]["type"], "STRING")
+        df = results.to_pandas_df()
+        # strings are not quoted and nulls are not stringified
+        self.assertEqual(
+            df_to_records(df),
+            [
+                {"nested": "[1, 2]", "mixed_nested": "a"},
+                {"nested": None, "mixed_nested": '{"b": 1}'},
+                {"nested": "c", "mixed_nested": None},
+            ],
+        )
+
+    def test_from_batches(self):
+        batches = [[(None, 1), (None, 2)], [("a", 3.5)], []]
+        cursor_descr = [("a",), ("b",)]
+        results = SupersetResultSet.from_batches(
+            iter(batches), cursor_descr, BaseEngineSpec
+        )
+        self.assertEqual(results.size, 3)
+        self.assertEqual(results.columns[0]["type"], "STRING")
+        self.assertEqual(results.columns[1]["type"], "FLOAT")
+        df = results.to_pandas_df()
+        self.assertEqual(
+            df_to_records(df),
+            [{"a": None, "b": 1.0}, {"a": None, "b": 2.0}, {"a": "a", "b": 3.5}],
+        )
+
+    def test_from_batches_empty(self):
+        cursor_descr = [("a", "string")]
+        results = SupersetResultSet.from_batches(iter([]), cursor_descr, BaseEngineSpec)
+        self.assertEqual(results.size, 0)
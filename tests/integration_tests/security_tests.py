@@ -18,8 +18,6 @@
 import inspect
 import re
 import unittest
-from collections import namedtuple
-from unittest import mock
 from unittest.mock import Mock, patch
 from typing import Any, Dict
 
@@ -974,6 +972,54 @@ class TestSecurityManager(SupersetTestCase):
 
         self.assertFalse(security_manager.can_access_table(database, table))
 
+    def test_get_user_permissions(self):
+        user = security_manager.find_user("gamma")
+        role = security_manager.find_role("Gamma")
+        pvm = security_manager.find_permission_view_menu(
+            "all_database_access", "all_database_access"
+        )
+        pair = ("all_database_access", "all_database_access")
+
+        for cache_timeout in (0, 60):
+            with patch.dict(
+                app.config, {"PERMISSIONS_CACHE_TIMEOUT": cache_timeout}
+            ), app.test_request_context():
+                permissions = security_manager.get_user_permissions(user)
+                self.assertIn(("can_read", "Dashboard"), permissions)
+                self.assertNotIn(pair, permissions)
+
+                security_manager.add_permission_role(role, pvm)
+                try:
+                    self.assertIn(pair, security_manager.get_user_permissions(user))
+                finally:
+                    security_manager.del_permission_role(role, pvm)
+                self.assertNotIn(pair, security_manager.get_user_permissions(user))
+
+    @patch("superset.security.SupersetSecurityManager.get_user_permissions")
+    def test_has_view_access_outside_request(self, mock_get_user_permissions):
+        user = security_manager.find_user("gamma")
+
+        # the permissions aren't compiled when they can't be kept
+        with patch.dict(app.config, {"PERMISSIONS_CACHE_TIMEOUT": 0}):
+            self.assertTrue(
+                security_manager._has_view_access(user, "can_read", "Dashboard")
+            )
+            self.assertFalse(
+                security_manager._has_view_access(
+                    user, "all_database_access", "all_database_access"
+                )
+            )
+        mock_get_user_permissions.assert_not_called()
+
+        with patch.dict(app.config, {"PERMISSIONS_CACHE_TIMEOUT": 60}):
+            mock_get_user_permissions.return_value = frozenset(
+                [("can_read", "Dashboard")]
+            )
+            self.assertTrue(
+                security_manager._has_view_access(user, "can_read", "Dashboard")
+            )
+        mock_get_user_permissions.assert_called_once_with(user)
+
     @patch("superset.security.SupersetSecurityManager.can_access")
     @patch("superset.security.SupersetSecurityManager.can_access_schema")
     def test_raise_for_access_datasource(self, mock_can_access_schema, mock_can_access):
@@ -1002,6 +1048,29 @@ class TestSecurityManager(SupersetTestCase):
         with self.assertRaises(SupersetSecurityException):
             security_manager.raise_for_access(query=query)
 
+    @patch("superset.security.manager.g")
+    @patch("superset.connectors.sqla.models.SqlaTable.query_datasources_by_name")
+    def test_raise_for_access_query_cached(self, mock_query_datasources, mock_g):
+        mock_g.user = security_manager.find_user("gamma")
+        mock_query_datasources.return_value = []
+        query = Mock(
+            database=get_example_database(), schema="bar", sql="SELECT * FROM foo"
+        )
+
+        # Start from a fresh permissions version
+        security_manager.invalidate_permissions()
+        with patch.dict(app.config, {"TABLE_ACCESS_CACHE_TIMEOUT": 60}):
+            for _ in range(2):
+                with self.assertRaises(SupersetSecurityException):
+                    security_manager.raise_for_access(query=query)
+            mock_query_datasources.assert_called_once()
+
+            # Changing the permissions invalidates the decisions
+            security_manager.invalidate_permissions()
+            with self.assertRaises(SupersetSecurityException):
+                security_manager.raise_for_access(query=query)
+            assert mock_query_datasources.call_count == 2
+
     @patch("superset.security.SupersetSecurityManager.can_access")
     @patch("superset.security.SupersetSecurityManager.can_access_schema")
     def test_raise_for_access_query_context(
@@ -1214,6 +1283,32 @@ class TestRowLevelSecurity(SupersetTestCase):
         assert not self.NAMES_Q_REGEX.search(sql)
         assert not self.BASE_FILTER_REGEX.search(sql)
 
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_rls_filter_index(self):
+        g.user = self.get_user(username="NoRlsRoleUser")
+        tbl = self.get_table_by_name("birth_names")
+
+        with patch.dict(app.config, {"RLS_FILTERS_CACHE_TIMEOUT": 60}):
+            filters = security_manager.get_rls_filters(tbl)
+            assert [f.clause for f in filters] == ["gender = 'boy'"]
+
+            with patch(
+                "superset.security.SupersetSecurityManager._load_rls_filter_index"
+            ) as mock_load:
+                assert security_manager.get_rls_filters(tbl) == filters
+                mock_load.assert_not_called()
+
+            # Editing a filter invalidates the index
+            self.rls_entry4.clause = "gender = 'girl'"
+            db.session.commit()
+            filters = security_manager.get_rls_filters(tbl)
+            assert [f.clause for f in filters] == ["gender = 'girl'"]
+
+            g.user = self.get_user(username="gamma")
+            assert security_manager.get_rls_ids(tbl) == sorted(
+                [self.rls_entry2.id, self.rls_entry3.id, self.rls_entry4.id]
+            )
+
 
 class TestAccessRequestEndpoints(SupersetTestCase):
     def test_access_request_disabled(self):
@@ -1233,84 +1328,52 @@ class TestAccessRequestEndpoints(SupersetTestCase):
 
 class TestDatasources(SupersetTestCase):
     @patch("superset.security.manager.g")
-    @patch("superset.security.SupersetSecurityManager.can_access_database")
-    @patch("superset.security.SupersetSecurityManager.get_session")
-    def test_get_user_datasources_admin(
-        self, mock_get_session, mock_can_access_database, mock_g
-    ):
-        Datasource = namedtuple("Datasource", ["database", "schema", "name"])
+    def test_get_user_datasources_admin(self, mock_g):
         mock_g.user = security_manager.find_user("admin")
-        mock_can_access_database.return_value = True
-        mock_get_session.query.return_value.filter.return_value.all.return_value = []
-
-        with mock.patch.object(
-            ConnectorRegistry, "get_all_datasources"
-        ) as mock_get_all_datasources:
-            mock_get_all_datasources.return_value = [
-                Datasource("database1", "schema1", "table1"),
-                Datasource("database1", "schema1", "table2"),
-                Datasource("database2", None, "table1"),
-            ]
-
-            datasources = security_manager.get_user_datasources()
-
-        assert sorted(datasources) == [
-            Datasource("database1", "schema1", "table1"),
-            Datasource("database1", "schema1", "table2"),
-            Datasource("database2", None, "table1"),
-        ]
 
-    @patch("superset.security.manager.g")
-    @patch("superset.security.SupersetSecurityManager.can_access_database")
-    @patch("superset.security.SupersetSecurityManager.get_session")
-    def test_get_user_datasources_gamma(
-        self, mock_get_session, mock_can_access_database, mock_g
-    ):
-        Datasource = namedtuple("Datasource", ["database", "schema", "name"])
-        mock_g.user = security_manager.find_user("gamma")
-        mock_can_access_database.return_value = False
-        mock_get_session.query.return_value.filter.return_value.all.return_value = []
+        datasources = security_manager.get_user_datasources()
 
-        with mock.patch.object(
-            ConnectorRegistry, "get_all_datasources"
-        ) as mock_get_all_datasources:
-            mock_get_all_datasources.return_value = [
-                Datasource("database1", "schema1", "table1"),
-                Datasource("database1", "schema1", "table2"),
-                Datasource("database2", None, "table1"),
-            ]
-
-            datasources = security_manager.get_user_datasources()
-
-        assert datasources == []
+        assert set(datasources) == set(
+            ConnectorRegistry.get_all_datasources(db.session)
+        )
 
     @patch("superset.security.manager.g")
-    @patch("superset.security.SupersetSecurityManager.can_access_database")
-    @patch("superset.security.SupersetSecurityManager.get_session")
-    def test_get_user_datasources_gamma_with_schema(
-        self, mock_get_session, mock_can_access_database, mock_g
-    ):
-        Datasource = namedtuple("Datasource", ["database", "schema", "name"])
+    def test_get_user_datasources_gamma(self, mock_g):
         mock_g.user = security_manager.find_user("gamma")
-        mock_can_access_database.return_value = False
 
-        mock_get_session.query.return_value.filter.return_value.all.return_value = [
-            Datasource("database1", "schema1", "table1"),
-            Datasource("database1", "schema1", "table2"),
-        ]
+        datasources = security_manager.get_user_datasources()
 
-        with mock.patch.object(
-            ConnectorRegistry, "get_all_datasources"
-        ) as mock_get_all_datasources:
-            mock_get_all_datasources.return_value = [
-                Datasource("database1", "schema1", "table1"),
-                Datasource("database1", "schema1", "table2"),
-                Datasource("database2", None, "table1"),
-            ]
-
-            datasources = security_manager.get_user_datasources()
+        # The access resolved in SQL matches the per datasource checks
+        assert set(datasources) == {
+            datasource
+            for datasource in ConnectorRegistry.get_all_datasources(db.session)
+            if security_manager.can_access_datasource(datasource)
+        }
 
-        assert sorted(datasources) == [
-            Datasource("database1", "schema1", "table1"),
-            Datasource("database1", "schema1", "table2"),
-        ]
+    @patch("superset.security.manager.g")
+    def test_get_user_datasources_gamma_with_schema(self, mock_g):
+        mock_g.user = security_manager.find_user("gamma")
+        table = SqlaTable(
+            table_name="tmp_perm_table",
+            schema="tmp_perm_schema",
+            database=get_example_database(),
+        )
+        db.session.add(table)
+        db.session.commit()
+        assert table not in security_manager.get_user_datasources()
+
+        gamma_role = security_manager.find_role("Gamma")
+        pvm = security_manager.find_permission_view_menu(
+            "schema_access", table.schema_perm
+        )
+        security_manager.add_permission_role(gamma_role, pvm)
+        try:
+            assert table in security_manager.get_user_datasources()
+            assert table.id in {
+                id_
+                for id_, in security_manager.get_accessible_datasource_ids(SqlaTable)
+            }
+        finally:
+            security_manager.del_permission_role(gamma_role, pvm)
+            db.session.delete(table)
+            db.session.commit()
@@ -18,7 +18,13 @@ import unittest
 
 import sqlparse
 
-from superset.sql_parse import ParsedQuery, strip_comments_from_sql, Table
+from superset.sql_parse import (
+    _extract_limit_from_query,
+    _parse_sql,
+    ParsedQuery,
+    strip_comments_from_sql,
+    Table,
+)
 
 
 class TestSupersetSqlParse(unittest.TestCase):
@@ -755,3 +761,65 @@ class TestSupersetSqlParse(unittest.TestCase):
             strip_comments_from_sql("SELECT '--abc' as abc, col2 FROM table1\n")
             == "SELECT '--abc' as abc, col2 FROM table1"
         )
+
+    def test_limit_without_grouping(self):
+        """Test that the limit is extracted as from the grouped statements"""
+        queries = [
+            "SELECT * FROM t",
+            "SELECT * FROM t LIMIT 10",
+            "select * from t limit 5 offset 3",
+            "SELECT * FROM t LIMIT 10, 20",
+            "SELECT * FROM t LIMIT a, 10",
+            "SELECT * FROM (SELECT * FROM a LIMIT 3) AS b",
+            "SELECT * FROM (SELECT * FROM a LIMIT 3) AS b LIMIT\n\n\n\n\n\n 7",
+            "SELECT * FROM (SELECT * FROM a LIMIT 3",
+            "SELECT 1 LIMIT 2; SELECT 2 LIMIT 4",
+            "SELECT 1 LIMIT 4; -- comment",
+            "SELECT limit FROM t",
+        ]
+        for query in queries:
+            limit = None
+            for statement in sqlparse.parse(query):
+                limit = _extract_limit_from_query(statement)
+            assert ParsedQuery(query).limit == limit, query
+
+    def test_parse_result_cache(self):
+        query = "SELECT * FROM tbname LIMIT 10"
+        ParsedQuery(query)
+        hits = _parse_sql.cache_info().hits
+
+        parsed = ParsedQuery(query)
+        assert _parse_sql.cache_info().hits == hits + 1
+        assert parsed.limit == 10
+        assert parsed.get_statements() == [query]
+
+        parsed.tables.add(Table("other"))
+        assert ParsedQuery(query).tables == {Table("tbname")}
+        assert ParsedQuery(query).set_or_update_query_limit(5) == (
+            "SELECT * FROM tbname LIMIT 5"
+        )
+        assert ParsedQuery(query).set_or_update_query_limit(20) == query
+
+    def test_set_table_sample(self):
+        clause = "TABLESAMPLE SYSTEM (1)"
+
+        def sample(sql: str, before_alias: bool = False) -> str:
+            return ParsedQuery(sql).set_table_sample(clause, before_alias)
+
+        assert sample("SELECT * FROM s.t AS a WHERE x = 1 LIMIT 10") == (
+            "SELECT * FROM s.t AS a TABLESAMPLE SYSTEM (1) WHERE x = 1 LIMIT 10"
+        )
+        assert sample("SELECT * FROM a JOIN b ON a.id = b.id") == (
+            "SELECT * FROM a TABLESAMPLE SYSTEM (1) "
+            "JOIN b TABLESAMPLE SYSTEM (1) ON a.id = b.id"
+        )
+        assert sample("SELECT * FROM (SELECT * FROM t) sub") == (
+            "SELECT * FROM (SELECT * FROM t TABLESAMPLE SYSTEM (1)) sub"
+        )
+        assert sample("WITH cte AS (SELECT * FROM t) SELECT * FROM cte") == (
+            "WITH cte AS (SELECT * FROM t TABLESAMPLE SYSTEM (1)) SELECT * FROM cte"
+        )
+        assert sample("SELECT * FROM t a", before_alias=True) == (
+            "SELECT * FROM t TABLESAMPLE SYSTEM (1) a"
+        )
+        assert sample("SELECT 1") == "SELECT 1"
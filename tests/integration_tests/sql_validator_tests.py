@@ -21,17 +21,22 @@ import unittest
 from unittest.mock import MagicMock, patch
 
 import pytest
+from flask_caching.backends import SimpleCache
 from pyhive.exc import DatabaseError
 
 from superset import app
 from superset.sql_validators import SQLValidationAnnotation
-from superset.sql_validators.base import BaseSQLValidator
+from superset.sql_validators.base import (
+    BaseSQLValidator,
+    SQLValidationRequest,
+    SQLValidationSupersededError,
+)
 from superset.sql_validators.postgres import PostgreSQLValidator
 from superset.sql_validators.presto_db import (
     PrestoDBSQLValidator,
     PrestoSQLValidationError,
 )
-from superset.utils.core import get_example_database
+from superset.utils.core import get_example_database, QuerySource
 
 from .base_tests import SupersetTestCase
 
@@ -122,6 +127,32 @@ class TestSqlValidatorEndpoint(SupersetTestCase):
             self.assertIn("error", resp)
             self.assertIn("Kaboom!", resp["error"])
 
+    @patch("superset.views.core.get_validator_by_name")
+    @patch.dict(
+        "superset.extensions.feature_flag_manager._feature_flags",
+        PRESTO_TEST_FEATURE_FLAGS,
+        clear=True,
+    )
+    def test_validate_sql_endpoint_superseded(self, get_validator_by_name):
+        """Assert that validate_sql_json returns a conflict when the validation
+        was superseded by a newer one"""
+        if get_example_database().backend == "hive":
+            pytest.skip("Hive validator is not implemented")
+        self.login("admin")
+
+        validator = MagicMock()
+        get_validator_by_name.return_value = validator
+        validator.validate.side_effect = SQLValidationSupersededError()
+
+        dbid = get_example_database().id
+        resp = self.client.post(
+            "/superset/validate_sql_json/",
+            data=dict(database_id=dbid, sql="SELECT 1", sql_editor_id="1"),
+        )
+        self.assertEqual(resp.status_code, 409)
+        validation_request = validator.validate.call_args[0][3]
+        self.assertIsInstance(validation_request, SQLValidationRequest)
+
 
 class TestBaseValidator(SupersetTestCase):
     """Testing for the base sql validator"""
@@ -200,6 +231,59 @@ class TestPrestoValidator(SupersetTestCase):
 
         self.assertEqual(1, len(errors))
 
+    @patch("superset.sql_validators.presto_db.cache_manager")
+    @patch("superset.sql_validators.presto_db.g")
+    def test_validator_cached(self, flask_g, cache_manager):
+        flask_g.user.username = "nobody"
+        cache_manager.cache = SimpleCache()
+        self.database.id = 1
+        self.database.impersonate_user = False
+        execute = self.database.db_engine_spec.execute
+        schema = "default"
+
+        with patch.dict(app.config, {"SQLLAB_VALIDATION_CACHE_TIMEOUT": 60}):
+            self.validator.validate(
+                "SELECT 1; SELECT 2; SELECT 1", schema, self.database
+            )
+            self.assertEqual(2, execute.call_count)
+
+            # only the statements that changed are validated again
+            self.validator.validate("SELECT 1; SELECT 3", schema, self.database)
+            self.assertEqual(3, execute.call_count)
+            self.database.get_sqla_engine.assert_called_with(
+                schema=schema,
+                nullpool=True,
+                user_name="nobody",
+                source=QuerySource.SQL_LAB,
+            )
+
+            # errors are cached as well
+            fetch_fn = self.database.db_engine_spec.fetch_data
+            fetch_fn.side_effect = DatabaseError(self.PRESTO_ERROR_TEMPLATE)
+            errors = self.validator.validate("SELECT 4", schema, self.database)
+            self.assertEqual(1, len(errors))
+            fetch_fn.side_effect = None
+            errors = self.validator.validate("SELECT 4", schema, self.database)
+            self.assertEqual(1, len(errors))
+            self.assertEqual(4, execute.call_count)
+
+    @patch("superset.sql_validators.base.cache_manager")
+    @patch("superset.sql_validators.presto_db.g")
+    def test_validator_superseded(self, flask_g, cache_manager):
+        flask_g.user.username = "nobody"
+        cache_manager.cache = SimpleCache()
+        sql = "SELECT 1 FROM default.notarealtable"
+        schema = "default"
+
+        validation_request = SQLValidationRequest(1, "editor", timeout=10)
+        self.assertFalse(validation_request.is_superseded())
+        SQLValidationRequest(1, "editor", timeout=10)
+        self.assertTrue(validation_request.is_superseded())
+
+        with self.assertRaises(SQLValidationSupersededError):
+            self.validator.validate(sql, schema, self.database, validation_request)
+        self.database.db_engine_spec.execute.assert_not_called()
+
     def test_validate_sql_endpoint(self):
         self.login("admin")
         # NB this is effectively an integration test -- when there's a default
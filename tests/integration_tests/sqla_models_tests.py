@@ -424,3 +424,79 @@ class TestDatabaseModel(SupersetTestCase):
         db.session.delete(table)
         db.session.delete(database)
         db.session.commit()
+
+    def test_row_window(self):
+        query_obj = {
+            "granularity": None,
+            "from_dttm": None,
+            "to_dttm": None,
+            "groupby": ["user"],
+            "metrics": [],
+            "is_timeseries": False,
+            "filter": [],
+            "extras": {},
+            "row_limit": 20,
+            "row_offset": 40,
+        }
+
+        database = Database(database_name="testdb", sqlalchemy_uri="sqlite://")
+        table = SqlaTable(table_name="test_table", database=database)
+        db.session.add(database)
+        db.session.add(table)
+        db.session.commit()
+
+        # pages are sorted even when no order is requested
+        sqlaq = table.get_sqla_query(**query_obj)
+        sql = table.database.compile_sqla_query(sqlaq.sqla_query)
+        assert "ORDER BY" in sql
+        assert "LIMIT 20" in sql
+        assert "OFFSET 40" in sql
+        assert sqlaq.skipped_rows == 0
+
+        # the row count ignores the page
+        sqlaq = table.get_sqla_query(**query_obj, is_rowcount=True)
+        sql = table.database.compile_sqla_query(sqlaq.sqla_query)
+        assert "ORDER BY" not in sql
+        assert "OFFSET" not in sql
+        assert "LIMIT 20" in sql
+
+        # the offset is applied after fetching the rows
+        with patch.object(table.db_engine_spec, "allows_offset", False):
+            sqlaq = table.get_sqla_query(**query_obj)
+        sql = table.database.compile_sqla_query(sqlaq.sqla_query)
+        assert "OFFSET" not in sql
+        assert "LIMIT 60" in sql
+        assert sqlaq.skipped_rows == 40
+
+        db.session.delete(table)
+        db.session.delete(database)
+        db.session.commit()
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_row_window_pages(self):
+        table = self.get_table_by_name("birth_names")
+        query_obj = {
+            "granularity": None,
+            "from_dttm": None,
+            "to_dttm": None,
+            "groupby": ["name"],
+            "metrics": ["count"],
+            "is_timeseries": False,
+            "filter": [],
+            "extras": {},
+            "row_limit": 10,
+        }
+
+        # the first page is sorted too, so that it doesn't overlap the next one
+        sqlaq = table.get_sqla_query(**query_obj, row_offset=0)
+        sql = table.database.compile_sqla_query(sqlaq.sqla_query)
+        assert "ORDER BY" in sql
+
+        first_page = table.query({**query_obj, "row_offset": 0}).df
+        second_page = table.query({**query_obj, "row_offset": 10}).df
+        both_pages = table.query({**query_obj, "row_limit": 20, "row_offset": 0}).df
+        assert len(first_page) == len(second_page) == 10
+        assert not set(first_page["name"]) & set(second_page["name"])
+        assert list(first_page["name"]) + list(second_page["name"]) == list(
+            both_pages["name"]
+        )
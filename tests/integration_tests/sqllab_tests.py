@@ -24,7 +24,7 @@ from celery.exceptions import SoftTimeLimitExceeded
 from parameterized import parameterized
 from random import random
 from unittest import mock
-from superset.extensions import db
+from superset.extensions import async_query_manager, db
 import prison
 
 from superset import db, security_manager
@@ -33,9 +33,18 @@ from superset.db_engine_specs import BaseEngineSpec
 from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
 from superset.exceptions import SupersetErrorException
 from superset.models.core import Database
-from superset.models.sql_lab import LimitingFactor, Query, SavedQuery
+from superset.models.sql_lab import (
+    get_search_terms,
+    LimitingFactor,
+    Query,
+    QuerySearchTerm,
+    SavedQuery,
+    SEARCH_MAX_WORDS,
+    SEARCH_PARTIAL_TERM,
+)
 from superset.result_set import SupersetResultSet
 from superset.sql_lab import (
+    check_query_cost,
     execute_sql_statements,
     execute_sql_statement,
     get_sql_results,
@@ -47,13 +56,16 @@ from superset.utils.core import (
     datetime_to_epoch,
     get_example_database,
     get_main_database,
+    zlib_decompress,
 )
+from superset.views.utils import _deserialize_results_payload
 
 from .base_tests import SupersetTestCase
 from .conftest import CTAS_SCHEMA_NAME
 from tests.integration_tests.fixtures.birth_names_dashboard import (
     load_birth_names_dashboard_with_slices,
 )
+from tests.integration_tests.test_app import app
 
 QUERY_1 = "SELECT * FROM birth_names LIMIT 1"
 QUERY_2 = "SELECT * FROM NO_TABLE"
@@ -345,6 +357,70 @@ class TestSqlLab(SupersetTestCase):
         # Redirects to the login page
         self.assertEqual(401, resp.status_code)
 
+    @mock.patch.dict(
+        "superset.extensions.feature_flag_manager._feature_flags",
+        GLOBAL_ASYNC_QUERIES=True,
+    )
+    def test_queries_feed(self):
+        async_query_manager.init_app(app)
+        self.login("admin")
+        admin = security_manager.find_user("admin")
+        query = Query(
+            client_id="client_id_feed",
+            database_id=get_example_database().id,
+            user_id=admin.id,
+            sql="SELECT 1",
+        )
+        with mock.patch.object(
+            async_query_manager, "publish_query_updates"
+        ) as publish_query_updates:
+            db.session.add(query)
+            db.session.commit()
+            query.progress = 50
+            db.session.commit()
+
+        (_, inserted), (_, updated) = [
+            call[0] for call in publish_query_updates.call_args_list
+        ]
+        assert inserted[0]["id"] == "client_id_feed"
+        assert inserted[0]["sql"] == "SELECT 1"
+        assert set(updated[0]) == {
+            "id",
+            "queryId",
+            "serverId",
+            "changedOn",
+            "changed_on",
+            "progress",
+        }
+        assert updated[0]["progress"] == 50
+
+        with mock.patch.object(async_query_manager._redis, "xread") as xread:
+            xread.return_value = [
+                (
+                    "stream",
+                    [
+                        (
+                            "1607477697866-0",
+                            {"data": json.dumps(updated[0], default=str)},
+                        )
+                    ],
+                )
+            ]
+            data = self.get_json_resp("/superset/queries_feed/?last_id=1-0")
+            assert (
+                xread.call_args[1]["block"] == app.config["SQLLAB_QUERY_FEED_TIMEOUT"]
+            )
+
+            # the feed doesn't wait for changes without a timeout
+            with mock.patch.dict(app.config, {"SQLLAB_QUERY_FEED_TIMEOUT": 0}):
+                self.get_json_resp("/superset/queries_feed/?last_id=1-0")
+            assert xread.call_args[1]["block"] is None
+        assert data["last_id"] == "1607477697866-0"
+        assert data["result"][0]["progress"] == 50
+
+        db.session.delete(query)
+        db.session.commit()
+
     def test_search_query_on_db_id(self):
         self.run_some_queries()
         self.login("admin")
@@ -403,6 +479,87 @@ class TestSqlLab(SupersetTestCase):
         self.assertEqual(2, len(data))
         self.assertIn("birth", data[0]["sql"])
 
+    @mock.patch.dict(app.config, {"SQLLAB_QUERY_SEARCH_INDEX": True})
+    def test_search_query_index(self):
+        self.run_some_queries()
+        self.login("admin")
+        terms = db.session.query(QuerySearchTerm.term).filter(
+            QuerySearchTerm.query_id.in_(db.session.query(Query.id))
+        )
+        self.assertIn(("table:birth_names",), terms.all())
+
+        data = self.get_json_resp("/superset/search_queries?search_text=birth")
+        self.assertEqual([QUERY_1, QUERY_3], [query["sql"] for query in data])
+
+        # the text can start and end in the middle of words
+        data = self.get_json_resp("/superset/search_queries?search_text=names")
+        self.assertEqual([QUERY_1, QUERY_3], [query["sql"] for query in data])
+        data = self.get_json_resp("/superset/search_queries?search_text=ECT * FR")
+        self.assertEqual([QUERY_1, QUERY_2, QUERY_3], [query["sql"] for query in data])
+        data = self.get_json_resp(
+            "/superset/search_queries?search_text=irth_names LIMIT 10"
+        )
+        self.assertEqual([QUERY_3], [query["sql"] for query in data])
+
+        data = self.get_json_resp("/superset/search_queries?table=no_table")
+        self.assertEqual([QUERY_2], [query["sql"] for query in data])
+
+        # the next page starts after the last query of the previous one
+        first = self.get_json_resp("/superset/search_queries?search_text=birth")[0]
+        data = self.get_json_resp(
+            "/superset/search_queries?search_text=birth"
+            f"&after_start_time={first['startDttm']}&after_id={first['queryId']}"
+        )
+        self.assertEqual([QUERY_3], [query["sql"] for query in data])
+
+        resp = self.client.get("/superset/search_queries?after_start_time=a&after_id=1")
+        self.assertEqual(resp.status_code, 400)
+
+    def test_get_search_terms(self):
+        self.assertEqual(
+            get_search_terms("SELECT name FROM main.birth_names WHERE name = 'a'"),
+            [
+                "select",
+                "name",
+                "from",
+                "main",
+                "birth_names",
+                "where",
+                "a",
+                "table:birth_names",
+                "table:main.birth_names",
+            ],
+        )
+
+        # queries with too many words are matched by any search
+        sql = " ".join(f"w{i}" for i in range(SEARCH_MAX_WORDS + 1))
+        terms = get_search_terms(sql)
+        self.assertEqual(len(terms), SEARCH_MAX_WORDS + 1)
+        self.assertEqual(terms[-1], SEARCH_PARTIAL_TERM)
+
+    def test_check_query_cost(self):
+        query = mock.MagicMock(id=1, schema=None)
+        db_engine_spec = query.database.db_engine_spec
+        db_engine_spec.engine = "postgresql"
+        db_engine_spec.estimate_query_cost.return_value = [
+            {"Total cost": 10.0},
+            {"Total cost": 1000.0},
+        ]
+        db_engine_spec.get_query_cost_metrics.side_effect = lambda cost: cost
+        thresholds = {"postgresql": {"Total cost": 100.0}}
+
+        with mock.patch.dict(app.config, {"SQLLAB_QUERY_COST_THRESHOLDS": thresholds}):
+            with pytest.raises(SupersetErrorException) as excinfo:
+                check_query_cost(query, "SELECT 1; SELECT 2", "admin")
+            assert (
+                excinfo.value.error.error_type
+                == SupersetErrorType.QUERY_COST_EXCEEDED_ERROR
+            )
+
+            # queries whose cost can't be estimated are run
+            db_engine_spec.estimate_query_cost.side_effect = Exception("Failed")
+            check_query_cost(query, "SELECT 1; SELECT 2", "admin")
+
     def test_search_query_on_time(self):
         self.run_some_queries()
         self.login("admin")
@@ -770,6 +927,87 @@ class TestSqlLab(SupersetTestCase):
             ]
         )
 
+    @mock.patch("superset.sql_lab.check_query_cost")
+    @mock.patch("superset.sql_lab.get_query")
+    @mock.patch("superset.sql_lab.execute_sql_statement")
+    def test_execute_sql_statements_query_cost(
+        self, mock_execute_sql_statement, mock_get_query, mock_check_query_cost
+    ):
+        mock_query = mock.MagicMock()
+        mock_query.database.allow_run_async = False
+        mock_query.database.db_engine_spec.run_multiple_statements_as_one = False
+        mock_get_query.return_value = mock_query
+        kwargs = dict(
+            query_id=1,
+            rendered_query="SELECT 1",
+            return_results=False,
+            store_results=True,
+            user_name="admin",
+            session=mock.MagicMock(),
+            start_time=None,
+            expand_data=False,
+            log_params=None,
+        )
+
+        # synchronous queries that store their results are not estimated
+        execute_sql_statements(**kwargs)
+        mock_check_query_cost.assert_not_called()
+
+        execute_sql_statements(**kwargs, is_async=True)
+        mock_check_query_cost.assert_called_once_with(mock_query, "SELECT 1", "admin")
+
+    @mock.patch.dict("superset.sql_lab.config", {"RESULTS_BACKEND_CHUNKED": False})
+    @mock.patch("superset.sql_lab.results_backend_use_msgpack", True)
+    @mock.patch("superset.sql_lab.results_backend")
+    @mock.patch("superset.sql_lab.get_query")
+    @mock.patch("superset.sql_lab.execute_sql_statement")
+    def test_execute_sql_statements_store_and_return_results(
+        self, mock_execute_sql_statement, mock_get_query, mock_results_backend
+    ):
+        db_engine_spec = BaseEngineSpec()
+        mock_query = mock.MagicMock()
+        mock_query.database.allow_run_async = False
+        mock_query.database.cache_timeout = 0
+        mock_query.database.db_engine_spec = db_engine_spec
+        mock_get_query.return_value = mock_query
+        mock_execute_sql_statement.return_value = SupersetResultSet(
+            [(1, {"a": 1}), (2, None)],
+            [("id", "int"), ("nested", "json")],
+            db_engine_spec,
+        )
+
+        with mock.patch.object(
+            db_engine_spec, "expand_data", wraps=db_engine_spec.expand_data
+        ) as expand_data, mock.patch.object(
+            SupersetResultSet,
+            "convert_table_to_df",
+            wraps=SupersetResultSet.convert_table_to_df,
+        ) as convert_table_to_df:
+            payload = execute_sql_statements(
+                query_id=1,
+                rendered_query="SELECT 1",
+                return_results=True,
+                store_results=True,
+                user_name="admin",
+                session=mock.MagicMock(),
+                start_time=None,
+                expand_data=True,
+                log_params=None,
+            )
+            # the Arrow table is serialized for the results backend, and
+            # converted to records only once for the client
+            convert_table_to_df.assert_called_once()
+            expand_data.assert_called_once()
+
+        # the records match the ones read back from the results backend
+        stored_payload = zlib_decompress(
+            mock_results_backend.set.call_args[0][1], decode=False
+        )
+        results = _deserialize_results_payload(stored_payload, mock_query, True)
+        assert payload["data"] == results["data"]
+        assert payload["columns"] == results["columns"]
+        assert payload["expanded_columns"] == results["expanded_columns"]
+
     @mock.patch("superset.sql_lab.results_backend", None)
     @mock.patch("superset.sql_lab.get_query")
     @mock.patch("superset.sql_lab.execute_sql_statement")
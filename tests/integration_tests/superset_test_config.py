@@ -99,6 +99,9 @@ DATA_CACHE_CONFIG = {
     "CACHE_KEY_PREFIX": "superset_data_cache",
 }
 
+# the validators are tested against mocked databases, which can't be cache keys
+SQLLAB_VALIDATION_CACHE_TIMEOUT = 0
+
 GLOBAL_ASYNC_QUERIES_JWT_SECRET = "test-secret-change-me-test-secret-change-me"
 
 ALERT_REPORTS_WORKING_TIME_OUT_KILL = True
@@ -78,3 +78,25 @@ def test_df_to_escaped_csv():
         ["a", "'=b"],  # pandas seems to be removing the leading ""
         ["' =a", "b"],
     ]
+
+
+def test_df_to_escaped_csv_chunks():
+    df = pd.DataFrame({"=col_a": ["a", "=b", "c", "d", "@e"], "col_b": range(5)})
+
+    chunks = list(csv.df_to_escaped_csv_chunks([df, df.iloc[:0]], 2, index=False))
+
+    assert chunks == [
+        "'=col_a,col_b\na,0\n'=b,1\n",
+        "c,2\nd,3\n",
+        "'@e,4\n",
+        "",
+    ]
+    assert "".join(chunks) == csv.df_to_escaped_csv(df, index=False)
+
+
+def test_df_to_escaped_csv_chunks_empty():
+    df = pd.DataFrame({"col_a": [], "col_b": []})
+
+    chunks = list(csv.df_to_escaped_csv_chunks([df], index=False))
+
+    assert chunks == ["col_a,col_b\n"]
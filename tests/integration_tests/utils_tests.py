@@ -22,6 +22,7 @@ from decimal import Decimal
 import json
 import os
 import re
+import signal
 from typing import Any, Tuple, List, Optional
 from unittest.mock import Mock, patch
 from tests.integration_tests.fixtures.birth_names_dashboard import (
@@ -64,6 +65,7 @@ from superset.utils.core import (
     parse_ssl_cert,
     parse_js_uri_path_item,
     extract_dataframe_dtypes,
+    SigalrmTimeout,
     split,
     TimeRangeEndpoint,
     validate_json,
@@ -1067,6 +1069,16 @@ class TestUtils(SupersetTestCase):
         assert cast_to_num(None) is None
         assert cast_to_num("this is not a string") is None
 
+    def test_nested_sigalrm_timeout(self):
+        outer = SigalrmTimeout(seconds=60)
+        with outer:
+            with SigalrmTimeout(seconds=1):
+                pass
+            # the enclosing timeout is still armed with its own handler
+            assert signal.getsignal(signal.SIGALRM) == outer.handle_timeout
+            assert 0 < signal.alarm(60) <= 60
+        assert signal.alarm(0) == 0
+
     def test_get_form_data_token(self):
         assert get_form_data_token({"token": "token_abcdefg1"}) == "token_abcdefg1"
         generated_token = get_form_data_token({})
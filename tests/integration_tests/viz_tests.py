@@ -421,6 +421,42 @@ class TestTableViz(SupersetTestCase):
             }
         )
 
+    def test_query_obj_server_pagination(self):
+        datasource = self.get_datasource_mock()
+        datasource.type = "table"
+        form_data = {
+            "all_columns": ["colA", "colB"],
+            "row_limit": 1000,
+            "server_pagination": True,
+            "server_page_length": 20,
+            "server_page": 3,
+        }
+        test_viz = viz.TableViz(datasource, form_data)
+        query_obj = test_viz.query_obj()
+        self.assertEqual(20, query_obj["row_limit"])
+        self.assertEqual(60, query_obj["row_offset"])
+
+        # the first page is a row window too
+        test_viz = viz.TableViz(datasource, {**form_data, "server_page": 0})
+        self.assertEqual(0, test_viz.query_obj()["row_offset"])
+
+        # the pages are capped by the row limit of the chart
+        form_data["row_limit"] = 70
+        test_viz = viz.TableViz(datasource, form_data)
+        query_obj = test_viz.query_obj()
+        self.assertEqual(10, query_obj["row_limit"])
+        self.assertEqual(60, query_obj["row_offset"])
+        test_viz = viz.TableViz(datasource, {**form_data, "server_page": 5})
+        query_obj = test_viz.query_obj()
+        self.assertEqual(10, query_obj["row_limit"])
+        self.assertEqual(60, query_obj["row_offset"])
+
+        datasource.type = "druid"
+        test_viz = viz.TableViz(datasource, form_data)
+        query_obj = test_viz.query_obj()
+        self.assertEqual(70, query_obj["row_limit"])
+        self.assertNotIn("row_offset", query_obj)
+
     def test_should_be_timeseries_raises_when_no_granularity(self):
         datasource = self.get_datasource_mock()
         form_data = {"include_time": True}
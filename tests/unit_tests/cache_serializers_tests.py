@@ -0,0 +1,66 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from superset.utils.cache_serializers import (
+    ArrowDataFrameSerializer,
+    DataFrameSerializer,
+    ParquetDataFrameSerializer,
+    SerializedDataFrame,
+)
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame(
+        {
+            "name": ["a", "b", None],
+            "value": [1.5, None, 3.0],
+            "count": [1, 2, 3],
+            "ds": [datetime(2021, 1, 1), datetime(2021, 1, 2), None],
+        },
+        index=pd.Index(["x", "y", "z"], name="key"),
+    )
+
+
+@pytest.mark.parametrize(
+    "serializer",
+    [
+        DataFrameSerializer(),
+        ArrowDataFrameSerializer(),
+        ArrowDataFrameSerializer(compression="lz4"),
+        ArrowDataFrameSerializer(compression=None),
+        ParquetDataFrameSerializer(),
+        ParquetDataFrameSerializer(compression="lz4"),
+    ],
+)
+def test_roundtrip(serializer, df):
+    value = serializer.dumps(df)
+
+    pd.testing.assert_frame_equal(serializer.loads(value), df)
+
+
+def test_arrow_payload(df):
+    value = ArrowDataFrameSerializer().dumps(df)
+
+    assert isinstance(value, SerializedDataFrame)
+    assert value.serializer == "arrow"
+    assert value.key is None
+    assert value.size == len(value.payload)
@@ -0,0 +1,79 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from unittest import mock
+
+from superset.utils.engine_registry import EngineRegistry
+
+
+def test_get_engine_reuses_engines():
+    registry = EngineRegistry(max_size=2)
+    factory = mock.Mock(side_effect=lambda: mock.Mock())
+
+    engine = registry.get_engine((1, "admin"), factory)
+
+    assert registry.get_engine((1, "admin"), factory) is engine
+    assert registry.get_engine((1, "alpha"), factory) is not engine
+    assert factory.call_count == 2
+
+
+def test_get_engine_evicts_least_recently_used():
+    registry = EngineRegistry(max_size=2)
+    engines = {key: registry.get_engine(key, mock.Mock) for key in ("a", "b")}
+    # "a" is now the most recently used engine
+    registry.get_engine("a", mock.Mock)
+
+    registry.get_engine("c", mock.Mock)
+
+    assert len(registry) == 2
+    assert "a" in registry
+    assert "b" not in registry
+    engines["b"].dispose.assert_called_once()
+    engines["a"].dispose.assert_not_called()
+
+
+def test_get_engine_replaces_stale_engines():
+    registry = EngineRegistry()
+    engine = registry.get_engine("a", mock.Mock, "settings")
+
+    assert registry.get_engine("a", mock.Mock, "settings") is engine
+    new_engine = registry.get_engine("a", mock.Mock, "other settings")
+
+    assert new_engine is not engine
+    assert len(registry) == 1
+    engine.dispose.assert_called_once()
+    new_engine.dispose.assert_not_called()
+
+
+def test_get_engine_after_fork():
+    registry = EngineRegistry()
+    engine = registry.get_engine("a", mock.Mock)
+
+    with mock.patch("superset.utils.engine_registry.os.getpid", return_value=-1):
+        new_engine = registry.get_engine("a", mock.Mock)
+
+    assert new_engine is not engine
+    engine.dispose.assert_not_called()
+
+
+def test_clear():
+    registry = EngineRegistry()
+    engine = registry.get_engine("a", mock.Mock)
+
+    registry.clear()
+
+    assert len(registry) == 0
+    engine.dispose.assert_called_once()
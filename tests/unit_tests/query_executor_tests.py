@@ -0,0 +1,140 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import threading
+import time
+
+import pytest
+from flask import Flask, g
+from sqlalchemy import Column, create_engine, ForeignKey, Integer, String
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship, Session
+
+from superset.utils.query_executor import load_attributes, QueryExecutor
+
+
+@pytest.fixture
+def executor():
+    app = Flask(__name__)
+    app.config.update(
+        CHART_DATA_MAX_CONCURRENT_QUERIES=2,
+        CHART_DATA_QUERY_POOL_SIZE=4,
+        CHART_DATA_CONCURRENT_QUERIES_TIMEOUT=1,
+    )
+    query_executor = QueryExecutor()
+    query_executor.init_app(app)
+    with app.test_request_context():
+        g.user = "admin"
+        yield query_executor
+
+
+def test_run_in_order_with_user(executor):
+    def query(value):
+        time.sleep(0.01 * (3 - value))
+        return value, g.user, threading.current_thread().name
+
+    results = executor.run(None, [lambda i=i: query(i) for i in range(3)], str)
+
+    assert [result[:2] for result in results] == [
+        (0, "admin"),
+        (1, "admin"),
+        (2, "admin"),
+    ]
+    assert all(result[2].startswith("query_executor_") for result in results)
+
+
+def test_run_bounded_concurrency(executor):
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def query():
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.pop()
+
+    executor.run(None, [query] * 5, str)
+
+    assert max(peak) == 2
+
+
+def test_run_sequential_when_disabled(executor):
+    executor._max_concurrency = 1
+
+    results = executor.run(None, [threading.current_thread] * 2, str)
+
+    assert results == [threading.current_thread()] * 2
+
+
+def test_run_nested_runs_inline(executor):
+    def nested():
+        return executor.run(None, [threading.current_thread] * 2, str)
+
+    results = executor.run(None, [nested] * 2, str)
+
+    for threads in results:
+        assert threads[0] is threads[1]
+        assert threads[0] is not threading.current_thread()
+
+
+def test_run_raises_first_error(executor):
+    def fail(message):
+        raise ValueError(message)
+
+    with pytest.raises(ValueError, match="first"):
+        executor.run(None, [lambda: 1, lambda: fail("first"), lambda: fail("2")], str)
+
+
+def test_run_timeout(executor):
+    results = executor.run(
+        None, [lambda: "fast", lambda: time.sleep(2)], lambda i: f"timed out {i}"
+    )
+
+    assert results == ["fast", "timed out 1"]
+
+
+def test_load_attributes():
+    Base = declarative_base()
+
+    class Parent(Base):  # pylint: disable=unused-variable
+        __tablename__ = "parent"
+        id = Column(Integer, primary_key=True)
+        name = Column(String(10))
+
+    class Child(Base):
+        __tablename__ = "child"
+        id = Column(Integer, primary_key=True)
+        parent_id = Column(Integer, ForeignKey("parent.id"))
+        parent = relationship("Parent", backref="children")
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    session.add(Child(parent=Parent(name="a")))
+    session.commit()
+
+    child = session.query(Child).one()
+    session.expire(child)
+    load_attributes(child, "parent", "unknown")
+    load_attributes("not an ORM object")
+    session.close()
+
+    # the attributes are loaded, even though the session can't be used anymore
+    assert child.parent_id == 1
+    assert child.parent.name == "a"
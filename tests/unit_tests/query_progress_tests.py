@@ -0,0 +1,92 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+from flask import Flask
+
+from superset.utils.core import QueryStatus
+from superset.utils.query_progress import QueryProgressManager
+
+
+def create_manager(cache_type):
+    app = Flask(__name__)
+    app.config.update(
+        SQLLAB_PROGRESS_CACHE_CONFIG={"CACHE_TYPE": cache_type},
+        SQLLAB_PROGRESS_FLUSH_INTERVAL=60,
+        SQLLAB_ASYNC_TIME_LIMIT_SEC=600,
+    )
+    manager = QueryProgressManager()
+    manager.init_app(app)
+    return manager
+
+
+@pytest.fixture
+def query():
+    return SimpleNamespace(
+        id=1, progress=0, tracking_url=None, status=QueryStatus.RUNNING
+    )
+
+
+def test_progress_and_cancellation():
+    manager = create_manager("SimpleCache")
+
+    manager.set_progress(1, {"progress": 50, "tracking_url": None})
+    manager.cancel(2)
+
+    assert manager.get_progress([1, 2]) == {1: {"progress": 50, "tracking_url": None}}
+    assert not manager.is_cancelled(1)
+    assert manager.is_cancelled(2)
+
+
+def test_reporter_coalesces_commits(query):
+    manager = create_manager("SimpleCache")
+    session = mock.MagicMock()
+    reporter = manager.reporter(query, session)
+
+    reporter.update(progress=10)
+    reporter.update(progress=5)
+    reporter.update(progress=20, tracking_url="http://tracker")
+    assert not reporter.is_stopped()
+
+    session.commit.assert_not_called()
+    session.refresh.assert_not_called()
+    assert (query.progress, query.tracking_url) == (20, "http://tracker")
+    assert manager.get_progress([1]) == {
+        1: {"progress": 20, "tracking_url": "http://tracker"}
+    }
+
+    reporter.flush()
+    session.commit.assert_called_once()
+
+    manager.cancel(1)
+    assert reporter.is_stopped()
+
+
+def test_reporter_without_channel(query):
+    manager = create_manager("null")
+    session = mock.MagicMock()
+    reporter = manager.reporter(query, session)
+
+    reporter.update(progress=10)
+    session.commit.assert_called_once()
+
+    query.status = QueryStatus.STOPPED
+    assert reporter.is_stopped()
+    session.refresh.assert_called_once_with(query)
+    assert manager.get_progress([1]) == {}
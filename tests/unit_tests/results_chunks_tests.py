@@ -0,0 +1,77 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import pyarrow as pa
+import pytest
+from cachelib import SimpleCache
+
+from superset.exceptions import SerializationError
+from superset.utils.results_chunks import (
+    iter_result_chunks,
+    read_result_chunks,
+    write_result_chunks,
+)
+
+
+@pytest.fixture
+def table():
+    return pa.table({"id": list(range(10)), "name": [f"n{i}" for i in range(10)]})
+
+
+def test_write_result_chunks(table):
+    cache = SimpleCache()
+    chunks = write_result_chunks(cache, "key", table, 4)
+
+    assert chunks == [
+        {"key": "key-0", "offset": 0, "rows": 4},
+        {"key": "key-1", "offset": 4, "rows": 4},
+        {"key": "key-2", "offset": 8, "rows": 2},
+    ]
+    assert read_result_chunks(cache, chunks) == table
+
+
+def test_read_result_chunks_window(table):
+    cache = SimpleCache()
+    chunks = write_result_chunks(cache, "key", table, 4)
+    # the last chunk isn't needed
+    cache.delete("key-2")
+
+    assert read_result_chunks(cache, chunks, 6) == table.slice(0, 6)
+    assert read_result_chunks(cache, chunks, 8) == table.slice(0, 8)
+    assert read_result_chunks(cache, chunks, 0).schema == table.schema
+    with pytest.raises(SerializationError):
+        read_result_chunks(cache, chunks)
+
+
+def test_empty_result_chunks(table):
+    cache = SimpleCache()
+    empty_table = table.slice(0, 0)
+    chunks = write_result_chunks(cache, "key", empty_table, 4)
+
+    assert chunks == [{"key": "key-0", "offset": 0, "rows": 0}]
+    assert read_result_chunks(cache, chunks) == empty_table
+
+
+def test_iter_result_chunks(table):
+    cache = SimpleCache()
+    chunks = write_result_chunks(cache, "key", table, 3)
+
+    assert [chunk.num_rows for chunk in iter_result_chunks(cache, chunks)] == [
+        3,
+        3,
+        3,
+        1,
+    ]